@@ -1,14 +1,35 @@
 import sys
+import sqlite3
+import cProfile
+from bisect import bisect_left
+from threading import Event
 from functools import partial
 from datetime import datetime
 from configparser import ConfigParser, NoSectionError
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
 from PyQt5.QtWidgets import QLineEdit
-
-from cf_errors import FileError, ExportPointNoError, DataError
+from PyQt5.QtCore import Qt, QTimer
+
+from cf_errors import (FileError, ExportPointNoError, DataError, SessionError, FitError,
+                       TemplateError, ColumnMappingError, FormatError, DuplicateIdError)
+from cf_database import CfDatabase, data_hash
+from cf_seeds import SeedStore
+from cf_session import save_session, load_session
+from cf_trace import Trace
+from cf_diagdialog import DiagnosticsDialog
+from cf_sweepdialog import SweepDialog
+from cf_overlaydialog import OverlayDialog
+from cf_sweep import default_grid, sweep_fit_window
+from cf_ratedialog import RateDialog
+from cf_ratefit import rate_from_name, fit_rate_family, eval_rate_family, export_rate_table
+from cf_formats import DATA_FILE_FILTER, file_stem, data_files
+from cf_loader import AsyncLoader
+from cf_library import read_deck, material_curve
 from cf_exportdialog import ExportDialog
+from cf_writers import FORMATS
 from cf_settingsdialog import SettingsDialog
 
 class CfCtrl:
@@ -34,15 +55,71 @@ class CfCtrl:
         self._settings_dlg = None
         self._model = model
         self._data = pd.DataFrame()
+        self._specimens: list[pd.DataFrame] = []
+        self._entries: list[tuple[int, int]] = []
+        self._current_entry: tuple[int, int] | None = None
+        self._prepared: dict[tuple[int, int], tuple] = {}
+        self._import_paths: list[Path] = []
+        self._import_failed: list[str] = []
+        self._import_finished: int = 0
+        self._import_generation: int = 0
+        self._import_workers: int = 4
+        self._prefetch: int = 2
+        self._tasks: dict[tuple, Trace] = {}
         self._fitted_data = []
         self._mat_characteristics = []
         self._extrap_method: str = ""
         self._e_start: int = 0
         self._e_end: int = 0
         self._template_path_str: str = ""
+        self._db_path_str: str = ""
+        self._db = None
+        self._seeds = None
+        self._rate_result = None
+        self._rate_mat_char = []
+        self._table_template_path_str: str = ""
+        self._export_formats: list[str] = []
+        self._incremental_export: bool = True
+        self._seed_fit_id = None
+        self._warm_start: bool = True
+        self._seed_distance: float = 0.1
+        self._data_hash: str = ""
+        self._source_path: Path = Path()
+        self._fit_id = None
+        self._traces: list[Trace] = []
+        self._trace_log_str: str = ""
+        self._trace_memory: bool = False
+        self._profile: bool = False
+        self._screening_fix: bool = False
+        self._smoothing_method: int = 0
+        self._smoothing_window: int = 11
+        self._smoothing_polyorder: int = 3
+        self._smoothing_streaming: bool = False
+        self._smoothing_chunk_size: int = 100000
+        self._smoothing_decimation: int = 1
+        self._column_mapping: dict | None = None
+        self._plastic_window: tuple[float, float] | None = None
+        self._fit_maxfev: int = 2000
+        self._fit_timeout: float = 5.0
+        self._preview_debounce: int = 150
+        self._necking_method: int = 0
+        self._necking_point_no: int = 50
+        self._preview_no: int = 0
+        self._preview_key: tuple | None = None
+        self._preview_queued: bool = False
+        self._preview_seed: tuple[int, list[float]] | None = None
+        self._overlay_points: int = 500
+        self._sweep_no: int = 0
+        self._sweep_key: tuple | None = None
+        self._sweep_cancel: Event = Event()
+        self._sweep_dlg: SweepDialog | None = None
 
         self._update_status("*MAT_24 CurveFitter started.")
         self._read_ini()
+        self._open_db()
+        self._loader = AsyncLoader(self._import_workers)
+        self._preview_timer = QTimer()
+        self._preview_timer.setSingleShot(True)
         self._connect_signals()
 
     def _read_ini(self) -> None:
@@ -70,14 +147,95 @@ class CfCtrl:
                 "extrapolation_fitting", "e_extrap_start")
             self._e_end: int = parser.getint(
                 "extrapolation_fitting", "e_extrap_end")
+            self._fit_maxfev: int = parser.getint(
+                "extrapolation_fitting", "fit_maxfev", fallback=2000)
+            self._fit_timeout: float = parser.getfloat(
+                "extrapolation_fitting", "fit_timeout", fallback=5.0)
+            self._preview_debounce: int = parser.getint(
+                "extrapolation_fitting", "preview_debounce", fallback=150)
+            self._necking_method: int = parser.getint(
+                "extrapolation_fitting", "necking_correction", fallback=0)
+            self._necking_point_no: int = parser.getint(
+                "extrapolation_fitting", "necking_point_no", fallback=50)
             self._template_path_str: str = parser.get(
                 "export", "template_path")
+            self._table_template_path_str: str = parser.get(
+                "export", "table_template_path", fallback="data/Mat_24_table_template.k")
+            self._incremental_export: bool = parser.getboolean(
+                "export", "incremental", fallback=True)
+            self._export_formats: list[str] = [
+                fmt.strip() for fmt in parser.get("export", "formats", fallback="").split(",")
+                if fmt.strip() in FORMATS]
+            self._db_path_str: str = parser.get(
+                "database", "db_path", fallback="config/CF.db")
+            self._warm_start: bool = parser.getboolean(
+                "database", "warm_start", fallback=True)
+            self._seed_distance: float = parser.getfloat(
+                "database", "seed_max_distance", fallback=0.1)
+            self._trace_log_str: str = parser.get(
+                "diagnostics", "trace_log", fallback="log/trace.jsonl")
+            self._trace_memory: bool = parser.getboolean(
+                "diagnostics", "trace_memory", fallback=False)
+            self._profile: bool = parser.getboolean(
+                "diagnostics", "profile", fallback=False)
+            self._screening_fix: bool = parser.getboolean(
+                "import", "screening_fix", fallback=False)
+            self._import_workers: int = parser.getint(
+                "import", "workers", fallback=4)
+            self._prefetch: int = parser.getint(
+                "import", "prefetch", fallback=2)
+            self._smoothing_method: int = parser.getint(
+                "smoothing", "method", fallback=0)
+            self._smoothing_window: int = parser.getint(
+                "smoothing", "window", fallback=11)
+            self._smoothing_polyorder: int = parser.getint(
+                "smoothing", "polyorder", fallback=3)
+            self._smoothing_streaming: bool = parser.getboolean(
+                "smoothing", "streaming", fallback=False)
+            self._smoothing_chunk_size: int = parser.getint(
+                "smoothing", "chunk_size", fallback=100000)
+            self._smoothing_decimation: int = parser.getint(
+                "smoothing", "decimation", fallback=1)
+            self._overlay_points: int = parser.getint(
+                "overlay", "max_points", fallback=500)
+            self._column_mapping = self._read_column_mapping(parser)
         except NoSectionError:
             self._update_status(
                 ".ini-file not found. Make sure CF.ini exists inside the config folder.", "error")
 
+    def _read_column_mapping(self, parser: ConfigParser) -> dict | None:
+        """
+        Reads the column mapping profile for multi-channel files from the ini file.
+        Columns are given by header name or by index, empty entries are ignored.
+        ...
+
+        Parameter
+        ---------
+        parser: ConfigParser
+            parser holding the ini file
+
+        Returns
+        -------
+        _: dict | None
+            column mapping (see CfModel.get_data_from_file) or None if disabled
+        """
+        if not parser.getboolean("column_mapping", "enabled", fallback=False):
+            return None
+
+        mapping = {}
+        for key in ("strain", "extension", "stress", "force", "time"):
+            column = parser.get("column_mapping", key, fallback="").strip()
+            if column:
+                mapping[key] = int(column) if column.isdigit() else column
+
+        for key in ("strain_factor", "gauge_length", "force_factor", "area"):
+            if parser.get("column_mapping", key, fallback="").strip():
+                mapping[key] = parser.getfloat("column_mapping", key)
+
+        return mapping
+
     def _write_ini(self, e_start: str, e_end: str, extrap_method: str,
-                   template_path_str: str) -> None:
+                   template_path_str: str, smoothing_method: str, smoothing_window: str) -> None:
         """
         Writes to the CurveFitter ini file.
         ...
@@ -92,6 +250,10 @@ class CfCtrl:
             the last set extrapolation method
         template_path_str:str
             string with the path to the .k-file template
+        smoothing_method: str
+            the last set smoothing filter
+        smoothing_window: str
+            number of samples of the smoothing filter window
 
         Returns
         -------
@@ -104,10 +266,46 @@ class CfCtrl:
         parser.set("extrapolation_fitting",
                    "extrapolation_method", extrap_method)
         parser.set("export", "template_path", template_path_str)
+        if not parser.has_section("smoothing"):
+            parser.add_section("smoothing")
+        parser.set("smoothing", "method", smoothing_method)
+        parser.set("smoothing", "window", smoothing_window)
 
         with open(self._cwd/"config"/"CF.ini", "w") as configfile:
             parser.write(configfile)
 
+    def _open_db(self) -> None:
+        """
+        Opens the material fit database. Relative paths are resolved
+        against the current working directory.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Returns
+        -------
+        None
+        """
+        if not self._db_path_str:
+            return
+
+        db_path = Path(self._db_path_str)
+        if not db_path.is_absolute():
+            db_path = self._cwd/db_path
+
+        try:
+            self._db = CfDatabase(db_path)
+        except sqlite3.Error as error:
+            self._db = None
+            self._update_status(
+                f"Database {db_path} could not be opened - {error.args[0]}", "error")
+            return
+
+        if self._warm_start:
+            self._seeds = SeedStore(self._db, self._seed_distance)
+
     def _connect_signals(self) -> None:
         """
         Connect signals to functions.
@@ -132,13 +330,43 @@ class CfCtrl:
         # arguments than expected.
         # https://realpython.com/python-pyqt-gui-calculator/#creating-a-calculator-app-with-python-and-pyqt
 
-        self._gui.import_action.triggered.connect(
-            partial(self._file_dialog, "*.csv"))
+        self._gui.import_action.triggered.connect(self._import_dialog)
+
+        self._gui.import_folder_action.triggered.connect(self._import_folder)
 
         self._gui.fit_action.triggered.connect(self._fit_extrap)
 
         self._gui.settings_action.triggered.connect(self._settings)
 
+        self._gui.save_session_action.triggered.connect(self._save_session)
+
+        self._gui.open_session_action.triggered.connect(self._open_session)
+
+        self._gui.diagnostics_action.triggered.connect(self._diagnostics)
+
+        self._gui.sweep_action.triggered.connect(self._sweep)
+
+        self._gui.overlay_action.triggered.connect(self._overlay)
+
+        self._gui.rate_action.triggered.connect(self._rate_family)
+
+        self._gui.list_specimens.currentRowChanged.connect(self._select_specimen)
+
+        # results of the worker threads are handled in the UI thread
+        self._loader.finished.connect(self._task_finished, Qt.QueuedConnection)
+
+        self._loader.failed.connect(self._task_failed, Qt.QueuedConnection)
+
+        self._loader.progress.connect(self._task_progress, Qt.QueuedConnection)
+        # cancelled tasks are reported from within cancel, queued as well
+        self._loader.cancelled.connect(self._task_cancelled, Qt.QueuedConnection)
+
+        self._gui.fit_window_changed.connect(self._fit_window_changed)
+
+        self._preview_timer.timeout.connect(self._submit_preview)
+
+        self._gui.fit_series_action.triggered.connect(self._fit_series)
+
         self._gui.export_action.triggered.connect(self._export)
 
         self._gui.exit_action.triggered.connect(self._exit_app)
@@ -187,10 +415,7 @@ class CfCtrl:
         """
         path, _ = self._gui.file_dialog(file_type)
 
-        if file_type == "*.csv":
-            self._update_tb(self._gui.tb_in_path, str(path))
-            self._get_data(path)
-        elif file_type == "*.k" and identifier == "export":
+        if file_type == "*.k" and identifier == "export":
             self._update_tb(self._export_dlg.tb_out_path, str(path))
         elif file_type == "*.k" and identifier == "setting":
             self._update_tb(self._settings_dlg.tb_template_path, str(path))
@@ -213,10 +438,55 @@ class CfCtrl:
         """
         tb.setText(text)
 
+    def _import_dialog(self) -> None:
+        """
+        Opens a file dialog to import one or several data files.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Return
+        ------
+        None
+        """
+        paths, _ = self._gui.files_dialog(DATA_FILE_FILTER)
+
+        if paths:
+            self._update_tb(self._gui.tb_in_path, paths[0] if len(paths) == 1
+                            else f"{len(paths)} files")
+            self._import_files([Path(path_str) for path_str in paths])
+
+    def _import_folder(self) -> None:
+        """
+        Opens a folder dialog to import all data files of a folder.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Return
+        ------
+        None
+        """
+        path_str = self._gui.folder_dialog()
+
+        if not path_str:
+            return
+
+        paths = data_files(Path(path_str))
+        if not paths:
+            self._update_status(f"No data files found in {path_str}.", "error")
+            return
+
+        self._update_tb(self._gui.tb_in_path, path_str)
+        self._import_files(paths)
+
     def _get_data(self, user_input: str = "") -> None:
         """
-        Process given .csv-fiel from user input. Performs checks and calls 
-        CFModel.get_data_from_file.
+        Process given data file from user input.
         ...
 
         Paramter:
@@ -234,19 +504,11 @@ class CfCtrl:
         else:
             file_path: Path = Path(user_input)
 
-        try:
-            self._data = self._model.get_data_from_file(file_path)
-            self._gui.clear_graphs("input")
-            self._gui.plot_data(self._data, "input")
-            self._update_status(
-                f"Updated plot with data from {file_path.name}")
-        except (FileError, DataError) as error:
-            self._update_status(
-                f"{type(error).__name__} - {error.args[0]}", "error")
+        self._import_files([file_path])
 
-    def _fit_extrap(self) -> None:
+    def _clear_import(self) -> None:
         """
-        Handles the curve fitting and extrapolation process.
+        Discards the imported specimens. Results of pending imports are ignored.
         ...
 
         Parameter
@@ -257,42 +519,210 @@ class CfCtrl:
         ------
         None
         """
-        if self._data.empty:
-            self._update_status("No data found, please import data.", "error")
+        self._loader.cancel()
+        self._stop_sweep()
+        self._import_generation += 1
+        self._import_paths = []
+        self._import_failed = []
+        self._import_finished = 0
+        self._specimens = []
+        self._entries = []
+        self._current_entry = None
+        self._prepared = {}
+        self._gui.clear_specimens()
+
+    def _import_files(self, paths: list[Path]) -> None:
+        """
+        Imports the given files concurrently in the thread pool. The specimen
+        list fills up as the files finish, the first specimen is shown as
+        soon as it is available.
+        ...
+
+        Parameter
+        ---------
+        paths: list[Path]
+            paths of the data files
+
+        Return
+        ------
+        None
+        """
+        self._clear_import()
+        self._import_paths = list(paths)
+        settings = self._read_settings()
+
+        for i, path in enumerate(paths):
+            key = ("read", self._import_generation, i)
+            self._tasks[key] = self._new_trace(f"Import {path.name}")
+            self._loader.submit(key, self._read_file, path, settings, self._tasks[key])
+
+        if len(paths) > 1:
+            self._update_status(f"Importing {len(paths)} files...")
+
+    def _read_settings(self) -> tuple:
+        """
+        Settings the import of a file depends on. Taken when the import is
+        submitted, so the worker threads do not read the settings while they
+        are changed.
+        """
+        return (self._smoothing_streaming, self._smoothing_method, self._smoothing_window,
+                self._smoothing_polyorder, self._smoothing_decimation,
+                self._smoothing_chunk_size, self._column_mapping)
 
+    def _read_file(self, file_path: Path, settings: tuple, trace: Trace) -> list[pd.DataFrame]:
+        """
+        Reads a data file with the given settings. Runs in a worker thread.
+        ...
+
+        Parameter
+        ---------
+        file_path: Path
+            path of the data file
+        settings: tuple
+            import settings as returned by _read_settings
+        trace: Trace
+            trace recording the model stages
+
+        Return
+        ------
+        _: list[DataFrame]
+            the specimens of the file
+        """
+        streaming, method, window, polyorder, decimation, chunk_size, column_mapping = settings
+
+        if streaming and method != 0:
+            # bounded memory mode for very long logs
+            data = self._model.get_smoothed_data_from_file(
+                file_path, method, window, polyorder, decimation, chunk_size, trace,
+                column_mapping)
+            data.attrs["smoothed"] = True
+            specimens = [data]
+        elif column_mapping is not None:
+            specimens = [self._model.get_data_from_file(file_path, trace, column_mapping)]
         else:
-            self._mat_characteristics = self._model.comp_material_data(
-                self._data, self._e_start, self._e_end)
+            # multi-specimen files are parsed once, the specimens are views of the file
+            specimens = self._model.get_specimens_from_file(file_path, trace)
 
-            self._data = self._model.comp_true_stress_strain(
-                self._data, self._mat_characteristics[3], self._mat_characteristics[4])
-            self._update_status("Material properties calculated.")
+        for specimen in specimens:
+            specimen.attrs["source"] = str(file_path)
+            specimen.attrs["specimen_no"] = len(specimens)
+            specimen.attrs["label"] = file_stem(file_path) if len(specimens) == 1 \
+                else f"{file_stem(file_path)} {specimen.attrs['specimen']}"
 
-            self._fitted_data = self._model.extrapolate(
-                [self._data, self._mat_characteristics[3], self._mat_characteristics[4],
-                 self._mat_characteristics[5], self._mat_characteristics[2]], self._extrap_method)
-            self._update_status("Yield Curve computed.")
+        return specimens
 
-            self._gui.fill_lbls(self._mat_characteristics,
-                                self._extrap_method, self._fitted_data[2])
+    def _task_finished(self, key: tuple, result) -> None:
+        """
+        Handles a finished task of the thread pool in the UI thread.
+        ...
 
-            self._gui.clear_graphs("output_1")
-            self._gui.plot_data(self._data, "output_1")
+        Parameter
+        ---------
+        key: tuple
+            key of the task (kind, import generation, file index or entry, ...)
+        result:
+            result of the task
 
-            self._gui.plot_data(
-                [self._data["eng_strain"][0:self._mat_characteristics[3]],
-                    self._data["eng_strain"][0:self._mat_characteristics[3]]*self._mat_characteristics[0]],
-                "output_1", name=f"Youngs Modulus ({self._mat_characteristics[0]:.2f})")
+        Return
+        ------
+        None
+        """
+        trace = self._tasks.pop(key, None)
+        if trace is not None:
+            self._finish_trace(trace)
+
+        # results of a previous import
+        if key[1] != self._import_generation:
+            return
+
+        if key[0] == "read":
+            self._file_loaded(key[2], result)
+        elif key[0] == "prepare":
+            self._specimen_prepared(key[2], key[3], result, trace)
+        elif key[0] == "preview":
+            self._preview_finished(key, result)
+        elif key[0] == "sweep":
+            self._sweep_finished(key, result)
+
+    def _task_failed(self, key: tuple, message: str) -> None:
+        """
+        Reports a failed task of the thread pool in the UI thread.
+        ...
 
-            self._gui.clear_graphs("output")
-            self._gui.plot_data([self._data["plst_strain"],
-                                 self._data["plst_stress"]], "output", name="Input Data")
-            self._gui.plot_data(self._fitted_data, "output",
-                                name="Fitted Yield Curve")
+        Parameter
+        ---------
+        key: tuple
+            key of the task
+        message: str
+            error message
 
-    def _export(self) -> None:
+        Return
+        ------
+        None
         """
-        Handles the data export to a .k-file.
+        trace = self._tasks.pop(key, None)
+        if trace is not None:
+            self._finish_trace(trace)
+
+        if key[1] != self._import_generation:
+            return
+
+        if key[0] == "preview":
+            if key == self._preview_key:
+                self._update_status(f"Preview - {message}", "error")
+                self._submit_queued_preview()
+            return
+
+        if key[0] == "sweep":
+            if key == self._sweep_key:
+                self._sweep_key = None
+                self._sweep_dlg.set_running(False)
+                self._update_status(f"Fit window sweep - {message}", "error")
+            return
+
+        name = self._import_paths[key[2]].name if key[0] == "read" else \
+            self._import_paths[key[2][0]].name
+        self._update_status(f"{name}: {message}", "error")
+
+        if key[0] == "read":
+            self._import_failed.append(name)
+            self._import_finished += 1
+            self._import_done()
+
+    def _file_loaded(self, file_index: int, specimens: list[pd.DataFrame]) -> None:
+        """
+        Adds the specimens of an imported file to the specimen list, in the
+        order of the files.
+        ...
+
+        Parameter
+        ---------
+        file_index: int
+            index of the file in the import
+        specimens: list[DataFrame]
+            the specimens of the file
+
+        Return
+        ------
+        None
+        """
+        for j, specimen in enumerate(specimens):
+            row = bisect_left(self._entries, (file_index, j))
+            self._entries.insert(row, (file_index, j))
+            self._specimens.insert(row, specimen)
+            self._gui.insert_specimen(row, specimen.attrs["label"])
+
+        if self._gui.list_specimens.currentRow() < 0:
+            self._gui.list_specimens.setCurrentRow(0)
+        else:
+            self._prefetch_specimens(self._gui.list_specimens.currentRow())
+
+        self._import_finished += 1
+        self._import_done()
+
+    def _import_done(self) -> None:
+        """
+        Reports the import of several files once all files are finished.
         ...
 
         Parameter
@@ -303,101 +733,1609 @@ class CfCtrl:
         ------
         None
         """
-        if not self._mat_characteristics:
-            self._update_status("No Data to Export.", "error")
+        if len(self._import_paths) < 2 or self._import_finished < len(self._import_paths):
+            return
 
+        if self._import_failed:
+            self._update_status(f"Imported {len(self._import_paths) - len(self._import_failed)} "
+                                f"of {len(self._import_paths)} files ({len(self._entries)} "
+                                f"specimens), failed: {', '.join(self._import_failed)}.", "error")
         else:
-            self._export_dlg = ExportDialog(self._cwd,
-                                            round(self._mat_characteristics[6], 2), self._gui)
+            self._update_status(f"Imported {len(self._import_paths)} files "
+                                f"({len(self._entries)} specimens).")
 
-            # when the firs btn in the box (Save) is clicked an accepted signal is
-            # emitted since this btn has a acceptive role in the GUI. This signal
-            # is than connected to the accept method of the dialog. Similar is true
-            # for the secend btn which has a rejective role in the GUI
-            self._export_dlg.btnbx.accepted.connect(self._export_dlg.accept)
-            self._export_dlg.btnbx.rejected.connect(self._export_dlg.reject)
-            self._export_dlg.btn_file_out.clicked.connect(
-                partial(self._file_dialog, "*.k", "export"))
+    def _preparation_key(self) -> tuple:
+        """
+        Settings the preparation of the data depends on.
+        """
+        return (self._screening_fix, self._smoothing_method, self._smoothing_window,
+                self._smoothing_polyorder)
 
-            if self._export_dlg.exec() == 1:
-                
-                title = self._export_dlg.tb_title.text()
-                mid = self._export_dlg.tb_mid.text()
-                rho = self._export_dlg.tb_rho.text()
-                poisons_ratio = self._export_dlg.tb_poisons_ratio.text()
-                fail = self._export_dlg.tb_fail.text()
-                point_no = self._export_dlg.tb_point_no.text()
-                export_path = self._export_dlg.tb_out_path.text()
-                if self._export_dlg.rdbtn_equi.isChecked() is True:
-                    spacing = "equi"
-                else:
-                    spacing = "uneven"
+    def _prepare_data(self, data: pd.DataFrame, settings: tuple, trace: Trace) -> pd.DataFrame:
+        """
+        Screens and smooths imported data with the given settings. Runs in a
+        worker thread.
+        ...
 
-                export_input = [title, mid, rho, poisons_ratio, fail, point_no, export_path, spacing]
+        Parameter
+        ---------
+        data: DataFrame
+            imported data
+        settings: tuple
+            preparation settings as returned by _preparation_key
+        trace: Trace
+            trace recording the model stages
 
-                try:
-                    self._model.export_data(export_input, self._fitted_data,
-                                            self._mat_characteristics[0], export_path, self._template_path_str)
-                    self._update_status(
-                        f"Succesfully exported curve to {export_path}.")
+        Return
+        ------
+        _: DataFrame
+            screened and smoothed data
+        """
+        screening_fix, method, window, polyorder = settings
 
-                except (ExportPointNoError, FileError) as error:
-                    self._update_status(
-                        f"{type(error).__name__} - {error.args[0]}", "error")
-                    self._export()
+        # shallow copy, columns added later must not change the imported specimen
+        data = self._model.screen_data(data.copy(deep=False), screening_fix, trace=trace)
 
-    def _exit_app(self) -> None:
+        if data.attrs.get("smoothed"):
+            return data
+
+        return self._model.smooth_data(data, method, window, polyorder, trace)
+
+    def _submit_prepare(self, row: int) -> None:
         """
-        Terminates the applicaiton.
+        Prepares the specimen of the given row in the thread pool, unless it
+        is already prepared or being prepared.
         ...
 
         Parameter
         ---------
-        None 
+        row: int
+            row of the specimen
 
         Return
         ------
         None
         """
+        entry = self._entries[row]
+        settings = self._preparation_key()
 
-        sys.exit()
+        prepared = self._prepared.get(entry)
+        if prepared is not None and prepared[0] == settings:
+            return
 
-    def _settings(self) -> None:
+        key = ("prepare", self._import_generation, entry, settings)
+        if self._loader.is_pending(key):
+            return
+
+        self._tasks[key] = self._new_trace(f"Prepare {self._specimens[row].attrs['label']}")
+        self._loader.submit(key, self._prepare_data, self._specimens[row], settings,
+                            self._tasks[key])
+
+    def _prefetch_specimens(self, row: int) -> None:
         """
-        Opens a Settings Dialog and handles the input.
+        Prepares the specimens following the given row in the background and
+        discards prepared specimens outside of the prefetch window.
         ...
 
         Parameter
-        --------
+        ---------
+        row: int
+            row of the current specimen
+
+        Return
+        ------
         None
+        """
+        window = set(self._entries[max(row - 1, 0):row + self._prefetch + 1])
+        for entry in list(self._prepared):
+            if entry not in window:
+                del self._prepared[entry]
 
-        Return 
+        for next_row in range(row + 1, min(row + self._prefetch + 1, len(self._entries))):
+            self._submit_prepare(next_row)
+
+    def _specimen_prepared(self, entry: tuple[int, int], settings: tuple, data: pd.DataFrame,
+                           trace: Trace | None) -> None:
+        """
+        Stores a prepared specimen and shows it if it is the selected one.
+        ...
+
+        Parameter
+        ---------
+        entry: tuple[int, int]
+            file index and specimen index of the specimen
+        settings: tuple
+            settings the specimen was prepared with
+        data: DataFrame
+            the prepared data
+        trace: Trace | None
+            trace of the preparation
+
+        Return
         ------
         None
         """
-        extrap_methods = ["Swift", "Voce", "Swift-Voce"]
-        self._settings_dlg = SettingsDialog(self._cwd, extrap_methods, self._extrap_method, self._e_start,
-                                            self._e_end, self._template_path_str,
-                                            self._gui)
+        if settings != self._preparation_key():
+            return
 
-        self._settings_dlg.btnbx.rejected.connect(self._settings_dlg.reject)
-        self._settings_dlg.btnbx.accepted.connect(self._settings_dlg.accept)
-        self._settings_dlg.btn_temp_path.clicked.connect(
-            partial(self._file_dialog, "*.k", "settings"))
+        self._prepared[entry] = (settings, data, trace)
 
-        if self._settings_dlg.exec() == 1:
-            if int(self._settings_dlg.tb_e_end.text()) - int(self._settings_dlg.tb_e_start.text()) < 50:
-                self._update_status(
-                    "It is recommended to use at least 50 data points to fit the Youngs Modulus. Changes discarded.", "error")
-                self._settings()
+        if entry == self._current_entry:
+            self._data = data
+            self._source_path = Path(data.attrs["source"])
+            self._show_data(trace)
+
+    def _show_data(self, trace: Trace | None) -> None:
+        """
+        Plots the current data and reports the screening results.
+        ...
+
+        Parameter
+        ---------
+        trace: Trace | None
+            trace of the import and preparation
+
+        Return
+        ------
+        None
+        """
+        self._data_hash = data_hash(self._data)
+        self._fit_id = None
+        self._gui.clear_graphs("input")
+        self._gui.plot_data(self._data, "input")
+        self._reset_preview()
+
+        name = self._source_path.name
+        if self._data.attrs.get("specimen_no", 1) > 1:
+            name += f" ({self._data.attrs['specimen']}, {self._data.attrs['specimen_no']} " \
+                "specimens)"
+
+        rate_info = ""
+        if "strain_rate" in self._data:
+            rate_info = f", median strain rate {np.nanmedian(self._data['strain_rate']):.3g} 1/s"
+
+        issues = self._screening_summary(self._data.attrs["screening"])
+        if issues:
+            self._update_status(
+                f"Updated plot with data from {name}. Screening found {issues}", "error")
+        else:
+            self._update_status(
+                f"Updated plot with data from {name} "
+                f"({trace.total_time() if trace is not None else 0:.2f} s{rate_info})")
+
+    def _select_specimen(self, row: int) -> None:
+        """
+        Selects an imported specimen as current data. Prepared specimens are
+        shown immediately, others once they are prepared in the background.
+        ...
+
+        Parameter
+        ---------
+        row: int
+            row of the specimen in the specimen list
+
+        Return
+        ------
+        None
+        """
+        if not 0 <= row < len(self._specimens):
+            return
+
+        # rows shift when files finishing later are inserted above
+        if self._entries[row] != self._current_entry:
+            self._current_entry = self._entries[row]
+
+            prepared = self._prepared.get(self._current_entry)
+            if prepared is not None and prepared[0] == self._preparation_key():
+                self._data = prepared[1]
+                self._source_path = Path(self._data.attrs["source"])
+                self._show_data(prepared[2])
             else:
-                self._e_start = int(self._settings_dlg.tb_e_start.text())
-                self._e_end = int(self._settings_dlg.tb_e_end.text())
-                self._extrap_method = self._settings_dlg.cmb_extrap_method.currentIndex()
-                self._template_path_str = self._settings_dlg.tb_template_path.text()
+                self._submit_prepare(row)
 
-                self._write_ini(str(self._e_start), str(self._e_end), str(self._extrap_method),
-                                self._template_path_str)
+        self._prefetch_specimens(row)
+
+    def _fit_series(self) -> None:
+        """
+        Fits all imported specimens with the current settings and reports the
+        scatter of the series. The fits are stored in the database, the
+        selected specimen is shown afterwards.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Return
+        ------
+        None
+        """
+        if len(self._specimens) < 2:
+            self._update_status("Less than two specimens imported.", "error")
+            return
+
+        trace = self._new_trace(f"Fit series of {len(self._specimens)} specimens")
+        self._preview_timer.stop()
+        selected = max(self._gui.list_specimens.currentRow(), 0)
+        # the selected specimen last, so it stays the current data
+        order = [i for i in range(len(self._specimens)) if i != selected] + [selected]
+        rm = []
+
+        try:
+            for i in order:
+                prepared = self._prepared.get(self._entries[i])
+                if prepared is not None and prepared[0] == self._preparation_key():
+                    self._data = prepared[1]
+                else:
+                    self._data = self._prepare_data(self._specimens[i],
+                                                    self._preparation_key(), trace)
+                self._source_path = Path(self._data.attrs["source"])
+                self._data_hash = data_hash(self._data)
+                self._fit_id = None
+                self._fitted_data = []
+                try:
+                    self._comp_fit(trace)
+                except FitError as error:
+                    self._update_status(f"{self._specimens[i].attrs['label']}: "
+                                        f"{type(error).__name__} - {error.args[0]}", "error")
+                    continue
+                rm.append(self._mat_characteristics[2])
+        finally:
+            self._current_entry = self._entries[selected]
+            self._finish_trace(trace)
+
+        if self._fitted_data:
+            self._plot_results()
+
+        if rm:
+            self._update_status(
+                f"Fitted {len(rm)} of {len(self._specimens)} specimens, Rm = {np.mean(rm):.1f} ± "
+                f"{np.std(rm, ddof=1) if len(rm) > 1 else 0:.1f} MPa "
+                f"({trace.total_time():.2f} s).")
+
+    def _screening_summary(self, report: dict) -> str:
+        """
+        Summarizes the issues found by the data screening.
+        ...
+
+        Parameter
+        ---------
+        report: dict
+            screening report as attached by CFModel.screen_data
+
+        Return
+        ------
+        _: str
+            summary of the issues, empty if no issues were found
+        """
+        names = {"non_monotonic": "non-monotonic strain samples",
+                 "duplicates": "duplicate samples",
+                 "strain_jumps": "strain jumps",
+                 "stress_spikes": "stress spikes"}
+
+        issues = [f"{len(report[key])} {name}" for key, name in names.items() if report[key]]
+        if not issues:
+            return ""
+
+        fixed = "fixed" if report["fixed"] else "not fixed"
+        return f"{', '.join(issues)} ({fixed})."
+
+    def _fit_extrap(self) -> None:
+        """
+        Handles the curve fitting and extrapolation process.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Return
+        ------
+        None
+        """
+        if self._data.empty:
+            self._update_status("No data found, please import data.", "error")
+
+        else:
+            trace = self._new_trace(f"Fit {self._source_path.name}")
+            profiler = cProfile.Profile() if self._profile else None
+
+            if profiler is not None:
+                profiler.enable()
+
+            try:
+                self._comp_fit(trace)
+            except FitError as error:
+                self._update_status(f"{type(error).__name__} - {error.args[0]}", "error")
+                return
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+                self._finish_trace(trace, profiler)
+
+            self._plot_results()
+
+    def _comp_fit(self, trace: Trace) -> None:
+        """
+        Computes the material characteristics and fitted curve of the current
+        data or loads them from the database.
+        ...
+
+        Parameter
+        ---------
+        trace: Trace
+            trace recording the model stages
+
+        Return
+        ------
+        None
+        """
+        # a fit supersedes running previews
+        self._preview_key = None
+
+        # the database caches uncorrected fits of the window between Rp_02 and Rm only
+        cached = (self._find_fit()
+                  if self._plastic_window is None and not self._necking_method else None)
+
+        if cached is not None:
+            self._fit_id, self._mat_characteristics, parameter = cached
+
+            self._data = self._model.comp_true_stress_strain(
+                self._data, self._mat_characteristics[3], self._mat_characteristics[4], trace)
+
+            self._fitted_data = self._model.eval_extrapolation(
+                parameter, self._extrap_method)
+            self._update_status(
+                f"Yield Curve loaded from database ({trace.total_time():.2f} s).")
+
+        else:
+            self._mat_characteristics = self._model.comp_material_data(
+                self._data, self._e_start, self._e_end, trace)
+
+            self._data = self._model.comp_true_stress_strain(
+                self._data, self._mat_characteristics[3], self._mat_characteristics[4], trace)
+            self._update_status("Material properties calculated.")
+
+            seed = self._find_seed()
+            self._seed_fit_id = seed[0] if seed is not None else None
+
+            start_i, end_i = self._plastic_indices()
+            self._fitted_data = self._model.extrapolate(
+                [self._data, start_i, end_i,
+                 self._mat_characteristics[5], self._mat_characteristics[2]], self._extrap_method,
+                trace=trace, initial_guess=seed[1] if seed is not None else self._preview_guess(),
+                maxfev=self._fit_maxfev, timeout=self._fit_timeout,
+                necking=self._necking(self._data, self._mat_characteristics,
+                                      self._plastic_window, trace))
+
+            status = self._fitted_data[3]
+            if not status["success"]:
+                self._update_status(
+                    f"Fit did not converge, linearized estimate used ({trace.total_time():.2f} s).",
+                    "error")
+            elif seed is not None:
+                self._update_status(
+                    f"Yield Curve computed with seed of fit {seed[0]} ({status['nfev']} function "
+                    f"evaluations, {trace.total_time():.2f} s).")
+            elif status["method"] not in ("initial_guess", "combined"):
+                self._update_status(f"Yield Curve computed with fallback {status['method']} "
+                                    f"({trace.total_time():.2f} s).")
+            else:
+                self._update_status(f"Yield Curve computed ({trace.total_time():.2f} s).")
+
+            # estimates of fits that did not converge are not cached
+            if status["success"] and self._plastic_window is None and not self._necking_method:
+                self._store_fit()
+
+        self._preview_seed = (self._extrap_method, self._fitted_data[2])
+
+    def _new_trace(self, name: str) -> Trace:
+        """
+        Creates a trace for the model stages of a user action.
+        ...
+
+        Parameter
+        ---------
+        name: str
+            name describing the action
+
+        Return
+        ------
+        _: Trace
+        """
+        trace = Trace(name, self._trace_memory)
+
+        self._traces.append(trace)
+        del self._traces[:-20]
+
+        return trace
+
+    def _finish_trace(self, trace: Trace, profiler: cProfile.Profile | None = None) -> None:
+        """
+        Writes the trace to the trace log and dumps the profiling statistics.
+        Relative paths are resolved against the current working directory.
+        ...
+
+        Parameter
+        ---------
+        trace: Trace
+            the finished trace
+        profiler: cProfile.Profile | None
+            profiler that recorded the action, defaults to None
+
+        Return
+        ------
+        None
+        """
+        if not self._trace_log_str:
+            return
+
+        log_path = Path(self._trace_log_str)
+        if not log_path.is_absolute():
+            log_path = self._cwd/log_path
+
+        try:
+            trace.write_json_line(log_path)
+
+            if profiler is not None:
+                # pstats format, readable by e.g. snakeviz, gprof2dot or flameprof
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+                profiler.dump_stats(log_path.parent/f"profile_{timestamp}.prof")
+        except OSError as error:
+            self._update_status(
+                f"Trace could not be written - {error.args[-1]}", "error")
+
+    def _plot_results(self) -> None:
+        """
+        Shows the material characteristics and fitted curve of the current data.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Return
+        ------
+        None
+        """
+        self._gui.fill_lbls(self._mat_characteristics,
+                            self._extrap_method, self._fitted_data[2])
+
+        self._gui.clear_graphs("output_1")
+        self._gui.plot_data(self._data, "output_1")
+
+        self._gui.plot_data(
+            [self._data["eng_strain"][0:self._mat_characteristics[3]],
+                self._data["eng_strain"][0:self._mat_characteristics[3]]*self._mat_characteristics[0]],
+            "output_1", name=f"Youngs Modulus ({self._mat_characteristics[0]:.2f})")
+
+        self._gui.clear_graphs("output")
+        self._gui.plot_data([self._data["plst_strain"],
+                             self._data["plst_stress"]], "output", name="Input Data")
+
+        necking = self._necking(self._data, self._mat_characteristics, self._plastic_window)
+        if necking is not None and len(necking[0]):
+            self._gui.plot_data(list(necking), "output", "x",
+                                name="Necking Correction")
+        self._gui.plot_data(self._fitted_data, "output",
+                            name="Fitted Yield Curve")
+
+        start_i, end_i = self._plastic_indices()
+        if end_i > start_i:
+            self._gui.set_fit_window("output", self._data["plst_strain"].iloc[start_i],
+                                     self._data["plst_strain"].iloc[end_i - 1])
+        self._show_modulus()
+
+    def _fit_settings(self) -> tuple:
+        """
+        Settings the fits depend on: maxfev, timeout, necking correction
+        method and its number of points. Taken when a preview is submitted,
+        so the worker threads do not read the settings while they are
+        changed.
+        """
+        return (self._fit_maxfev, self._fit_timeout, self._necking_method,
+                self._necking_point_no)
+
+    def _necking(self, data: pd.DataFrame, mat_char: list, plastic_window: tuple | None,
+                 trace: Trace | None = None,
+                 settings: tuple | None = None) -> tuple[np.ndarray, np.ndarray] | None:
+        """
+        Corrected yield curve beyond Rm, which is fitted together with the
+        window between Rp_02 and Rm. None if the correction is disabled or a
+        custom plastic fit window is selected. The fit settings default to
+        the current settings.
+        """
+        method, point_no = (settings or self._fit_settings())[2:]
+
+        if not method or plastic_window is not None:
+            return None
+
+        return self._model.comp_necking_correction(
+            data, mat_char[3], mat_char[4], mat_char[2], method, point_no, trace)
+
+    def _plastic_indices(self) -> tuple[int, int]:
+        """
+        First index and index after the last data point of the plastic fit
+        window of the current data, by default the data between Rp_02 and Rm.
+        """
+        start_i, end_i = self._mat_characteristics[3], self._mat_characteristics[4]
+
+        if self._plastic_window is not None:
+            start_i, end_i = self._model.window_indices(
+                self._data["plst_strain"], *self._plastic_window, start_i, end_i)
+
+        return start_i, end_i
+
+    def _show_modulus(self) -> None:
+        """
+        Shows the hooks straight of the current youngs modulus in the input graph.
+        """
+        E, rp02 = self._mat_characteristics[0], self._mat_characteristics[1]
+
+        self._gui.update_preview("input", {"modulus": ([0, 1.2*rp02/E], [0, 1.2*rp02])})
+
+    def _reset_preview(self, plastic_window: tuple[float, float] | None = None) -> None:
+        """
+        Discards the previews of the previous data or settings and shows the
+        youngs modulus window of the current data.
+        ...
+
+        Parameter
+        ---------
+        plastic_window: tuple[float, float] | None, default = None
+            plastic fit window of the current data [plastic strain], None for
+            the window between Rp_02 and Rm
+
+        Return
+        ------
+        None
+        """
+        self._preview_timer.stop()
+        self._preview_key = None
+        self._preview_queued = False
+        self._preview_seed = None
+        self._plastic_window = plastic_window
+
+        strain = self._data["eng_strain"]
+        e_end = min(self._e_end, len(strain)) - 1
+        if 0 <= self._e_start < e_end:
+            self._gui.set_fit_window("input", strain.iloc[self._e_start], strain.iloc[e_end])
+
+    def _preview_guess(self) -> list[float] | None:
+        """
+        Parameters of the last fit or preview of the current data as warm
+        start, if they belong to the current extrapolation method.
+        """
+        if self._preview_seed is None or self._preview_seed[0] != self._extrap_method:
+            return None
+
+        return self._preview_seed[1]
+
+    def _fit_window_changed(self, graph: str, lower: float, upper: float, released: bool) -> None:
+        """
+        Updates the fit window dragged in a graph. While the window is moved,
+        the preview refit is debounced, on release it is started immediately.
+        ...
+
+        Parameter
+        ---------
+        graph: str
+            "input" for the youngs modulus window, "output" for the plastic
+            fit window
+        lower: float
+            lower strain of the window
+        upper: float
+            upper strain of the window
+        released: bool
+            whether the mouse button was released
+
+        Return
+        ------
+        None
+        """
+        if self._data.empty or (graph == "output" and not self._fitted_data):
+            return
+
+        if graph == "input":
+            self._e_start, self._e_end = self._model.window_indices(
+                self._data["eng_strain"], lower, upper)
+        else:
+            self._plastic_window = (lower, upper)
+
+        if released:
+            self._preview_timer.stop()
+            self._submit_preview(True)
+        else:
+            self._preview_timer.start(self._preview_debounce)
+
+    def _submit_preview(self, final: bool = False) -> None:
+        """
+        Refits the current data with the current fit windows in the thread
+        pool, warm started from the last parameters. While the preview of a
+        moving window is running, the next one is queued, so the preview
+        follows the mouse as fast as the fits allow without piling up.
+        ...
+
+        Parameter
+        ---------
+        final: bool, default = False
+            whether the window was released, the final preview is plotted
+            completely
+
+        Return
+        ------
+        None
+        """
+        if self._data.empty:
+            return
+
+        if not final and self._preview_key is not None and \
+                self._loader.is_pending(self._preview_key):
+            self._preview_queued = True
+            return
+
+        self._preview_no += 1
+        self._preview_queued = False
+        settings = self._fit_settings()
+        self._preview_key = ("preview", self._import_generation, self._preview_no, final,
+                             settings)
+
+        self._loader.submit(self._preview_key, self._fit_preview,
+                            self._data[["eng_strain", "eng_stress"]], (self._e_start, self._e_end),
+                            self._plastic_window, self._extrap_method, self._preview_guess(),
+                            settings)
+
+    def _submit_queued_preview(self) -> None:
+        """
+        Starts the preview queued while the last one was running.
+        """
+        if self._preview_queued:
+            self._submit_preview()
+
+    def _fit_preview(self, data: pd.DataFrame, e_window: tuple[int, int],
+                     plastic_window: tuple[float, float] | None, extrap_method: int,
+                     initial_guess: list[float] | None, settings: tuple) -> tuple:
+        """
+        Computes the material characteristics and fitted curve of a copy of
+        the data with the given fit windows. Runs in the thread pool.
+        ...
+
+        Parameter
+        ---------
+        data: DataFrame
+            copy of the engineering strain and stress of the current data
+        e_window: tuple[int, int]
+            first index and index after the last data point of the youngs
+            modulus window
+        plastic_window: tuple[float, float] | None
+            plastic fit window [plastic strain], None for the window between
+            Rp_02 and Rm
+        extrap_method: int
+            extrapolation method
+        initial_guess: list[float] | None
+            warm start of the fit
+        settings: tuple
+            fit settings as returned by _fit_settings
+
+        Return
+        ------
+        _: tuple
+            0 = material characteristics [list]
+            1 = data with true and plastic stress and strain [DataFrame]
+            2 = first index and index after the last data point of the
+                plastic fit window [tuple[int, int]]
+            3 = fitted data as returned by CFModel.extrapolate [list]
+        """
+        if e_window[1] - e_window[0] < 3:
+            raise ValueError("the youngs modulus window contains less than 3 data points")
+
+        mat_char = self._model.comp_material_data(data, *e_window)
+        data = self._model.comp_true_stress_strain(data, mat_char[3], mat_char[4])
+
+        start_i, end_i = mat_char[3], mat_char[4]
+        if plastic_window is not None:
+            start_i, end_i = self._model.window_indices(
+                data["plst_strain"], *plastic_window, start_i, end_i)
+
+        if end_i - start_i < 3:
+            raise ValueError("the plastic fit window contains less than 3 data points")
+
+        fitted_data = self._model.extrapolate(
+            [data, start_i, end_i, mat_char[5], mat_char[2]], extrap_method,
+            initial_guess=initial_guess, maxfev=settings[0], timeout=settings[1],
+            necking=self._necking(data, mat_char, plastic_window, settings=settings))
+
+        return mat_char, data, (start_i, end_i), fitted_data
+
+    def _preview_finished(self, key: tuple, result: tuple) -> None:
+        """
+        Shows the result of a preview refit. While a window is moved only the
+        preview artists are redrawn, the final preview is plotted completely.
+        The preview becomes the current fit, but it is not stored in the
+        database.
+        ...
+
+        Parameter
+        ---------
+        key: tuple
+            key of the preview task
+        result: tuple
+            result of _fit_preview
+
+        Return
+        ------
+        None
+        """
+        if key != self._preview_key:
+            return
+
+        # the fit settings were changed while the preview was running
+        if key[4] != self._fit_settings():
+            self._submit_preview(key[3])
+            return
+
+        mat_char, data, (start_i, end_i), fitted_data = result
+        plotted = bool(self._fitted_data)
+
+        for column in ("strain", "stress", "plst_strain", "plst_stress"):
+            self._data[column] = data[column]
+
+        self._mat_characteristics = mat_char
+        self._fitted_data = fitted_data
+        self._fit_id = None
+        self._preview_seed = (self._extrap_method, fitted_data[2])
+
+        if key[3] or not plotted:
+            self._plot_results()
+        else:
+            self._gui.fill_lbls(mat_char, self._extrap_method, fitted_data[2])
+            self._show_modulus()
+            self._gui.update_preview("output", {
+                "window": (data["plst_strain"][start_i:end_i], data["plst_stress"][start_i:end_i]),
+                "curve": (fitted_data[0], fitted_data[1])})
+
+        self._update_status(
+            f"Preview with {self._e_end - self._e_start} points for Youngs Modulus and "
+            f"{end_i - start_i} points for the Yield Curve ({fitted_data[3]['nfev']} function "
+            f"evaluations). Fit and Extrapolate Curve to store the fit.",
+            "" if fitted_data[3]["success"] else "error")
+
+        self._submit_queued_preview()
+
+    def _find_fit(self) -> tuple | None:
+        """
+        Looks up a fit of the current data with the current settings in the database.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Return
+        ------
+        _: tuple | None
+            see CfDatabase.find_fit
+        """
+        if self._db is None:
+            return None
+
+        try:
+            return self._db.find_fit(self._data_hash, self._extrap_method,
+                                     self._e_start, self._e_end)
+        except sqlite3.Error as error:
+            self._update_status(
+                f"Database lookup failed - {error.args[0]}", "error")
+            return None
+
+    def _find_seed(self) -> tuple | None:
+        """
+        Looks up the nearest previous fit of a similar material as warm start.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Return
+        ------
+        _: tuple | None
+            see SeedStore.nearest
+        """
+        if self._seeds is None:
+            return None
+
+        try:
+            return self._seeds.nearest(self._mat_characteristics, self._extrap_method)
+        except sqlite3.Error as error:
+            self._update_status(
+                f"Database lookup failed - {error.args[0]}", "error")
+            return None
+
+    def _store_fit(self) -> None:
+        """
+        Stores the current material characteristics and fit in the database.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Return
+        ------
+        None
+        """
+        if self._db is None:
+            return
+
+        try:
+            material = self._data.attrs.get("label", file_stem(self._source_path))
+
+            self._fit_id = self._db.store_fit(
+                self._data_hash, material, "", str(self._source_path),
+                len(self._data), self._e_start, self._e_end, self._mat_characteristics,
+                self._extrap_method, self._fitted_data[2], self._fitted_data[3]["nfev"],
+                self._seed_fit_id)
+        except sqlite3.Error as error:
+            self._update_status(
+                f"Fit could not be stored in database - {error.args[0]}", "error")
+            return
+
+        if self._seeds is not None:
+            self._seeds.add(self._fit_id, self._mat_characteristics, self._extrap_method,
+                            self._fitted_data[2])
+
+    def _store_export(self, export_input: list[str]) -> None:
+        """
+        Stores the metadata of an export of the current fit in the database.
+        ...
+
+        Parameter
+        ---------
+        export_input: list[str]
+            user input from the export dialog as passed to CFModel.export_data
+
+        Return
+        ------
+        None
+        """
+        if self._db is None or self._fit_id is None:
+            return
+
+        try:
+            self._db.store_export(self._fit_id, export_input[6], export_input[0],
+                                  export_input[1], int(export_input[5]), export_input[7])
+        except sqlite3.Error as error:
+            self._update_status(
+                f"Export could not be stored in database - {error.args[0]}", "error")
+
+    def _export(self) -> None:
+        """
+        Handles the data export to a .k-file.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Return
+        ------
+        None
+        """
+        if not self._mat_characteristics:
+            self._update_status("No Data to Export.", "error")
+
+        else:
+            self._export_dlg = ExportDialog(self._cwd,
+                                            round(self._mat_characteristics[6], 2), self._gui,
+                                            self._export_formats)
+
+            # when the firs btn in the box (Save) is clicked an accepted signal is
+            # emitted since this btn has a acceptive role in the GUI. This signal
+            # is than connected to the accept method of the dialog. Similar is true
+            # for the secend btn which has a rejective role in the GUI
+            self._export_dlg.btnbx.accepted.connect(self._export_dlg.accept)
+            self._export_dlg.btnbx.rejected.connect(self._export_dlg.reject)
+            self._export_dlg.btn_file_out.clicked.connect(
+                partial(self._file_dialog, "*.k", "export"))
+
+            if self._export_dlg.exec() == 1:
+                
+                title = self._export_dlg.tb_title.text()
+                mid = self._export_dlg.tb_mid.text()
+                rho = self._export_dlg.tb_rho.text()
+                poisons_ratio = self._export_dlg.tb_poisons_ratio.text()
+                fail = self._export_dlg.tb_fail.text()
+                point_no = self._export_dlg.tb_point_no.text()
+                export_path = self._export_dlg.tb_out_path.text()
+                if self._export_dlg.rdbtn_equi.isChecked() is True:
+                    spacing = "equi"
+                else:
+                    spacing = "uneven"
+
+                export_input = [title, mid, rho, poisons_ratio, fail, point_no, export_path, spacing]
+                formats = self._export_dlg.formats()
+
+                trace = self._new_trace(f"Export {export_path}")
+
+                try:
+                    self._model.export_data(export_input, self._fitted_data,
+                                            self._mat_characteristics[0], export_path,
+                                            self._template_path_str, trace,
+                                            self._incremental_export, formats)
+                    self._update_status(
+                        f"Succesfully exported curve to {export_path}"
+                        + (f" and {len(formats)} additional formats." if formats else "."))
+
+                    self._store_export(export_input)
+
+                except (ExportPointNoError, FileError, DuplicateIdError) as error:
+                    self._update_status(
+                        f"{type(error).__name__} - {error.args[0]}", "error")
+                    self._export()
+
+                finally:
+                    self._finish_trace(trace)
+
+    def _save_session(self) -> None:
+        """
+        Saves the current data, fit and settings to a session file.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Return
+        ------
+        None
+        """
+        if self._data.empty:
+            self._update_status("No Data to save.", "error")
+            return
+
+        path_str, _ = self._gui.save_file_dialog("*.cfs")
+        if not path_str:
+            return
+
+        settings = {"e_start": self._e_start, "e_end": self._e_end,
+                    "plastic_window": self._plastic_window,
+                    "extrap_method": self._extrap_method,
+                    "template_path": self._template_path_str,
+                    "source": str(self._source_path), "data_hash": self._data_hash}
+
+        try:
+            save_session(Path(path_str), self._data, self._mat_characteristics,
+                         self._fitted_data, settings)
+            self._update_status(f"Session saved to {path_str}.")
+        except OSError as error:
+            self._update_status(
+                f"{type(error).__name__} - {error.args[-1]}", "error")
+
+    def _open_session(self) -> None:
+        """
+        Restores data, fit and settings from a session file without refitting.
+        The restored settings are used for the session only and are not
+        written to the .ini-file.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Return
+        ------
+        None
+        """
+        path_str, _ = self._gui.file_dialog("*.cfs")
+        if not path_str:
+            return
+
+        try:
+            data, mat_char, fitted_data, settings = load_session(Path(path_str))
+        except (FileError, SessionError) as error:
+            self._update_status(
+                f"{type(error).__name__} - {error.args[0]}", "error")
+            return
+
+        self._data = data
+        self._mat_characteristics = mat_char
+        if len(fitted_data) == 3:
+            # sessions saved without the fit status, the law is needed for the export
+            fitted_data.append(self._model.eval_extrapolation(
+                fitted_data[2], settings["extrap_method"])[3])
+
+        self._fitted_data = fitted_data
+        self._e_start = settings["e_start"]
+        self._e_end = settings["e_end"]
+        self._extrap_method = settings["extrap_method"]
+        self._template_path_str = settings["template_path"]
+        self._source_path = Path(settings["source"])
+        self._data_hash = settings["data_hash"]
+        self._fit_id = None
+        self._clear_import()
+
+        self._update_tb(self._gui.tb_in_path, settings["source"])
+        self._gui.clear_graphs("input")
+        self._gui.plot_data(self._data, "input")
+        plastic_window = settings.get("plastic_window")
+        self._reset_preview(tuple(plastic_window) if plastic_window is not None else None)
+
+        if self._fitted_data:
+            self._plot_results()
+
+        self._update_status(f"Session restored from {Path(path_str).name}.")
+
+    def _diagnostics(self) -> None:
+        """
+        Opens a dialog showing the recorded traces of the model stages.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Return
+        ------
+        None
+        """
+        seed_report = None
+        if self._seeds is not None:
+            try:
+                seed_report = self._seeds.report()
+            except sqlite3.Error as error:
+                self._update_status(
+                    f"Database lookup failed - {error.args[0]}", "error")
+
+        diagnostics_dlg = DiagnosticsDialog(self._traces, seed_report, self._gui)
+        diagnostics_dlg.btnbx.rejected.connect(diagnostics_dlg.reject)
+        diagnostics_dlg.exec()
+
+    def _sweep(self) -> None:
+        """
+        Opens a dialog to analyse the sensitivity of the fit to the fit windows.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Return
+        ------
+        None
+        """
+        if not self._mat_characteristics or "plst_strain" not in self._data:
+            self._update_status("No fitted data found, please fit data first.", "error")
+            return
+
+        parameter_names = [["c", "phi", "n"], ["sigma", "R", "B"],
+                           ["alpha", "c", "phi", "n", "sigma", "R", "B"]][self._extrap_method]
+
+        sweep_dlg = SweepDialog(parameter_names, self._gui)
+        sweep_dlg.btnbx.rejected.connect(sweep_dlg.reject)
+        sweep_dlg.btn_run.clicked.connect(partial(self._run_sweep, sweep_dlg))
+        # a running sweep is cancelled with the dialog
+        sweep_dlg.finished.connect(self._sweep_cancel.set)
+        sweep_dlg.exec()
+
+    def _overlay(self) -> None:
+        """
+        Opens a dialog overlaying the imported specimens or the fits stored in
+        the database.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Return
+        ------
+        None
+        """
+        overlay_dlg = OverlayDialog(self._gui)
+        overlay_dlg.btnbx.rejected.connect(overlay_dlg.reject)
+        overlay_dlg.cmb_source.currentIndexChanged.connect(
+            partial(self._show_overlay, overlay_dlg))
+
+        if not self._specimens and self._db is not None:
+            overlay_dlg.cmb_source.setCurrentIndex(1)
+        else:
+            self._show_overlay(overlay_dlg, 0)
+
+        overlay_dlg.exec()
+
+    def _show_overlay(self, overlay_dlg: OverlayDialog, source: int) -> None:
+        """
+        Plots the curves of the selected source in the overlay dialog.
+        ...
+
+        Parameter
+        ---------
+        overlay_dlg: OverlayDialog
+            the overlay dialog
+        source: int
+            0 = imported specimens (engineering stress - strain)
+            1 = fits stored in the database (yield curves)
+            2 = material cards of a keyword file (yield curves)
+
+        Return
+        ------
+        None
+        """
+        if source == 0:
+            curves, labels = [], []
+            rm, ag, af = [], [], []
+            for specimen in self._specimens:
+                strain = specimen["eng_strain"].to_numpy(dtype=np.float64)
+                stress = specimen["eng_stress"].to_numpy(dtype=np.float64)
+                curves.append((strain, stress))
+                labels.append(specimen.attrs["label"])
+
+                rm_i = int(np.nanargmax(stress)) if np.isfinite(stress).any() else 0
+                rm.append(stress[rm_i])
+                ag.append(strain[rm_i])
+                af.append(np.nanmax(strain))
+
+            overlay_dlg.show_curves(curves, labels, {"Rm": rm, "Strain at Rm": ag,
+                                                     "Max. Strain": af},
+                                    "Eng. Strain", "Eng. Stress", self._overlay_points)
+
+        elif source == 2:
+            self._show_deck_overlay(overlay_dlg)
+
+        else:
+            if self._db is None:
+                self._update_status("No database available.", "error")
+                return
+
+            try:
+                fits = self._db.query_fits()
+            except sqlite3.Error as error:
+                self._update_status(f"Database lookup failed - {error.args[0]}", "error")
+                return
+
+            curves = [tuple(np.asarray(values) for values in
+                            self._model.eval_extrapolation(parameter, law)[:2])
+                      for parameter, law in zip(fits["parameters"], fits["law"])]
+            labels = [f"{material} (fit {fit_id})"
+                      for material, fit_id in zip(fits["material"], fits["fit_id"])]
+
+            overlay_dlg.show_curves(curves, labels, {"Rm": fits["rm"], "Rp_02": fits["rp02"],
+                                                     "Youngs Modulus": fits["E"],
+                                                     "Uniform Strain": fits["ag"],
+                                                     "Law": fits["law"]},
+                                    "Plastic Strain", "True Stress", self._overlay_points)
+
+    def _show_deck_overlay(self, overlay_dlg: OverlayDialog) -> None:
+        """
+        Plots the yield curves of the *MAT_24 cards of a keyword file in the
+        overlay dialog. If the current data was fitted, the current fit is
+        added, every card is compared to it and refitted with the same law up
+        to the plastic strain at Rm of the current data. Cards of a library
+        are usually similar, so every refit is warm started from the
+        parameters of the previous one.
+        ...
+
+        Parameter
+        ---------
+        overlay_dlg: OverlayDialog
+            the overlay dialog
+
+        Return
+        ------
+        None
+        """
+        path_str, _ = self._gui.file_dialog("*.k")
+        if not path_str:
+            return
+
+        try:
+            deck = read_deck(Path(path_str))
+        except (FileError, FormatError) as error:
+            self._update_status(f"{type(error).__name__} - {error.args[0]}", "error")
+            return
+
+        materials = deck["materials"]
+        parameter_names = [["c", "phi", "n"], ["sigma", "R", "B"],
+                           ["alpha", "c", "phi", "n", "sigma", "R", "B"]][self._extrap_method]
+
+        fitted = len(self._fitted_data) > 0 and "plst_strain" in self._data
+        if fitted:
+            fit_strain = np.asarray(self._fitted_data[0], dtype=np.float64)
+            fit_stress = np.asarray(self._fitted_data[1], dtype=np.float64)
+            fit_end = float(np.nanmax(self._data["plst_strain"]))
+
+        curves, labels = [], []
+        properties = {"Youngs Modulus": [], "Initial Yield Stress": []}
+        guess = None
+        if fitted:
+            properties["Deviation from Fit [%]"] = []
+            properties.update({name: [] for name in parameter_names})
+
+        for mid, title in zip(materials.index, materials["title"]):
+            try:
+                strain, stress = material_curve(deck, int(mid))
+            except KeyError:
+                continue
+            if len(strain) < 2:
+                continue
+
+            curves.append((strain, stress))
+            labels.append(f"{title} (MID {mid})")
+            properties["Youngs Modulus"].append(materials.at[mid, "e"])
+            properties["Initial Yield Stress"].append(stress[0])
+
+            if fitted:
+                window = strain <= fit_end
+                reference = np.interp(strain[window], fit_strain, fit_stress)
+                deviation = (np.sqrt(np.mean((stress[window] - reference)**2))
+                             / np.mean(reference)*100 if window.any() else np.nan)
+                properties["Deviation from Fit [%]"].append(deviation)
+
+                try:
+                    parameter, status = self._model.refit_curve(
+                        strain, stress, self._extrap_method, fit_end, initial_guess=guess,
+                        maxfev=self._fit_maxfev, timeout=self._fit_timeout)[2:]
+                    if status["success"]:
+                        guess = parameter
+                except FitError:
+                    parameter = [np.nan]*len(parameter_names)
+                for name, value in zip(parameter_names, parameter):
+                    properties[name].append(value)
+
+        if not curves:
+            self._update_status(f"No *MAT_24 yield curves found in {path_str}.", "error")
+            return
+
+        if fitted:
+            curves.append((fit_strain, fit_stress))
+            labels.append("Current fit")
+            for values in properties.values():
+                values.append(np.nan)
+
+        overlay_dlg.show_curves(curves, labels, properties, "Plastic Strain", "Yield Stress",
+                                self._overlay_points)
+        self._update_status(f"{len(materials)} material cards read from {path_str}, "
+                            f"{len(curves) - fitted} yield curves plotted.")
+
+    def _run_sweep(self, sweep_dlg: SweepDialog) -> None:
+        """
+        Runs the fit window sweep selected in the sweep dialog in the thread
+        pool, which distributes the rows of the grid to worker processes. If
+        a sweep is running, it is cancelled instead.
+        ...
+
+        Parameter
+        ---------
+        sweep_dlg: SweepDialog
+            the dialog showing the result
+
+        Return
+        ------
+        None
+        """
+        if self._sweep_key is not None and self._loader.is_pending(self._sweep_key):
+            self._sweep_cancel.set()
+            self._update_status("Fit window sweep cancelled, finishing running rows...")
+            return
+
+        mode = sweep_dlg.cmb_mode.currentIndex()
+        starts, ends = default_grid(self._mat_characteristics, mode, self._e_start, self._e_end)
+
+        self._sweep_no += 1
+        self._sweep_key = ("sweep", self._import_generation, self._sweep_no)
+        self._sweep_cancel.clear()
+        self._sweep_dlg = sweep_dlg
+        sweep_dlg.set_running(True)
+        sweep_dlg.show_progress(0, len(starts))
+
+        # the data is copied at submit time, the fits of the UI may change it
+        self._loader.submit(self._sweep_key, sweep_fit_window,
+                            self._data[["eng_strain", "eng_stress", "plst_strain", "plst_stress"]],
+                            list(self._mat_characteristics), self._extrap_method, starts, ends,
+                            mode, 1.0, None, partial(self._loader.report, self._sweep_key),
+                            self._sweep_cancel)
+        self._update_status("Fit window sweep running...")
+
+    def _task_cancelled(self, key: tuple) -> None:
+        """
+        Discards the state of a task cancelled before it was started.
+        ...
+
+        Parameter
+        ---------
+        key: tuple
+            key of the task
+
+        Return
+        ------
+        None
+        """
+        self._tasks.pop(key, None)
+
+        if key == self._preview_key:
+            self._preview_queued = False
+        elif key == self._sweep_key:
+            self._stop_sweep()
+            self._update_status("Fit window sweep cancelled.")
+
+    def _stop_sweep(self) -> None:
+        """
+        Cancels a running fit window sweep and resets the sweep dialog. Rows
+        being fitted finish, their result is ignored.
+        """
+        self._sweep_cancel.set()
+        self._sweep_key = None
+
+        if self._sweep_dlg is not None:
+            self._sweep_dlg.set_running(False)
+
+    def _task_progress(self, key: tuple, done: int, total: int) -> None:
+        """
+        Shows the progress of a running sweep in the sweep dialog.
+        """
+        if key == self._sweep_key and self._sweep_dlg is not None:
+            self._sweep_dlg.show_progress(done, total)
+
+    def _sweep_finished(self, key: tuple, result: dict) -> None:
+        """
+        Shows the result of a finished or cancelled fit window sweep.
+        ...
+
+        Parameter
+        ---------
+        key: tuple
+            key of the sweep task
+        result: dict
+            result as returned by cf_sweep.sweep_fit_window
+
+        Return
+        ------
+        None
+        """
+        if key != self._sweep_key:
+            return
+
+        self._sweep_key = None
+        self._sweep_dlg.set_running(False)
+        self._sweep_dlg.show_result(result)
+
+        failed = int(np.isnan(result["stress"]).sum())
+        if result["cancelled"]:
+            self._update_status(f"Fit window sweep cancelled, {failed} of "
+                                f"{result['stress'].size} fits failed or skipped.")
+        else:
+            self._update_status(
+                f"Fit window sweep finished, {failed} of {result['stress'].size} fits failed.")
+
+    def _rate_family(self) -> None:
+        """
+        Opens a dialog to fit a family of tests at different strain rates.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Return
+        ------
+        None
+        """
+        rate_dlg = RateDialog(self._gui)
+        rate_dlg.btnbx.rejected.connect(rate_dlg.reject)
+        rate_dlg.btn_add.clicked.connect(partial(self._add_rate_files, rate_dlg))
+        rate_dlg.btn_remove.clicked.connect(rate_dlg.remove_selected)
+        rate_dlg.btn_fit.clicked.connect(partial(self._fit_rate_family, rate_dlg))
+        rate_dlg.btn_export.clicked.connect(self._export_rate_table)
+        rate_dlg.exec()
+
+    def _add_rate_files(self, rate_dlg: RateDialog) -> None:
+        """
+        Adds files selected by the user to the rate dialog. Strain rates
+        contained in the file names are filled in.
+        ...
+
+        Parameter
+        ---------
+        rate_dlg: RateDialog
+            the rate dialog
+
+        Return
+        ------
+        None
+        """
+        paths, _ = self._gui.files_dialog(DATA_FILE_FILTER)
+
+        for path_str in paths:
+            rate_dlg.add_file(path_str, rate_from_name(Path(path_str).name))
+
+    def _fit_rate_family(self, rate_dlg: RateDialog) -> None:
+        """
+        Imports the files of the rate dialog and fits them as family.
+        ...
+
+        Parameter
+        ---------
+        rate_dlg: RateDialog
+            the rate dialog
+
+        Return
+        ------
+        None
+        """
+        trace = self._new_trace("Strain rate family")
+
+        curves, mat_chars, rates = [], [], []
+        try:
+            for path_str, rate_str in rate_dlg.files():
+                df = self._model.get_data_from_file(Path(path_str), trace, self._column_mapping)
+                mat_char = self._model.comp_material_data(df, self._e_start, self._e_end, trace)
+
+                if not rate_str and "strain_rate" in df:
+                    # median strain rate of the fit window measured by the time channel
+                    rate = float(np.nanmedian(df["strain_rate"][mat_char[3]:mat_char[4]]))
+                else:
+                    try:
+                        rate = float(rate_str.replace(",", "."))
+                    except ValueError:
+                        raise ValueError(
+                            f"Invalid strain rate of {Path(path_str).name}.") from None
+
+                curves.append(self._model.comp_true_stress_strain(
+                    df, mat_char[3], mat_char[4], trace))
+                mat_chars.append(mat_char)
+                rates.append(rate)
+
+            law = rate_dlg.cmb_law.currentIndex()
+            rate_law = rate_dlg.cmb_rate_law.currentIndex()
+            self._rate_result = fit_rate_family(curves, mat_chars, rates, law, rate_law,
+                                                self._fit_maxfev, trace)
+        except (FileError, DataError, ColumnMappingError, FormatError, FitError,
+                ValueError) as error:
+            self._update_status(f"{type(error).__name__} - {error.args[0]}", "error")
+            return
+        finally:
+            self._finish_trace(trace)
+
+        # Youngs modulus and failure strain of the table are taken from the
+        # test with the lowest strain rate
+        self._rate_mat_char = mat_chars[int(np.argmin(rates))]
+
+        strain, stress = eval_rate_family(self._rate_result)
+        measured = [(df["plst_strain"][mc[3]:mc[4]].to_numpy(),
+                     df["plst_stress"][mc[3]:mc[4]].to_numpy())
+                    for df, mc in zip(curves, mat_chars)]
+
+        parameter_names = [["c", "phi", "n"], ["sigma", "R", "B"]][law]
+        rate_names = [["C", "P"], ["C"]][rate_law]
+        text = ", ".join(f"{name} = {value:.4g}" for name, value in
+                         zip(parameter_names + rate_names,
+                             self._rate_result["parameter"] + self._rate_result["rate_parameter"]))
+        text += "\nRMS [MPa]: " + ", ".join(f"{rms:.1f}" for rms in self._rate_result["rms"])
+        rate_dlg.show_result(measured, self._rate_result["rates"], strain, stress, text)
+
+        self._update_status(
+            f"Strain rate family fitted ({self._rate_result['nfev']} function evaluations, "
+            f"{trace.total_time():.2f} s).")
+
+    def _export_rate_table(self) -> None:
+        """
+        Handles the export of the fitted strain rate family to a .k-file.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Return
+        ------
+        None
+        """
+        if self._rate_result is None:
+            self._update_status("No Data to Export.", "error")
+            return
+
+        self._export_dlg = ExportDialog(self._cwd, round(self._rate_mat_char[6], 2), self._gui)
+        self._export_dlg.show_formats(False)
+        self._export_dlg.btnbx.accepted.connect(self._export_dlg.accept)
+        self._export_dlg.btnbx.rejected.connect(self._export_dlg.reject)
+        self._export_dlg.btn_file_out.clicked.connect(
+            partial(self._file_dialog, "*.k", "export"))
+
+        if self._export_dlg.exec() == 1:
+            spacing = "equi" if self._export_dlg.rdbtn_equi.isChecked() is True else "uneven"
+            export_path = self._export_dlg.tb_out_path.text()
+            export_input = [self._export_dlg.tb_title.text(), self._export_dlg.tb_mid.text(),
+                            self._export_dlg.tb_rho.text(),
+                            self._export_dlg.tb_poisons_ratio.text(),
+                            self._export_dlg.tb_fail.text(), self._export_dlg.tb_point_no.text(),
+                            export_path, spacing]
+
+            template_path = Path(self._table_template_path_str)
+            if not template_path.is_absolute():
+                template_path = self._cwd/template_path
+
+            trace = self._new_trace(f"Export {export_path}")
+
+            try:
+                export_rate_table(export_input, self._rate_result, self._rate_mat_char[0],
+                                  export_path, str(template_path), trace=trace,
+                                  incremental=self._incremental_export)
+                self._update_status(f"Succesfully exported table to {export_path}.")
+
+            except (ExportPointNoError, FileError, TemplateError, DuplicateIdError,
+                    ValueError) as error:
+                self._update_status(
+                    f"{type(error).__name__} - {error.args[0]}", "error")
+
+            finally:
+                self._finish_trace(trace)
+
+    def _exit_app(self) -> None:
+        """
+        Terminates the applicaiton.
+        ...
+
+        Parameter
+        ---------
+        None 
+
+        Return
+        ------
+        None
+        """
+
+        self._sweep_cancel.set()
+        self._loader.shutdown()
+        sys.exit()
+
+    def _settings(self) -> None:
+        """
+        Opens a Settings Dialog and handles the input.
+        ...
+
+        Parameter
+        --------
+        None
+
+        Return 
+        ------
+        None
+        """
+        extrap_methods = ["Swift", "Voce", "Swift-Voce"]
+        smoothing_methods = ["None", "Savitzky-Golay", "Median", "Moving Average"]
+        self._settings_dlg = SettingsDialog(self._cwd, extrap_methods, self._extrap_method, self._e_start,
+                                            self._e_end, self._template_path_str,
+                                            smoothing_methods, self._smoothing_method,
+                                            self._smoothing_window, self._gui)
+
+        self._settings_dlg.btnbx.rejected.connect(self._settings_dlg.reject)
+        self._settings_dlg.btnbx.accepted.connect(self._settings_dlg.accept)
+        self._settings_dlg.btn_temp_path.clicked.connect(
+            partial(self._file_dialog, "*.k", "settings"))
+
+        if self._settings_dlg.exec() == 1:
+            if int(self._settings_dlg.tb_e_end.text()) - int(self._settings_dlg.tb_e_start.text()) < 50:
+                self._update_status(
+                    "It is recommended to use at least 50 data points to fit the Youngs Modulus. Changes discarded.", "error")
+                self._settings()
+            elif int(self._settings_dlg.tb_smoothing_window.text()) < 1:
+                self._update_status(
+                    "The smoothing window must contain at least 1 data point. Changes discarded.", "error")
+                self._settings()
+            else:
+                self._e_start = int(self._settings_dlg.tb_e_start.text())
+                self._e_end = int(self._settings_dlg.tb_e_end.text())
+                self._extrap_method = self._settings_dlg.cmb_extrap_method.currentIndex()
+                self._template_path_str = self._settings_dlg.tb_template_path.text()
+                self._smoothing_method = self._settings_dlg.cmb_smoothing_method.currentIndex()
+                self._smoothing_window = int(self._settings_dlg.tb_smoothing_window.text())
+
+                self._write_ini(str(self._e_start), str(self._e_end), str(self._extrap_method),
+                                self._template_path_str, str(self._smoothing_method),
+                                str(self._smoothing_window))
+
+                if not self._data.empty:
+                    self._reset_preview(self._plastic_window)
 
                 self._update_status("New Settings saved.")
         else:
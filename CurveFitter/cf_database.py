@@ -0,0 +1,382 @@
+import json
+import sqlite3
+from hashlib import sha256
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS specimens (
+    id INTEGER PRIMARY KEY,
+    material TEXT NOT NULL,
+    grade TEXT NOT NULL DEFAULT '',
+    date TEXT NOT NULL,
+    source TEXT NOT NULL DEFAULT '',
+    data_hash TEXT NOT NULL UNIQUE,
+    point_no INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS characteristics (
+    specimen_id INTEGER PRIMARY KEY REFERENCES specimens(id) ON DELETE CASCADE,
+    e_start INTEGER NOT NULL,
+    e_end INTEGER NOT NULL,
+    E REAL NOT NULL,
+    rp02 REAL NOT NULL,
+    rm REAL NOT NULL,
+    rp02_i INTEGER NOT NULL,
+    rm_i INTEGER NOT NULL,
+    ag REAL NOT NULL,
+    a REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS fits (
+    id INTEGER PRIMARY KEY,
+    specimen_id INTEGER NOT NULL REFERENCES specimens(id) ON DELETE CASCADE,
+    law INTEGER NOT NULL,
+    e_start INTEGER NOT NULL,
+    e_end INTEGER NOT NULL,
+    parameters TEXT NOT NULL,
+    date TEXT NOT NULL,
+    nfev INTEGER,
+    seed_fit_id INTEGER,
+    UNIQUE (specimen_id, law, e_start, e_end)
+);
+
+CREATE TABLE IF NOT EXISTS exports (
+    id INTEGER PRIMARY KEY,
+    fit_id INTEGER NOT NULL REFERENCES fits(id) ON DELETE CASCADE,
+    path TEXT NOT NULL,
+    title TEXT NOT NULL,
+    mid TEXT NOT NULL,
+    point_no INTEGER NOT NULL,
+    spacing TEXT NOT NULL,
+    date TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_specimens_material ON specimens(material);
+CREATE INDEX IF NOT EXISTS idx_specimens_grade ON specimens(grade);
+CREATE INDEX IF NOT EXISTS idx_specimens_date ON specimens(date);
+CREATE INDEX IF NOT EXISTS idx_characteristics_rp02 ON characteristics(rp02);
+CREATE INDEX IF NOT EXISTS idx_characteristics_rm ON characteristics(rm);
+CREATE INDEX IF NOT EXISTS idx_fits_law ON fits(law, specimen_id);
+CREATE INDEX IF NOT EXISTS idx_exports_fit ON exports(fit_id);
+"""
+
+# Columns added to existing databases after their creation
+_MIGRATIONS = {
+    "fits": {"nfev": "INTEGER",
+             "seed_fit_id": "INTEGER"},
+}
+
+
+def data_hash(df: pd.DataFrame) -> str:
+    """
+    Compute a hash of the raw engineering stress - strain data.
+    ...
+
+    Parameter
+    ---------
+    df: DataFrame
+        dataframe as returned by get_data_from_file
+
+    Returns
+    -------
+    _: str
+        hex digest identifying the raw data
+    """
+    raw = np.ascontiguousarray(
+        df[["eng_strain", "eng_stress"]].to_numpy(dtype=np.float64))
+
+    return sha256(raw.tobytes()).hexdigest()
+
+
+class CfDatabase:
+    """
+    Local SQLite store of specimens, material characteristics,
+    fit parameters and export metadata.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        """
+        CfDatabase init function. Creates the database file and its
+        tables if they do not exist yet.
+        ...
+
+        Parameter
+        ---------
+        db_path: Path
+            path to the SQLite database file
+
+        Returns
+        -------
+        None
+        """
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._con = sqlite3.connect(db_path)
+        self._con.row_factory = sqlite3.Row
+        self._con.execute("PRAGMA foreign_keys = ON")
+        self._con.execute("PRAGMA journal_mode = WAL")
+        self._con.executescript(_SCHEMA)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        """
+        Add columns missing in databases created by older versions.
+        """
+        with self._con:
+            for table, columns in _MIGRATIONS.items():
+                existing = {row["name"] for row in
+                            self._con.execute(f"PRAGMA table_info({table})")}
+                for column, definition in columns.items():
+                    if column not in existing:
+                        self._con.execute(
+                            f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        self._con.close()
+
+    def __enter__(self) -> "CfDatabase":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def find_fit(self, hash_str: str, law: int, e_start: int,
+                 e_end: int) -> tuple[int, list[float | int], list[float]] | None:
+        """
+        Look up a stored fit for the given raw data and settings.
+        ...
+
+        Parameter
+        ---------
+        hash_str: str
+            hash of the raw data (see data_hash)
+        law: int
+            extrapolation method (0 = Swift, 1 = Voce, 2 = Swift-Voce)
+        e_start: int
+            index of the first data point used for the youngs modulus
+        e_end: int
+            index of the last data point used for the youngs modulus
+
+        Returns
+        -------
+        _: tuple[int, list[float|int], list[float]] | None
+            None if no matching fit is stored, otherwise
+            0 = id of the fit [int]
+            1 = material characteristics as returned by comp_material_data
+            2 = fitted parameters [list[float]]
+        """
+        row = self._con.execute(
+            """
+            SELECT f.id, f.parameters, c.E, c.rp02, c.rm, c.rp02_i, c.rm_i, c.ag, c.a
+            FROM specimens s
+            JOIN characteristics c ON c.specimen_id = s.id
+            JOIN fits f ON f.specimen_id = s.id
+            WHERE s.data_hash = ? AND f.law = ? AND f.e_start = ? AND f.e_end = ?
+              AND c.e_start = f.e_start AND c.e_end = f.e_end
+            """, (hash_str, law, e_start, e_end)).fetchone()
+
+        if row is None:
+            return None
+
+        mat_char = [row["E"], row["rp02"], row["rm"], row["rp02_i"],
+                    row["rm_i"], row["ag"], row["a"]]
+
+        return row["id"], mat_char, json.loads(row["parameters"])
+
+    def store_fit(self, hash_str: str, material: str, grade: str, source: str,
+                  point_no: int, e_start: int, e_end: int, mat_char: list[float | int],
+                  law: int, parameter: list[float], nfev: int | None = None,
+                  seed_fit_id: int | None = None) -> int:
+        """
+        Store a specimen together with its material characteristics and
+        fitted parameters. Existing entries for the same data and
+        settings are replaced.
+        ...
+
+        Parameter
+        ---------
+        hash_str: str
+            hash of the raw data (see data_hash)
+        material: str
+            material name
+        grade: str
+            material grade
+        source: str
+            path of the file the data was imported from
+        point_no: int
+            number of data points of the raw data
+        e_start: int
+            index of the first data point used for the youngs modulus
+        e_end: int
+            index of the last data point used for the youngs modulus
+        mat_char: list[float|int]
+            material characteristics as returned by comp_material_data
+        law: int
+            extrapolation method (0 = Swift, 1 = Voce, 2 = Swift-Voce)
+        parameter: list[float]
+            fitted parameters
+        nfev: int | None, default = None
+            number of function evaluations of the fit
+        seed_fit_id: int | None, default = None
+            id of the fit whose parameters were used as warm start. Kept
+            as provenance even if that fit is replaced later.
+
+        Returns
+        -------
+        _: int
+            id of the stored fit
+        """
+        now = datetime.now().isoformat(timespec="seconds")
+
+        with self._con:
+            self._con.execute(
+                """
+                INSERT INTO specimens (material, grade, date, source, data_hash, point_no)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (data_hash) DO UPDATE SET
+                    material = excluded.material, grade = excluded.grade,
+                    source = excluded.source
+                """, (material, grade, now, source, hash_str, point_no))
+
+            specimen_id = self._con.execute(
+                "SELECT id FROM specimens WHERE data_hash = ?", (hash_str,)).fetchone()[0]
+
+            self._con.execute(
+                """
+                INSERT OR REPLACE INTO characteristics
+                    (specimen_id, e_start, e_end, E, rp02, rm, rp02_i, rm_i, ag, a)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (specimen_id, e_start, e_end, float(mat_char[0]), float(mat_char[1]),
+                      float(mat_char[2]), int(mat_char[3]), int(mat_char[4]),
+                      float(mat_char[5]), float(mat_char[6])))
+
+            # Fits computed with a different youngs modulus window are no longer
+            # consistent with the stored characteristics.
+            self._con.execute(
+                "DELETE FROM fits WHERE specimen_id = ? AND (e_start != ? OR e_end != ?)",
+                (specimen_id, e_start, e_end))
+
+            self._con.execute(
+                """
+                INSERT INTO fits (specimen_id, law, e_start, e_end, parameters, date, nfev,
+                                  seed_fit_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (specimen_id, law, e_start, e_end) DO UPDATE SET
+                    parameters = excluded.parameters, date = excluded.date,
+                    nfev = excluded.nfev, seed_fit_id = excluded.seed_fit_id
+                """, (specimen_id, law, e_start, e_end,
+                      json.dumps([float(p) for p in parameter]), now, nfev, seed_fit_id))
+
+            return self._con.execute(
+                "SELECT id FROM fits WHERE specimen_id = ? AND law = ? AND e_start = ? AND e_end = ?",
+                (specimen_id, law, e_start, e_end)).fetchone()[0]
+
+    def store_export(self, fit_id: int, path_str: str, title: str, mid: str,
+                     point_no: int, spacing: str) -> None:
+        """
+        Store the metadata of an export of a fitted curve.
+        ...
+
+        Parameter
+        ---------
+        fit_id: int
+            id of the exported fit
+        path_str: str
+            path the material card was written to
+        title: str
+            material title
+        mid: str
+            material id
+        point_no: int
+            number of exported data points
+        spacing: str
+            spacing type ("equi" or "uneven")
+
+        Returns
+        -------
+        None
+        """
+        with self._con:
+            self._con.execute(
+                """
+                INSERT INTO exports (fit_id, path, title, mid, point_no, spacing, date)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (fit_id, path_str, title, mid, point_no, spacing,
+                      datetime.now().isoformat(timespec="seconds")))
+
+    def query_fits(self, material: str | None = None, grade: str | None = None,
+                   law: int | None = None, rm: tuple[float, float] | None = None,
+                   rp02: tuple[float, float] | None = None,
+                   date: tuple[str, str] | None = None) -> pd.DataFrame:
+        """
+        Query stored fits. All given filters are combined, ranges are inclusive.
+        ...
+
+        Parameter
+        ---------
+        material: str | None
+            material name
+        grade: str | None
+            material grade
+        law: int | None
+            extrapolation method (0 = Swift, 1 = Voce, 2 = Swift-Voce)
+        rm: tuple[float, float] | None
+            lower and upper bound of Rm
+        rp02: tuple[float, float] | None
+            lower and upper bound of Rp_02
+        date: tuple[str, str] | None
+            lower and upper bound of the import date (ISO format)
+
+        Returns
+        -------
+        _: DataFrame
+            one row per fit with specimen, characteristics and the
+            fitted parameters (decoded to a list)
+        """
+        conditions = []
+        args: list = []
+
+        if material is not None:
+            conditions.append("s.material = ?")
+            args.append(material)
+        if grade is not None:
+            conditions.append("s.grade = ?")
+            args.append(grade)
+        if law is not None:
+            conditions.append("f.law = ?")
+            args.append(law)
+        if rm is not None:
+            conditions.append("c.rm BETWEEN ? AND ?")
+            args.extend(rm)
+        if rp02 is not None:
+            conditions.append("c.rp02 BETWEEN ? AND ?")
+            args.extend(rp02)
+        if date is not None:
+            conditions.append("s.date BETWEEN ? AND ?")
+            args.extend(date)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        df = pd.read_sql_query(
+            f"""
+            SELECT f.id AS fit_id, s.id AS specimen_id, s.material, s.grade, s.date,
+                   s.source, s.data_hash, c.E, c.rp02, c.rm, c.ag, c.a,
+                   f.law, f.e_start, f.e_end, f.parameters, f.nfev, f.seed_fit_id
+            FROM fits f
+            JOIN specimens s ON s.id = f.specimen_id
+            JOIN characteristics c ON c.specimen_id = s.id
+            {where}
+            ORDER BY s.date
+            """, self._con, params=args)
+
+        df["parameters"] = df["parameters"].map(json.loads)
+
+        return df
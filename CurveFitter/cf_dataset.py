@@ -0,0 +1,257 @@
+import atexit
+import warnings
+from pathlib import Path
+from multiprocessing import shared_memory
+from uuid import uuid4
+
+import numpy as np
+import pandas as pd
+
+
+# Names of the shared memory segments and files created by this process which
+# have not been unlinked yet. Used for leak detection.
+_owned: dict[str, str] = {}
+
+
+def live_datasets() -> list[str]:
+    """
+    Names of the shared memory segments and paths of the memory-mapped files
+    created by this process which have not been unlinked yet.
+    """
+    return list(_owned)
+
+
+@atexit.register
+def _cleanup() -> None:
+    """
+    Unlink datasets leaked by this process at interpreter exit.
+    """
+    for name, backend in list(_owned.items()):
+        warnings.warn(f"SharedDataset {name} was not unlinked, cleaning up at exit.",
+                      ResourceWarning)
+        _unlink(name, backend)
+
+
+def _unlink(name: str, backend: str) -> None:
+    """
+    Remove the shared memory segment or memory-mapped file of a dataset.
+    """
+    try:
+        if backend == "shm":
+            shm = shared_memory.SharedMemory(name=name)
+            shm.close()
+            shm.unlink()
+        else:
+            Path(name).unlink(missing_ok=True)
+    except FileNotFoundError:
+        pass
+
+    _owned.pop(name, None)
+
+
+class SharedDataset:
+    """
+    Float64 columns stored as one block in shared memory or a memory-mapped
+    file. Processes exchange only a small handle, the data itself is mapped
+    and never copied. Pickling a dataset (e.g. as an argument of a process
+    pool task) pickles the handle, unpickling attaches to the data.
+
+    The creating process owns the data and has to unlink it, attached
+    processes only close their mapping. Owned datasets which are garbage
+    collected or still alive at exit without being unlinked emit a
+    ResourceWarning.
+    """
+
+    def __init__(self, backend: str, name: str, columns: list[str], shape: tuple[int, int],
+                 owner: bool, create: bool = False) -> None:
+        """
+        SharedDataset init function. Use SharedDataset.create or
+        SharedDataset.attach instead.
+        ...
+
+        Parameter
+        ---------
+        backend: str
+            "shm" for multiprocessing.shared_memory or "mmap" for a
+            memory-mapped file
+        name: str
+            name of the shared memory segment or path of the file
+        columns: list[str]
+            names of the columns
+        shape: tuple[int, int]
+            shape of the block (columns, rows)
+        owner: bool
+            whether this instance owns (and has to unlink) the data
+        create: bool, default = False
+            create the shared memory segment or file
+
+        Returns
+        -------
+        None
+        """
+        self.backend = backend
+        self.name = name
+        self.columns = list(columns)
+        self.shape = shape
+        self._owner = owner
+        self._shm = None
+        self._closed = False
+
+        nbytes = max(int(np.prod(shape))*8, 1)
+
+        if backend == "shm":
+            if create:
+                self._shm = shared_memory.SharedMemory(name=name, create=True, size=nbytes)
+            else:
+                self._shm = shared_memory.SharedMemory(name=name)
+            self._block = np.ndarray(shape, dtype=np.float64, buffer=self._shm.buf)
+        elif backend == "mmap":
+            mode = "w+" if create else ("r+" if owner else "r")
+            self._block = np.memmap(name, dtype=np.float64, mode=mode, shape=shape)
+        else:
+            raise ValueError(f"Unknown backend {backend}.")
+
+        if not owner:
+            self._block.flags.writeable = False
+
+        if create:
+            _owned[name] = backend
+
+    @classmethod
+    def create(cls, df: pd.DataFrame, columns: list[str] | None = None, backend: str = "shm",
+               path: Path | None = None) -> "SharedDataset":
+        """
+        Create a dataset from the given dataframe columns.
+        ...
+
+        Parameter
+        ---------
+        df: DataFrame
+            dataframe containing the data
+        columns: list[str] | None, default = None
+            columns to be shared, defaults to all columns
+        backend: str, default = "shm"
+            "shm" for multiprocessing.shared_memory or "mmap" for a
+            memory-mapped file
+        path: Path | None, default = None
+            path of the memory-mapped file, defaults to a file in the
+            current directory
+
+        Returns
+        -------
+        _: SharedDataset
+            the owning dataset
+        """
+        columns = list(df.columns) if columns is None else list(columns)
+        shape = (len(columns), len(df))
+
+        if backend == "shm":
+            name = f"cf_{uuid4().hex[:16]}"
+        else:
+            name = str(path if path is not None else Path(f"cf_{uuid4().hex[:16]}.dat"))
+
+        dataset = cls(backend, name, columns, shape, owner=True, create=True)
+
+        for i, column in enumerate(columns):
+            dataset._block[i] = df[column].to_numpy(dtype=np.float64)
+
+        return dataset
+
+    @classmethod
+    def attach(cls, handle: tuple) -> "SharedDataset":
+        """
+        Attach to a dataset created by another process.
+        ...
+
+        Parameter
+        ---------
+        handle: tuple
+            handle of the dataset (see SharedDataset.handle)
+
+        Returns
+        -------
+        _: SharedDataset
+            the attached (read-only) dataset
+        """
+        backend, name, columns, shape = handle
+
+        return cls(backend, name, columns, tuple(shape), owner=False)
+
+    @property
+    def handle(self) -> tuple:
+        """
+        Small picklable handle identifying the dataset.
+        """
+        return (self.backend, self.name, self.columns, self.shape)
+
+    def __reduce__(self):
+        return (SharedDataset.attach, (self.handle,))
+
+    def __len__(self) -> int:
+        return self.shape[1]
+
+    def __contains__(self, column: str) -> bool:
+        return column in self.columns
+
+    def __enter__(self) -> "SharedDataset":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+        if self._owner:
+            self.unlink()
+
+    def _check(self) -> None:
+        if self._closed:
+            raise ValueError(f"SharedDataset {self.name} is closed.")
+
+    def array(self, column: str) -> np.ndarray:
+        """
+        Zero-copy view of a column.
+        """
+        self._check()
+
+        return self._block[self.columns.index(column)]
+
+    def frame(self) -> pd.DataFrame:
+        """
+        Dataframe whose columns are zero-copy views of the data. Columns
+        added to the dataframe are not shared.
+        """
+        self._check()
+
+        return pd.DataFrame(self._block.T, columns=self.columns, copy=False)
+
+    def close(self) -> None:
+        """
+        Close the mapping of this process. Views obtained before must not
+        be used afterwards.
+        """
+        if self._closed:
+            return
+
+        self._block = None
+        if self._shm is not None:
+            self._shm.close()
+        self._closed = True
+
+    def unlink(self) -> None:
+        """
+        Remove the data. Only the owning process may unlink a dataset.
+        """
+        if not self._owner:
+            raise ValueError("Only the creating process can unlink a SharedDataset.")
+
+        self.close()
+        _unlink(self.name, self.backend)
+
+    def __del__(self) -> None:
+        if getattr(self, "_owner", False) and self.name in _owned:
+            warnings.warn(f"SharedDataset {self.name} was garbage collected without being "
+                          "unlinked.", ResourceWarning)
+        if not getattr(self, "_closed", True):
+            try:
+                self.close()
+            except BufferError:
+                # views of the data are still in use
+                pass
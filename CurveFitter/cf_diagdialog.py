@@ -0,0 +1,179 @@
+from PyQt5.QtWidgets import (QDialog, QDialogButtonBox, QLabel, QVBoxLayout,
+                             QTreeWidget, QTreeWidgetItem, QSizePolicy)
+from PyQt5.QtGui import QFont
+import pandas as pd
+
+from cf_trace import Trace
+
+
+class DiagnosticsDialog(QDialog):
+    """
+    Dialog window showing the recorded traces of the model pipeline.
+    """
+
+    _COLUMNS = ["Stage", "Time [ms]", "Memory [KiB]", "Points", "nfev", "Info"]
+
+    _SEED_COLUMNS = ["Law", "Fits w/o Seed", "Fits with Seed", "Mean nfev w/o Seed",
+                     "Mean nfev with Seed", "Reduction [%]"]
+
+    def __init__(self, traces: list[Trace], seed_report: pd.DataFrame | None = None,
+                 parent=None) -> None:
+        """
+        Diagnostics Dialogs init function.
+        ...
+
+        Parameter
+        ---------
+        traces: list[Trace]
+            the recorded traces, oldest first
+        seed_report: DataFrame | None, default = None
+            function evaluations with and without warm start as returned by
+            SeedStore.report
+        parent: QWidget
+            parent widget of the dialog, defaults to None.
+
+        Return
+        ------
+        None
+        """
+        super().__init__(parent)
+
+        self.setWindowTitle("Diagnostics")
+        self.resize(800, 400)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self._create_fonts()
+        self._create_lbls()
+        self._create_tree(traces)
+        self._create_btns()
+        self._layout = QVBoxLayout()
+        self.setLayout(self._layout)
+
+        self._layout.addWidget(self._lbl_title)
+        self._layout.addWidget(self.tree)
+
+        if seed_report is not None:
+            self._create_seed_tree(seed_report)
+            self._layout.addWidget(self._lbl_seeds)
+            self._layout.addWidget(self.seed_tree)
+
+        self._layout.addWidget(self.btnbx)
+
+    def _create_btns(self) -> None:
+        """
+        Create the buttons for the dialog.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Return
+        ------
+        None
+        """
+        self.btnbx = QDialogButtonBox(QDialogButtonBox.Close)
+
+    def _create_lbls(self) -> None:
+        """
+        Create the labels necessary for the dialog.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self._lbl_title = QLabel("Recorded stages of the last computations:")
+        self._lbl_title.setFont(self._title_font)
+
+        self._lbl_seeds = QLabel("Function evaluations of the stored fits:")
+        self._lbl_seeds.setFont(self._title_font)
+
+    def _create_tree(self, traces: list[Trace]) -> None:
+        """
+        Create the tree widget listing the traces and their stages.
+        ...
+
+        Parameter
+        ---------
+        traces: list[Trace]
+            the recorded traces, oldest first
+
+        Return
+        ------
+        None
+        """
+        self.tree = QTreeWidget()
+        self.tree.setFont(self._font)
+        self.tree.setHeaderLabels(self._COLUMNS)
+
+        for trace in reversed(traces):
+            trace_item = QTreeWidgetItem(
+                [f"{trace.date} {trace.name}", f"{trace.total_time()*1000:.1f}"])
+            self.tree.addTopLevelItem(trace_item)
+
+            parents = [trace_item]
+            for stage in trace.stages:
+                del parents[stage["depth"]+1:]
+
+                info = {k: v for k, v in stage.items()
+                        if k not in ("stage", "depth", "time", "mem_delta", "point_no",
+                                     "nfev")}
+                mem = f"{stage['mem_delta']/1024:.1f}" if "mem_delta" in stage else ""
+
+                item = QTreeWidgetItem([stage["stage"], f"{stage.get('time', 0)*1000:.1f}",
+                                        mem, str(stage.get("point_no", "")),
+                                        str(stage.get("nfev", "")),
+                                        ", ".join(f"{k}={v}" for k, v in info.items())])
+                parents[-1].addChild(item)
+                parents.append(item)
+
+        self.tree.expandAll()
+        for i in range(len(self._COLUMNS)):
+            self.tree.resizeColumnToContents(i)
+
+    def _create_seed_tree(self, seed_report: pd.DataFrame) -> None:
+        """
+        Create the tree widget comparing fits with and without warm start.
+        ...
+
+        Parameter
+        ---------
+        seed_report: DataFrame
+            report as returned by SeedStore.report
+
+        Return
+        ------
+        None
+        """
+        self.seed_tree = QTreeWidget()
+        self.seed_tree.setFont(self._font)
+        self.seed_tree.setHeaderLabels(self._SEED_COLUMNS)
+        self.seed_tree.setRootIsDecorated(False)
+
+        for row in seed_report.itertuples(index=False):
+            self.seed_tree.addTopLevelItem(QTreeWidgetItem(
+                [row.law, str(row.cold_fits), str(row.seeded_fits), f"{row.cold_nfev:.1f}",
+                 f"{row.seeded_nfev:.1f}", f"{row.reduction:.1f}"]))
+
+        for i in range(len(self._SEED_COLUMNS)):
+            self.seed_tree.resizeColumnToContents(i)
+
+    def _create_fonts(self) -> None:
+        """
+        Create the fonts necessary for the dialog.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self._title_font = QFont("Calibri", 12, QFont.Bold)
+        self._font = QFont("Calibri", 10)
@@ -47,3 +47,69 @@ class DataError(Exception):
         self.message = f"Expected 2 columns in file, but found {row_no}."
 
         super().__init__(self.message)
+
+
+class SessionError(Exception):
+    """
+    Custom Error. Raised when a file is not a valid session file.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.message = f"{self.path} is not a valid session file."
+
+        super().__init__(self.message)
+
+
+class FitError(Exception):
+    """
+    Custom Error. Raised when a hardening law could not be fitted to the data,
+    not even with the fallback estimates.
+    """
+
+    def __init__(self, law: str, reason: str) -> None:
+        self.law = law
+        self.reason = reason
+        self.message = f"The {law} law could not be fitted to the data: {reason}"
+
+        super().__init__(self.message)
+
+
+class ColumnMappingError(Exception):
+    """
+    Custom Error. Raised when columns of the column mapping profile are not
+    found in a file.
+    """
+
+    def __init__(self, columns: list) -> None:
+        self.columns = columns
+        self.message = f"Columns {columns} of the column mapping were not found in the file."
+
+        super().__init__(self.message)
+
+
+class FormatError(Exception):
+    """
+    Custom Error. Raised when a data file format cannot be read.
+    """
+
+    def __init__(self, file_path: Path, reason: str) -> None:
+        self.file_path = file_path
+        self.message = f"{file_path.name} cannot be read, {reason}."
+
+        super().__init__(self.message)
+
+
+class DuplicateIdError(Exception):
+    """
+    Custom Error. Raised when merged keyword cards would define a curve id
+    which is already used by another curve or table of the library.
+    """
+
+    def __init__(self, file_path: Path, ids: list[int]) -> None:
+        self.file_path = file_path
+        self.ids = ids
+        self.message = (f"Curve ids {ids} are already used by other curves or tables "
+                        f"in {file_path.name}.")
+
+        super().__init__(self.message)
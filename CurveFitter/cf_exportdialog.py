@@ -1,15 +1,18 @@
 from pathlib import Path
-from PyQt5.QtWidgets import (QDialog, QPushButton, QDialogButtonBox, QLineEdit,
+from PyQt5.QtWidgets import (QDialog, QPushButton, QDialogButtonBox, QLineEdit, QCheckBox,
                              QLabel, QFormLayout, QSpacerItem, QRadioButton, QSizePolicy)
 from PyQt5.QtGui import (QFont, QIcon)
 
+from cf_writers import FORMATS
+
 
 class ExportDialog(QDialog):
     """
     Dialog window to recieve user input for data export.
     """
 
-    def __init__(self, cwd: Path, failure_strain: float, parent=None) -> None:
+    def __init__(self, cwd: Path, failure_strain: float, parent=None,
+                 formats: list[str] | None = None) -> None:
         """
         Export Dialogs init function.
         ...
@@ -22,6 +25,8 @@ class ExportDialog(QDialog):
             failure strain of material.
         parent:_ default= None
             parent widget of the dialog.
+        formats: list[str] | None, default = None
+            additional export targets checked initially, see cf_writers.FORMATS
 
         Return
         ------
@@ -36,6 +41,7 @@ class ExportDialog(QDialog):
         self._create_lbls()
         self._create_tbs(failure_strain)
         self._create_rdbtn()
+        self._create_chbxs(formats or [])
         self._layout = QFormLayout()
         self._spacer = QSpacerItem(10, 20)
         self.setLayout(self._layout)
@@ -52,6 +58,10 @@ class ExportDialog(QDialog):
         self._layout.addRow(self.tb_point_no)
         self._layout.addRow(self.rdbtn_uneven)
         self._layout.addRow(self.rdbtn_equi)
+        self._layout.addItem(self._spacer)
+        self._layout.addRow(self._lbl_formats)
+        for chbx in self.chbx_formats.values():
+            self._layout.addRow(chbx)
         self._layout.addRow(self.btnbx)
 
     def _create_btns(self, cwd: Path) -> None:
@@ -105,6 +115,9 @@ class ExportDialog(QDialog):
         self._lbl_point_no = QLabel("No of datapoints to export:")
         self._lbl_point_no.setFont(self._font)
 
+        self._lbl_formats = QLabel("Additional formats:")
+        self._lbl_formats.setFont(self._font)
+
     def _create_tbs(self, failure_strain: int) -> None:
         """
         Create the textboxes necessary for the dialog.
@@ -160,6 +173,62 @@ class ExportDialog(QDialog):
         self.rdbtn_uneven.setChecked(True)
         self.rdbtn_uneven.setFont(self._font)
 
+    def _create_chbxs(self, formats: list[str]) -> None:
+        """
+        Create the check boxes of the additional export targets.
+        ...
+
+        Parameter
+        ---------
+        formats: list[str]
+            names of the targets checked initially
+
+        Return
+        ------
+        None
+        """
+        self.chbx_formats = {}
+        for fmt, (suffix, description) in FORMATS.items():
+            chbx = QCheckBox(f"{description} ({suffix})")
+            chbx.setFont(self._font)
+            chbx.setChecked(fmt in formats)
+            self.chbx_formats[fmt] = chbx
+
+    def formats(self) -> list[str]:
+        """
+        Names of the checked additional export targets.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Return
+        ------
+        _: list[str]
+            names of the targets, see cf_writers.FORMATS
+        """
+        return [fmt for fmt, chbx in self.chbx_formats.items() if chbx.isChecked()]
+
+    def show_formats(self, visible: bool) -> None:
+        """
+        Show or hide the additional export targets, e.g. for exports they do
+        not apply to.
+        ...
+
+        Parameter
+        ---------
+        visible: bool
+            whether the check boxes are shown
+
+        Return
+        ------
+        None
+        """
+        self._lbl_formats.setVisible(visible)
+        for chbx in self.chbx_formats.values():
+            chbx.setVisible(visible)
+
     def _create_fonts(self) -> None:
         """
         Create the dialogs fonts.
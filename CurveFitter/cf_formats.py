@@ -0,0 +1,617 @@
+import io
+import gzip
+import codecs
+import argparse
+from pathlib import Path
+from typing import IO, Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    import pyarrow.ipc as ipc
+except ImportError:
+    pa = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from cf_errors import FormatError, ColumnMappingError
+
+
+# file filter of the import dialogs
+DATA_FILE_FILTER = "Data files (*.csv *.csv.gz *.csv.zst *.parquet *.arrow *.feather)"
+
+_COMPRESSED_SUFFIXES = {".gz": "gzip", ".zst": "zstd"}
+_COLUMNAR_SUFFIXES = {".parquet": "parquet", ".pq": "parquet", ".arrow": "ipc",
+                      ".feather": "ipc", ".ipc": "ipc"}
+_CSV_PATTERNS = ("*.csv", "*.csv.gz", "*.csv.zst")
+
+# number of bytes read from the head of a .csv-file to detect its format
+_PROBE_SIZE = 65536
+# number of lines at the end of the head used to detect the delimiter
+_PROBE_LINES = 20
+# candidate delimiters in order of precedence, " " stands for any whitespace
+_DELIMITERS = (";", "\t", ",", "|", " ")
+_BOMS = ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"),
+         (codecs.BOM_UTF16_BE, "utf-16"))
+
+# format profiles of .csv-files by source directory, files of the same
+# directory usually come from the same machine
+_profiles: dict[Path, dict] = {}
+
+
+def file_format(file_path: Path) -> str:
+    """
+    Format of a data file derived from its suffix.
+    ...
+
+    Parameter
+    ---------
+    file_path: Path
+        path to the data file
+
+    Returns
+    -------
+    _: str
+        "csv", "gzip" (.csv.gz), "zstd" (.csv.zst), "parquet" or "ipc" (Arrow)
+    """
+    suffix = file_path.suffix.lower()
+
+    if suffix in _COLUMNAR_SUFFIXES:
+        return _COLUMNAR_SUFFIXES[suffix]
+
+    return _COMPRESSED_SUFFIXES.get(suffix, "csv")
+
+
+def file_stem(file_path: Path) -> str:
+    """
+    Name of a data file without its format and compression suffixes.
+    """
+    name = file_path.name
+    for suffix in (".gz", ".zst", ".csv", *_COLUMNAR_SUFFIXES):
+        if name.lower().endswith(suffix):
+            name = name[:-len(suffix)]
+
+    return name
+
+
+def data_files(directory: Path) -> list[Path]:
+    """
+    Supported data files of a directory (not recursive), sorted by name.
+    ...
+
+    Parameter
+    ---------
+    directory: Path
+        path of the directory
+
+    Returns
+    -------
+    _: list[Path]
+        paths of the .csv, .csv.gz, .csv.zst, Parquet and Arrow files
+    """
+    patterns = (*_CSV_PATTERNS, *(f"*{suffix}" for suffix in _COLUMNAR_SUFFIXES))
+
+    return sorted({path for pattern in patterns for path in directory.glob(pattern)
+                   if path.is_file()})
+
+
+def _require(file_path: Path, fmt: str) -> None:
+    """
+    Raise FormatError if the optional package needed for the format is missing.
+    """
+    if fmt in ("parquet", "ipc") and pa is None:
+        raise FormatError(file_path, "the optional package pyarrow is not installed")
+    if fmt == "zstd" and zstandard is None:
+        raise FormatError(file_path, "the optional package zstandard is not installed")
+
+
+def open_binary(file_path: Path) -> IO[bytes]:
+    """
+    Open a (compressed) .csv-file as binary stream. Compressed files are
+    decompressed while reading.
+    ...
+
+    Parameter
+    ---------
+    file_path: Path
+        path to the .csv, .csv.gz or .csv.zst file
+
+    Returns
+    -------
+    _: IO[bytes]
+        binary stream of the (decompressed) file
+    """
+    fmt = file_format(file_path)
+    _require(file_path, fmt)
+
+    if fmt == "gzip":
+        return gzip.open(file_path, "rb")
+    if fmt == "zstd":
+        return zstandard.ZstdDecompressor().stream_reader(open(file_path, "rb"), closefd=True)
+    if fmt != "csv":
+        raise FormatError(file_path, "the file is not a text file")
+
+    return open(file_path, "rb")
+
+
+class _HeadStream(io.RawIOBase):
+    """
+    Binary stream returning the already read head of a file followed by the
+    rest of the file, so the file is opened and read only once.
+    """
+
+    def __init__(self, head: bytes, stream: IO[bytes]) -> None:
+        self._head = memoryview(head)
+        self._stream = stream
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._head:
+            n = min(len(buffer), len(self._head))
+            buffer[:n] = self._head[:n]
+            self._head = self._head[n:]
+            return n
+
+        return self._stream.readinto(buffer)
+
+    def close(self) -> None:
+        self._stream.close()
+        super().close()
+
+
+def _decode(head: bytes, encoding: str | None = None) -> tuple[str, str]:
+    """
+    Decode the head of a file. Without given encoding it is detected from
+    the byte order mark, otherwise UTF-8 and, if that fails, cp1252 (the
+    usual encoding of exports of Windows based test machines) are tried.
+    A character cut at the end of the head is ignored.
+    """
+    if encoding is None:
+        encoding = next((name for bom, name in _BOMS if head.startswith(bom)), None)
+
+    for name in ((encoding,) if encoding else ("utf-8", "cp1252", "latin-1")):
+        try:
+            return codecs.getincrementaldecoder(name)().decode(head, final=False), name
+        except UnicodeDecodeError:
+            continue
+
+    raise UnicodeDecodeError(encoding, head, 0, len(head), "undecodable head")
+
+
+def _split(line: str, delimiter: str) -> list[str]:
+    """
+    Fields of a line without surrounding whitespace and quotes.
+    """
+    fields = line.split() if delimiter == " " else line.split(delimiter)
+
+    return [field.strip().strip("\"'").strip() for field in fields]
+
+
+def _is_data(fields: list[str], decimal: str) -> bool:
+    """
+    Whether all fields of a line are numbers (or empty, e.g. in ragged tails)
+    and at least two are not empty.
+    """
+    values = 0
+    for field in fields:
+        if not field:
+            continue
+        try:
+            float(field.replace(decimal, ".") if decimal != "." else field)
+        except ValueError:
+            return False
+        values += 1
+
+    return values >= 2
+
+
+def _header_profile(lines: list[str], delimiter: str, decimal: str) -> tuple[int, int | None]:
+    """
+    Number of header rows above the first data line and index of the row
+    holding the column names (the first header row with as many fields as
+    the data, e.g. names above a unit row), None if there is none.
+    """
+    header_rows = next((i for i, line in enumerate(lines)
+                        if _is_data(_split(line, delimiter), decimal)), len(lines))
+    if header_rows == len(lines):
+        return header_rows, None
+
+    width = len(_split(lines[header_rows], delimiter))
+    names_row = next((i for i in range(header_rows)
+                      if len(_split(lines[i], delimiter)) == width), None)
+
+    return header_rows, names_row
+
+
+def probe_csv(head: bytes, complete: bool = False) -> dict:
+    """
+    Detect the format of a .csv-file from its head. The delimiter and
+    decimal separator are the first combination for which the last lines
+    of the head consistently split into the same number of numeric fields.
+    ...
+
+    Parameter
+    ---------
+    head: bytes
+        first bytes of the (decompressed) file
+    complete: bool, default = False
+        whether the head contains the whole file (otherwise its last line
+        may be cut)
+
+    Returns
+    -------
+    _: dict
+        encoding = encoding of the file
+        delimiter = delimiter (" " for any whitespace)
+        decimal = decimal separator
+        header_rows = number of rows above the data
+        names_row = index of the row holding the column names or None
+    """
+    text, encoding = _decode(head)
+    lines = text.splitlines()
+    if not complete:
+        lines = lines[:-1]
+
+    # header rows are counted on the raw lines like skiprows of the parser
+    tail = [line for line in lines if line.strip()][-_PROBE_LINES:]
+    for delimiter in _DELIMITERS:
+        for decimal in (".", ",") if delimiter != "," else (".",):
+            rows = [_split(line, delimiter) for line in tail]
+            if len({len(row) for row in rows}) == 1 and \
+                    all(_is_data(row, decimal) for row in rows):
+                header_rows, names_row = _header_profile(lines, delimiter, decimal)
+
+                return {"encoding": encoding, "delimiter": delimiter, "decimal": decimal,
+                        "header_rows": header_rows, "names_row": names_row}
+
+    raise ValueError("no delimited numeric data found")
+
+
+def _matches(head: bytes, profile: dict) -> bool:
+    """
+    Whether the head of a file matches a cached profile: the first data
+    line is at the same row and splits into numbers with the profile.
+    """
+    try:
+        lines = _decode(head, profile["encoding"])[0].splitlines()
+    except UnicodeDecodeError:
+        return False
+
+    rows = profile["header_rows"]
+
+    return len(lines) > rows + 1 and \
+        _is_data(_split(lines[rows], profile["delimiter"]), profile["decimal"]) and \
+        (rows == 0 or not _is_data(_split(lines[rows - 1], profile["delimiter"]),
+                                   profile["decimal"]))
+
+
+def _open_csv(file_path: Path) -> tuple[IO[bytes], dict]:
+    """
+    Open a (compressed) .csv-file and detect its format. The head is read
+    once and reused by the parser. The profile of the last file of the same
+    directory is reused if it matches the head.
+    """
+    stream = open_binary(file_path)
+    try:
+        head = stream.read(_PROBE_SIZE)
+        complete = len(head) < _PROBE_SIZE
+
+        directory = file_path.resolve().parent
+        profile = _profiles.get(directory)
+        if profile is None or not _matches(head, profile):
+            try:
+                profile = probe_csv(head, complete)
+            except (ValueError, UnicodeDecodeError) as error:
+                raise FormatError(file_path, str(error)) from None
+            _profiles[directory] = profile
+    except BaseException:
+        stream.close()
+        raise
+
+    if complete:
+        stream.close()
+        return io.BytesIO(head), profile
+
+    return io.BufferedReader(_HeadStream(head, stream)), profile
+
+
+def csv_profile(file_path: Path) -> dict:
+    """
+    Format profile of a (compressed) .csv-file, see probe_csv. Cached per
+    directory.
+    """
+    source, profile = _open_csv(file_path)
+    source.close()
+
+    return profile
+
+
+def clear_profiles() -> None:
+    """
+    Forget the cached format profiles, e.g. after the files of a directory
+    were replaced.
+    """
+    _profiles.clear()
+
+
+def _columnar_schema(file_path: Path, fmt: str) -> list[str]:
+    """
+    Column names of a Parquet or Arrow file, read from the metadata only.
+    """
+    if fmt == "parquet":
+        return pq.read_schema(file_path).names
+
+    with pa.memory_map(str(file_path)) as source:
+        return ipc.open_file(source).schema.names
+
+
+def _columnar_names(file_path: Path, fmt: str, usecols: list | None) -> list[str]:
+    """
+    Names of the requested columns of a Parquet or Arrow file. Columns may be
+    given by name or index.
+    """
+    names = _columnar_schema(file_path, fmt)
+    if usecols is None:
+        return names
+
+    missing = [column for column in usecols
+               if (column not in names if isinstance(column, str)
+                   else not 0 <= column < len(names))]
+    if missing:
+        raise ColumnMappingError(missing)
+
+    return [names[column] if isinstance(column, int) else column for column in usecols]
+
+
+def _to_frame(table, labels: list, dtype) -> pd.DataFrame:
+    """
+    DataFrame of the columns of an Arrow table or record batch. Columns
+    without nulls are converted to NumPy without copy where possible.
+    """
+    columns = {}
+    for label, column in zip(labels, table.columns):
+        if isinstance(column, pa.ChunkedArray) and column.num_chunks == 1:
+            column = column.chunk(0)
+        arr = column.to_numpy(zero_copy_only=False)
+        columns[label] = arr if dtype is None else arr.astype(dtype, copy=False)
+
+    return pd.DataFrame(columns, copy=False)
+
+
+def _read_columnar(file_path: Path, fmt: str, usecols: list | None, dtype,
+                   chunk_size: int | None) -> pd.DataFrame | Iterator[pd.DataFrame]:
+    """
+    Read a Parquet or Arrow IPC file column-wise. Arrow files are memory
+    mapped, only the requested columns are read.
+    """
+    names = _columnar_names(file_path, fmt, usecols)
+    # columns given by index are labelled by index like in read_csv without header
+    labels = usecols if usecols is not None and isinstance(usecols[0], int) else names
+
+    if chunk_size is None:
+        if fmt == "parquet":
+            table = pq.read_table(file_path, columns=names)
+        else:
+            with pa.memory_map(str(file_path)) as source:
+                table = ipc.open_file(source).read_all().select(names)
+        return _to_frame(table, labels, dtype)
+
+    def batches():
+        if fmt == "parquet":
+            for batch in pq.ParquetFile(file_path).iter_batches(chunk_size, columns=names):
+                yield _to_frame(batch, labels, dtype)
+        else:
+            with pa.memory_map(str(file_path)) as source:
+                reader = ipc.open_file(source)
+                for i in range(reader.num_record_batches):
+                    batch = reader.get_batch(i).select(names)
+                    for start in range(0, batch.num_rows, chunk_size):
+                        yield _to_frame(batch.slice(start, chunk_size), labels, dtype)
+
+    return batches()
+
+
+def read_frame(file_path: Path, usecols: list | None = None, dtype=None,
+               chunk_size: int | None = None) -> pd.DataFrame | Iterator[pd.DataFrame]:
+    """
+    Read a data file of any supported format. Compressed .csv-files are
+    decompressed while parsing, Parquet and Arrow IPC files are loaded
+    column-wise into NumPy without going through text.
+    ...
+
+    Parameter
+    ---------
+    file_path: Path
+        path to the data file
+    usecols: list | None, default = None
+        names or indices of the columns to read, defaults to all columns
+    dtype: default = None
+        dtype of the columns, e.g. np.float64
+    chunk_size: int | None, default = None
+        number of rows per chunk, returns an iterator of chunks if given
+
+    Returns
+    -------
+    _: DataFrame | Iterator[DataFrame]
+        the data. Columns are labelled by their header or, for files without
+        header and columns given by index, by their index.
+    """
+    fmt = file_format(file_path)
+    _require(file_path, fmt)
+
+    if fmt in ("parquet", "ipc"):
+        return _read_columnar(file_path, fmt, usecols, dtype, chunk_size)
+
+    source, profile = _open_csv(file_path)
+    names_row = profile["names_row"]
+    # columns given by index are labelled by index, so the names are skipped
+    if usecols is not None and isinstance(usecols[0], int):
+        names_row = None
+
+    try:
+        reader = pd.read_csv(
+            source, sep=r"\s+" if profile["delimiter"] == " " else profile["delimiter"],
+            decimal=profile["decimal"], encoding=profile["encoding"],
+            header=None if names_row is None else 0,
+            skiprows=[i for i in range(profile["header_rows"]) if i != names_row],
+            usecols=usecols, dtype=dtype, chunksize=chunk_size)
+    except ValueError as error:
+        source.close()
+        if usecols is not None and ("Usecols do not match" in str(error)
+                                    or "out of bounds" in str(error)):
+            raise ColumnMappingError(usecols) from None
+        raise
+
+    if chunk_size is None:
+        source.close()
+        return reader
+
+    def chunks():
+        with source, reader:
+            yield from reader
+
+    return chunks()
+
+
+def write_columnar(df: pd.DataFrame, file_path: Path, compression: str | None = "zstd") -> None:
+    """
+    Write a dataframe as Parquet or Arrow IPC file (format by suffix).
+    ...
+
+    Parameter
+    ---------
+    df: DataFrame
+        the data
+    file_path: Path
+        path of the .parquet or .arrow file
+    compression: str | None, default = "zstd"
+        compression codec ("zstd", "lz4", "snappy" (Parquet only) or None)
+
+    Returns
+    -------
+    None
+    """
+    fmt = file_format(file_path)
+    _require(file_path, fmt)
+
+    # Arrow column names must be strings
+    table = pa.Table.from_pandas(df.set_axis([str(column) for column in df.columns],
+                                             axis="columns"), preserve_index=False)
+
+    if fmt == "parquet":
+        pq.write_table(table, file_path, compression=compression or "none")
+    elif fmt == "ipc":
+        options = ipc.IpcWriteOptions(compression=compression)
+        with ipc.new_file(str(file_path), table.schema, options=options) as writer:
+            writer.write_table(table)
+    else:
+        raise FormatError(file_path, "the file is not a Parquet or Arrow file")
+
+
+def convert_file(src_path: Path, dst_path: Path, compression: str | None = "zstd") -> Path:
+    """
+    Rewrite a (compressed) .csv-file as Parquet or Arrow IPC file. The
+    columns and their names are kept, a file without header gets the column
+    names "0", "1", ...
+    ...
+
+    Parameter
+    ---------
+    src_path: Path
+        path to the .csv, .csv.gz or .csv.zst file
+    dst_path: Path
+        path of the .parquet or .arrow file
+    compression: str | None, default = "zstd"
+        compression codec, see write_columnar
+
+    Returns
+    -------
+    _: Path
+        path of the written file
+    """
+    write_columnar(read_frame(src_path), dst_path, compression)
+
+    return dst_path
+
+
+def convert_archive(src_dir: Path, dst_dir: Path, fmt: str = "parquet",
+                    compression: str | None = "zstd", workers: int | None = None,
+                    overwrite: bool = False) -> list[Path]:
+    """
+    Rewrite all (compressed) .csv-files of a directory tree as Parquet or
+    Arrow IPC files. The directory structure is mirrored in dst_dir. The
+    files are converted in parallel threads, parsing and writing release
+    the GIL.
+    ...
+
+    Parameter
+    ---------
+    src_dir: Path
+        root directory of the .csv archive
+    dst_dir: Path
+        root directory of the converted archive
+    fmt: str, default = "parquet"
+        "parquet" or "ipc" (Arrow)
+    compression: str | None, default = "zstd"
+        compression codec, see write_columnar
+    workers: int | None, default = None
+        number of threads, defaults to the ThreadPoolExecutor default
+    overwrite: bool, default = False
+        convert files whose converted file already exists
+
+    Returns
+    -------
+    _: list[Path]
+        paths of the converted files
+    """
+    suffix = ".parquet" if fmt == "parquet" else ".arrow"
+
+    jobs = []
+    for pattern in _CSV_PATTERNS:
+        for src_path in src_dir.rglob(pattern):
+            dst_path = (dst_dir/src_path.relative_to(src_dir)).with_name(
+                file_stem(src_path) + suffix)
+            if overwrite or not dst_path.exists():
+                jobs.append((src_path, dst_path))
+
+    for _, dst_path in jobs:
+        dst_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with ThreadPoolExecutor(workers) as executor:
+        return list(executor.map(lambda job: convert_file(*job, compression), jobs))
+
+
+def main() -> None:
+    """
+    Convert a .csv archive from the command line.
+
+    Example:
+        python cf_formats.py raw_data/ converted/ --format parquet
+    """
+    parser = argparse.ArgumentParser(description="Convert a .csv archive (also .csv.gz, "
+                                     ".csv.zst) into Parquet or Arrow IPC files.")
+    parser.add_argument("src_dir", type=Path, help="root directory of the .csv archive")
+    parser.add_argument("dst_dir", type=Path, help="root directory of the converted files")
+    parser.add_argument("--format", choices=["parquet", "ipc"], default="parquet")
+    parser.add_argument("--compression", default="zstd",
+                        help="compression codec (zstd, lz4, snappy or none)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--overwrite", action="store_true")
+    args = parser.parse_args()
+
+    paths = convert_archive(args.src_dir, args.dst_dir, args.format,
+                            None if args.compression == "none" else args.compression,
+                            args.workers, args.overwrite)
+    print(f"{len(paths)} files converted.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,26 @@
 from matplotlib import pyplot as plt
+from matplotlib.widgets import SpanSelector
 from matplotlib.backends.backend_qt5agg import \
     FigureCanvasQTAgg as FigureCanvas
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QFrame,
                              QSizePolicy, QGridLayout, QLineEdit, QMenu,
-                             QFileDialog, QStatusBar, QToolBar, QAction, QMenuBar, QLabel)
+                             QFileDialog, QStatusBar, QToolBar, QAction, QMenuBar, QLabel,
+                             QDockWidget, QListWidget)
 
 from PyQt5.QtGui import (QFont, QIcon)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSignal
 
 from pathlib import Path
+from functools import partial
 import pandas as pd
 
 
 class CFAppGui(QMainWindow):
 
+    # graph ("input" or "output"), lower and upper strain of the fit window
+    # dragged in the graph and whether the mouse button was released
+    fit_window_changed = pyqtSignal(str, float, float, bool)
+
     def __init__(self, cwd: Path) -> None:
         """
         Gui init method
@@ -31,6 +38,7 @@ class CFAppGui(QMainWindow):
         self._create_lbls()
         self._create_tbs()
         self._create_actns(cwd)
+        self._create_specimen_list()
         self._create_status_bar()
         self._create_tool_bar()
         self._create_menu_bar()
@@ -73,8 +81,20 @@ class CFAppGui(QMainWindow):
         self._tool_bar.addAction(self.import_action)
         self._tool_bar.addAction(self.fit_action)
         self._tool_bar.addAction(self.export_action)
+        self._tool_bar.addSeparator()
+        self._tool_bar.addAction(self.fit_series_action)
+        self.clear_specimens()
 
+        self._file_menu.addAction(self.import_folder_action)
+        self._file_menu.addSeparator()
+        self._file_menu.addAction(self.open_session_action)
+        self._file_menu.addAction(self.save_session_action)
+        self._file_menu.addSeparator()
         self._file_menu.addAction(self.settings_action)
+        self._file_menu.addAction(self.sweep_action)
+        self._file_menu.addAction(self.overlay_action)
+        self._file_menu.addAction(self.rate_action)
+        self._file_menu.addAction(self.diagnostics_action)
         self._file_menu.addSeparator()
         self._file_menu.addAction(self.exit_action)
 
@@ -144,6 +164,60 @@ class CFAppGui(QMainWindow):
         self.axes_output.set_title("Yield Curve")
         self.axes_output.grid(True)
 
+        self._selectors: dict[str, SpanSelector] = {}
+        self._preview_lines: dict[str, dict] = {}
+        self._create_preview("input")
+        self._create_preview("output")
+
+    def _create_preview(self, graph: str) -> None:
+        """
+        Create the span selector of the fit window and the artists of the live
+        fit preview of a graph. The artists are animated, so they are left out
+        of full redraws and only drawn (blitted) together with the selector.
+        The axes are cleared with cla, which removes both, so they are
+        recreated whenever a graph is cleared.
+        ...
+
+        Parameter
+        ---------
+        graph: str
+            "input" for the youngs modulus window, "output" for the plastic
+            fit window
+
+        Returns
+        -------
+        None
+        """
+        if graph in self._selectors:
+            self._selectors[graph].disconnect_events()
+
+        if graph == "input":
+            axes, color = self.axes_input, "tab:green"
+            self._preview_lines[graph] = {
+                "modulus": axes.plot([], [], "--", color=color, animated=True)[0]}
+        else:
+            axes, color = self.axes_output, "tab:red"
+            self._preview_lines[graph] = {
+                "window": axes.plot([], [], "-", color=color, linewidth=3, alpha=0.5,
+                                    animated=True)[0],
+                "curve": axes.plot([], [], "--", color=color, animated=True)[0]}
+
+        selector = SpanSelector(axes, partial(self._fit_window_moved, graph, True), "horizontal",
+                                useblit=True, interactive=True, drag_from_anywhere=True,
+                                ignore_event_outside=True,
+                                onmove_callback=partial(self._fit_window_moved, graph, False),
+                                props={"facecolor": color, "alpha": 0.1})
+        selector.set_visible(False)
+
+        self._selectors[graph] = selector
+
+    def _fit_window_moved(self, graph: str, released: bool, lower: float, upper: float) -> None:
+        """
+        Callback of the span selectors, forwards the fit window to the controller.
+        """
+        if upper > lower:
+            self.fit_window_changed.emit(graph, lower, upper, released)
+
     def _create_tbs(self) -> None:
         """
         Create textboxes for the GUI.
@@ -256,9 +330,39 @@ class CFAppGui(QMainWindow):
         self.export_action.setIcon(
             QIcon(str(cwd/"data"/"file-export.png")))
 
+        self.import_folder_action = QAction("Import Folder...")
+        self.open_session_action = QAction("Open Session...")
+        self.save_session_action = QAction("Save Session...")
         self.settings_action = QAction("Settings...")
+        self.sweep_action = QAction("Fit Window Sweep...")
+        self.overlay_action = QAction("Overlay View...")
+        self.rate_action = QAction("Strain Rate Family...")
+        self.diagnostics_action = QAction("Diagnostics...")
         self.exit_action = QAction("Exit")
 
+        self.fit_series_action = QAction("Fit All Specimens")
+        self.fit_series_action.setFont(self._font)
+
+    def _create_specimen_list(self) -> None:
+        """
+        Create the dockable list of the imported specimens.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self.list_specimens = QListWidget()
+        self.list_specimens.setFont(self._font)
+
+        self._specimen_dock = QDockWidget("Specimens", self)
+        self._specimen_dock.setWidget(self.list_specimens)
+        self.addDockWidget(Qt.LeftDockWidgetArea, self._specimen_dock)
+
     def _create_fonts(self) -> None:
         """
         Create the fonts used in the GUI
@@ -347,6 +451,61 @@ class CFAppGui(QMainWindow):
         return QFileDialog.getOpenFileName(
             self, "Select file", "", file_type)
 
+    def files_dialog(self, file_type: str) -> tuple:
+        """
+        Open file dialog window and return the paths to the selected files.
+        ...
+
+        Parameter
+        ---------
+        file_type: str
+            filetype necessary to preselect files.
+
+        Return
+        ------
+        _: tuple
+            a tuple containing the list of file paths and file extension.
+        """
+
+        return QFileDialog.getOpenFileNames(
+            self, "Select files", "", file_type)
+
+    def folder_dialog(self) -> str:
+        """
+        Open folder dialog window and return the path to the selected folder.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Return
+        ------
+        _: str
+            path of the folder, empty if cancelled
+        """
+
+        return QFileDialog.getExistingDirectory(self, "Select folder")
+
+    def save_file_dialog(self, file_type: str) -> tuple:
+        """
+        Open save file dialog window and return the path to the selected file.
+        ...
+
+        Parameter
+        ---------
+        file_type: str
+            filetype necessary to preselect files.
+
+        Return
+        ------
+        _: tuple
+            a tuple containing the file path and file extension.
+        """
+
+        return QFileDialog.getSaveFileName(
+            self, "Save file", "", file_type)
+
     def plot_data(self, data: pd.DataFrame | list, graph: str, line_type: str = "-", name: str = "") -> None:
         """
         Plot data to a graph.
@@ -385,6 +544,49 @@ class CFAppGui(QMainWindow):
             self.axes_output.legend()
             self.graph_output.draw_idle()
 
+    def clear_specimens(self) -> None:
+        """
+        Remove all specimens from the specimen list and hide it.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self.list_specimens.blockSignals(True)
+        self.list_specimens.clear()
+        self.list_specimens.blockSignals(False)
+
+        self._specimen_dock.setVisible(False)
+        self.fit_series_action.setVisible(False)
+
+    def insert_specimen(self, row: int, label: str) -> None:
+        """
+        Insert a specimen into the specimen list. The list and the series fit
+        are only shown if it contains several specimens.
+        ...
+
+        Parameter
+        ---------
+        row: int
+            row of the specimen
+        label: str
+            name of the specimen
+
+        Returns
+        -------
+        None
+        """
+        self.list_specimens.insertItem(row, label)
+
+        several = self.list_specimens.count() > 1
+        self._specimen_dock.setVisible(several)
+        self.fit_series_action.setVisible(several)
+
     def clear_graphs(self, graph: str) -> None:
         """
         Clear the graphs
@@ -403,10 +605,57 @@ class CFAppGui(QMainWindow):
             self.axes_input.cla()
             self.axes_input.grid(True)
             self.axes_input.set_title("Stress - Strain (eng.)")
+            self._create_preview("input")
         if graph == "output":
             self.axes_output.cla()
             self.axes_output.grid(True)
             self.axes_output.set_title("Yield Curve")
+            self._create_preview("output")
+
+    def set_fit_window(self, graph: str, lower: float, upper: float) -> None:
+        """
+        Show the fit window in a graph without emitting fit_window_changed.
+        ...
+
+        Parameter
+        ---------
+        graph: str
+            "input" or "output"
+        lower: float
+            lower strain of the window
+        upper: float
+            upper strain of the window
+
+        Returns
+        -------
+        None
+        """
+        selector = self._selectors[graph]
+        selector.set_visible(True)
+        selector.extents = (lower, upper)
+
+    def update_preview(self, graph: str, lines: dict[str, tuple]) -> None:
+        """
+        Update artists of the live fit preview. Only the fit window and the
+        preview artists of the graph are redrawn by blitting them onto the
+        cached background, the rest of the figure is not rendered again.
+        ...
+
+        Parameter
+        ---------
+        graph: str
+            "input" (artist "modulus") or "output" (artists "window" and "curve")
+        lines: dict[str, tuple]
+            x and y data per artist
+
+        Returns
+        -------
+        None
+        """
+        for name, (x, y) in lines.items():
+            self._preview_lines[graph][name].set_data(x, y)
+
+        self._selectors[graph].update()
 
     def fill_lbls(self, mat_char: list[float], extrap_type: int, paras: list[float]) -> None:
         """
@@ -0,0 +1,706 @@
+import os
+import re
+import json
+import mmap
+import hashlib
+import argparse
+import tempfile
+from bisect import bisect_right
+from contextlib import nullcontext
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from cf_errors import FileError, FormatError, DuplicateIdError
+
+
+# keyword lines after the first line of the file, a literal search is about
+# ten times faster than matching "^\*" in multiline mode
+_KEYWORD = re.compile(rb"\n\*")
+
+# suffix of the cached index next to a keyword file
+_SIDECAR_SUFFIX = ".cfidx"
+
+# keyword names of *MAT_024 and the fields of its first two cards
+_MAT_24_KEYWORDS = ("MAT_PIECEWISE_LINEAR_PLASTICITY", "MAT_024")
+_MAT_24_FIELDS = ["mid", "ro", "e", "pr", "sigy", "etan", "fail", "tdel",
+                  "c", "p", "lcss", "lcsr", "vp"]
+
+# first curve id of rate tables, above the material ids which are used as
+# curve ids of the single yield curves
+TABLE_CURVE_START = 10000000
+
+
+def _block_key(data, start: int, end: int, keyword: str) -> tuple[str, int] | None:
+    """
+    Key of a keyword block, ("MID", mid) for material cards and ("LCID", lcid)
+    for curves and tables, which share their id range in LS-Dyna. Other
+    keywords are not indexed and None is returned.
+    ...
+
+    Parameter
+    ---------
+    data: bytes | mmap
+        content of the file
+    start: int
+        offset of the first line after the keyword line
+    end: int
+        offset of the end of the block
+    keyword: str
+        keyword without the leading "*"
+
+    Returns
+    -------
+    _: tuple[str, int] | None
+        key of the block
+    """
+    if keyword.startswith("MAT_") and not keyword.startswith("MAT_ADD"):
+        kind = "MID"
+    elif keyword.startswith(("DEFINE_CURVE", "DEFINE_TABLE")):
+        kind = "LCID"
+    else:
+        return None
+
+    # the title card preceeds the first data card
+    skip = 1 if keyword.endswith("_TITLE") else 0
+
+    while start < end:
+        line_end = data.find(b"\n", start, end)
+        line_end = end if line_end == -1 else line_end
+        line = data[start:line_end]
+        start = line_end + 1
+
+        if not line.strip() or line.startswith(b"$"):
+            continue
+        if skip:
+            skip -= 1
+            continue
+
+        field = line.split(b",")[0] if b"," in line else line[:10]
+        try:
+            return kind, int(field)
+        except ValueError:
+            return None
+
+    return None
+
+
+def _table_curves(data, start: int, end: int, keyword: str) -> set[int]:
+    """
+    Curve ids of the value - lcid cards of a *DEFINE_TABLE block.
+    """
+    curves = set()
+
+    # the title card and the header card preceed the value - lcid cards
+    skip = 2 if keyword.endswith("_TITLE") else 1
+
+    while start < end:
+        line_end = data.find(b"\n", start, end)
+        line_end = end if line_end == -1 else line_end
+        line = data[start:line_end]
+        start = line_end + 1
+
+        if not line.strip() or line.startswith(b"$"):
+            continue
+        if skip:
+            skip -= 1
+            continue
+
+        field = line.split(b",")[1] if b"," in line else line[20:40]
+        try:
+            curves.add(int(field))
+        except ValueError:
+            continue
+
+    return curves
+
+
+def split_blocks(data) -> list[tuple[tuple[str, int] | None, int, int, tuple[int, ...]]]:
+    """
+    Split the content of a keyword file into its blocks. A block spans from
+    its keyword line to the next keyword line, so comment lines belong to
+    the preceeding keyword. A *DEFINE_TABLE and the *DEFINE_CURVEs of the
+    table directly following it form one block, so the curves stay behind
+    their table when the block is replaced or added. Only the keyword lines
+    are searched for, the cards themselves are not parsed apart from the
+    ids.
+    ...
+
+    Parameter
+    ---------
+    data: bytes | mmap
+        content of the file
+
+    Returns
+    -------
+    _: list[tuple[tuple[str, int] | None, int, int, tuple[int, ...]]]
+        key, start and end offset and the ids of the contained table curves
+        of every block
+    """
+    starts = [match.start() + 1 for match in _KEYWORD.finditer(data)]
+    if data[:1] == b"*":
+        starts.insert(0, 0)
+    ends = starts[1:] + [len(data)]
+
+    blocks = []
+    # curves of the preceeding table not yet found
+    listed = set()
+    for start, end in zip(starts, ends):
+        line_end = data.find(b"\n", start, end)
+        line_end = end if line_end == -1 else line_end
+        keyword = data[start + 1:line_end].strip().upper().decode("ascii", "replace")
+        key = _block_key(data, line_end + 1, end, keyword)
+
+        if key is not None and key[1] in listed and keyword.startswith("DEFINE_CURVE"):
+            table_key, table_start, _, curves = blocks[-1]
+            blocks[-1] = (table_key, table_start, end, curves + (key[1],))
+            listed.discard(key[1])
+            continue
+
+        listed = _table_curves(data, line_end + 1, end, keyword) \
+            if key is not None and keyword.startswith("DEFINE_TABLE") else set()
+        blocks.append((key, start, end, ()))
+
+    return blocks
+
+
+def _digest(data) -> str:
+    """
+    Content hash of a block.
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _scan(data) -> tuple[dict, int, dict]:
+    """
+    Index the blocks of a keyword file.
+    ...
+
+    Parameter
+    ---------
+    data: bytes | mmap
+        content of the file
+
+    Returns
+    -------
+    _: tuple[dict, int, dict]
+        start offset, end offset and content hash per block key (for
+        duplicated keys of the first block), the offset new blocks are
+        inserted at, i.e. the start of *END or the end of the file, and the
+        key of the table block per key of the table curves it contains
+    """
+    blocks = split_blocks(data)
+    index = {}
+    owners = {}
+    for key, start, end, curves in blocks:
+        if key is not None and key not in index:
+            index[key] = (start, end, _digest(data[start:end]))
+            for lcid in curves:
+                owners.setdefault(("LCID", lcid), key)
+
+    insert = len(data)
+    for key, start, end, _ in reversed(blocks):
+        if key is None and data[start:start + 4].upper() == b"*END":
+            insert = start
+            break
+
+    return index, insert, owners
+
+
+def _sidecar_path(path: Path) -> Path:
+    """
+    Path of the cached index of a keyword file.
+    """
+    return path.with_name(path.name + _SIDECAR_SUFFIX)
+
+
+def _load_index(path: Path) -> tuple[dict, int, dict] | None:
+    """
+    Cached index of a keyword file, None if there is none or the file was
+    modified since it was written.
+    """
+    try:
+        with open(_sidecar_path(path), "r") as file:
+            cache = json.load(file)
+        stat = path.stat()
+
+        if cache["size"] != stat.st_size or cache["mtime_ns"] != stat.st_mtime_ns:
+            return None
+
+        return (dict(zip(zip(cache["kind"], cache["id"]),
+                         zip(cache["start"], cache["end"], cache["digest"]))), cache["insert"],
+                {("LCID", lcid): ("LCID", tbid)
+                 for lcid, tbid in zip(cache["curve"], cache["table"])})
+
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _store_index(path: Path, index: dict, insert: int, owners: dict) -> None:
+    """
+    Cache the index of a keyword file next to it. The cache is optional, so
+    a read-only directory is not an error.
+    """
+    stat = path.stat()
+    keys = list(zip(*index)) or [(), ()]
+    values = list(zip(*index.values())) or [(), (), ()]
+
+    # columns instead of one list per block, json.dumps instead of json.dump
+    # to use the C encoder
+    cache = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "insert": insert,
+             "kind": keys[0], "id": keys[1], "start": values[0], "end": values[1],
+             "digest": values[2], "curve": [curve[1] for curve in owners],
+             "table": [table[1] for table in owners.values()]}
+    try:
+        with open(_sidecar_path(path), "w") as file:
+            file.write(json.dumps(cache, separators=(",", ":")))
+
+    except OSError:
+        pass
+
+
+def index_library(path: Path) -> dict[tuple[str, int], tuple[int, int, str]]:
+    """
+    Index an existing keyword file by MID and LCID. The index is cached in a
+    sidecar file (<name>.cfidx) and reused as long as size and modification
+    time of the keyword file match. Otherwise the file is memory mapped and
+    scanned for its keyword lines, the cards themselves are only read up to
+    their id.
+    ...
+
+    Parameter
+    ---------
+    path: Path
+        path of the keyword file
+
+    Returns
+    -------
+    _: dict[tuple[str, int], tuple[int, int, str]]
+        start offset, end offset and content hash per block key. For
+        duplicated keys the first block is indexed.
+    """
+    return _library_index(path)[0]
+
+
+def _library_index(path: Path) -> tuple[dict, int, dict]:
+    """
+    Cached or scanned index of a keyword file, see _scan.
+    """
+    cached = _load_index(path)
+    if cached is not None:
+        return cached
+
+    if path.stat().st_size == 0:
+        index, insert, owners = {}, 0, {}
+    else:
+        with open(path, "rb") as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            index, insert, owners = _scan(data)
+
+    _store_index(path, index, insert, owners)
+
+    return index, insert, owners
+
+
+def table_curve_ids(path: Path, tbid: int, curve_no: int) -> list[int]:
+    """
+    Curve ids for the curves of a *DEFINE_TABLE merged into a keyword file.
+    The curves of a table with the same id in the file are reused, further
+    ids are allocated above all ids of the file and TABLE_CURVE_START, so
+    they neither replace the curves of other materials nor the curves
+    named after the material ids.
+    ...
+
+    Parameter
+    ---------
+    path: Path
+        path of the keyword file, the ids of an empty or missing file start
+        at TABLE_CURVE_START
+    tbid: int
+        id of the table
+    curve_no: int
+        number of curves of the table
+
+    Returns
+    -------
+    _: list[int]
+        ascending curve ids
+    """
+    index, _, owners = _library_index(path) if path.is_file() else ({}, 0, {})
+
+    ids = sorted(curve[1] for curve, table in owners.items() if table == ("LCID", tbid))
+    ids = ids[:curve_no]
+
+    next_id = max([key[1] for key in index] + [curve[1] for curve in owners]
+                  + [tbid, TABLE_CURVE_START - 1]) + 1
+
+    return ids + list(range(next_id, next_id + curve_no - len(ids)))
+
+
+def _new_blocks(contents: list[str], newline: bytes) -> tuple[dict[tuple[str, int], bytes],
+                                                              dict]:
+    """
+    Indexed blocks of the rendered cards, encoded with the line ending of
+    the target file, and the key of the table block per key of the table
+    curves it contains. Later cards replace earlier ones with the same key.
+    """
+    blocks = {}
+    owners = {}
+
+    for content in contents:
+        data = newline.join(line.encode("utf-8") for line in content.splitlines()) + newline
+
+        for key, start, end, curves in split_blocks(data):
+            if key is not None:
+                blocks[key] = data[start:end]
+                for lcid in curves:
+                    owners[("LCID", lcid)] = key
+
+    return blocks, owners
+
+
+def _duplicate_ids(index: dict, owners: dict, blocks: dict, new_owners: dict) -> list[int]:
+    """
+    Curve ids of the new blocks which are already used by another block or
+    table curve of the library. The curves of a replaced table are replaced
+    with it.
+    """
+    duplicates = {curve[1] for curve, table in new_owners.items()
+                  if curve in index or curve in blocks or owners.get(curve, table) != table}
+    duplicates.update(key[1] for key in blocks
+                      if key in owners and owners[key] not in blocks)
+
+    return sorted(duplicates)
+
+
+def update_library(path: Path, contents: list[str]) -> dict[str, int]:
+    """
+    Merge rendered keyword cards into an existing keyword file. Blocks with
+    the MID or LCID of a new card are replaced if their content hash
+    differs, new ids are added in front of *END and all other blocks are
+    kept byte for byte. A *DEFINE_TABLE is merged together with its curves
+    following it, curve ids already used by other curves or tables of the
+    library are refused. The file is only written if something changed, the
+    new file is assembled next to the old one and replaces it atomically,
+    so readers never see a partially written library. The offsets of the
+    cached index are shifted instead of scanning the new file again, so a
+    refit of a few materials of a large library only reads and hashes the
+    blocks being replaced.
+    ...
+
+    Parameter
+    ---------
+    path: Path
+        path of the keyword file, an empty file is initialised with
+        *KEYWORD and *END
+    contents: list[str]
+        rendered keyword cards, e.g. one filled template per material
+
+    Returns
+    -------
+    _: dict[str, int]
+        number of "replaced", "added" and "unchanged" blocks
+
+    Raises
+    ------
+    DuplicateIdError
+        if a new curve id is used by another curve or table of the library
+    """
+    index, insert, owners = _library_index(path)
+    size = path.stat().st_size
+    stats = {"replaced": 0, "added": 0, "unchanged": 0}
+
+    with open(path, "rb") as file, \
+            (mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else
+             nullcontext(b"")) as data:
+
+        newline = b"\r\n" if data[:4096].find(b"\r\n") != -1 else b"\n"
+
+        # (start, end, block, key) of the replaced and inserted byte ranges
+        changes = []
+        additions = []
+        blocks, new_owners = _new_blocks(contents, newline)
+
+        duplicates = _duplicate_ids(index, owners, blocks, new_owners)
+        if duplicates:
+            raise DuplicateIdError(path, duplicates)
+
+        for key, block in blocks.items():
+            digest = _digest(block)
+            if key not in index:
+                additions.append((insert, insert, block, key))
+            elif digest == index[key][2]:
+                stats["unchanged"] += 1
+            else:
+                changes.append((index[key][0], index[key][1], block, key))
+        stats["replaced"] = len(changes)
+        stats["added"] = len(additions)
+
+        if not changes and not additions:
+            return stats
+
+        if additions and size == 0:
+            additions = ([(0, 0, b"*KEYWORD" + newline, None)] + additions
+                         + [(0, 0, b"*END" + newline, None)])
+        elif additions and insert == size and data[size - 1:size] not in (b"\n", b"\r"):
+            additions.insert(0, (insert, insert, newline, None))
+
+        # replaced blocks all end in front of the insert offset, the sort is
+        # stable, so additions keep their order
+        changes = sorted(changes, key=lambda change: change[0]) + additions
+
+        new_index = {}
+        change_ends = []
+        shifts = []
+        shift = 0
+
+        fd, tmp_str = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                position = 0
+                for start, end, block, key in changes:
+                    tmp.write(data[position:start])
+                    if key is not None:
+                        new_index[key] = (start + shift, start + shift + len(block),
+                                          _digest(block))
+                    tmp.write(block)
+                    position = end
+
+                    shift += len(block) - (end - start)
+                    change_ends.append(end)
+                    shifts.append(shift)
+
+                tmp.write(data[position:size])
+                tmp.flush()
+                os.fsync(tmp.fileno())
+
+            os.chmod(tmp_str, os.stat(path).st_mode & 0o7777)
+
+        except BaseException:
+            os.unlink(tmp_str)
+            raise
+
+    os.replace(tmp_str, path)
+
+    for key, (start, end, digest) in index.items():
+        if key not in new_index:
+            i = bisect_right(change_ends, start)
+            offset = shifts[i - 1] if i else 0
+            new_index[key] = (start + offset, end + offset, digest)
+
+    new_owners.update((curve, table) for curve, table in owners.items() if table not in blocks)
+
+    new_insert = insert + shift if size else shift - len(b"*END" + newline)
+    _store_index(path, new_index, new_insert, new_owners)
+
+    return stats
+
+
+def _fields(line: str, width: int, number: int) -> list[str]:
+    """
+    Fields of a card in fixed (width characters per field) or free format
+    (comma separated).
+    """
+    if "," in line:
+        fields = line.split(",")
+    else:
+        fields = [line[i*width:(i + 1)*width] for i in range(number)]
+
+    return [field.strip() for field in fields[:number]] + [""]*(number - len(fields))
+
+
+def _number(field: str) -> float:
+    """
+    Value of a numeric field, empty fields take the default value 0.
+    """
+    return float(field) if field else 0.0
+
+
+def _curve_points(lines: list[str]) -> np.ndarray:
+    """
+    Points (n x 2) of the data cards of a curve. All cards are converted at
+    once if they are separated by blanks or commas, fields of 20 characters
+    without separator are split by position.
+    """
+    if not lines:
+        return np.empty((0, 2))
+
+    values = " ".join(lines).replace(",", " ").split()
+    if len(values) != 2*len(lines):
+        values = [field for line in lines for field in _fields(line, 20, 2)]
+
+    return np.array(values, dtype=np.float64).reshape(-1, 2)
+
+
+def read_deck(path: Path) -> dict:
+    """
+    Read the *MAT_PIECEWISE_LINEAR_PLASTICITY cards and curves of a keyword
+    file. The file is read line by line, so include files of any size can be
+    read, all other keywords are skipped. Curves are returned with their
+    scale factors and offsets applied.
+    ...
+
+    Parameter
+    ---------
+    path: Path
+        path of the keyword file
+
+    Returns
+    -------
+    _: dict
+        materials = parameters of the first two cards, the title and the
+                    piecewise points (eps, es) per material, indexed by mid
+                    [DataFrame]
+        curves = points (n x 2) per lcid [dict[int, ndarray]]
+        titles = mids per material title [dict[str, list[int]]]
+
+    Raises
+    ------
+    FileError
+    FormatError
+        if a card cannot be parsed
+    """
+    if not path.is_file():
+        raise FileError(path) from None
+
+    materials = []
+    curves = {}
+
+    # keyword being read, its data cards read so far and its title
+    keyword = None
+    cards = []
+    title = ""
+
+    def finish() -> None:
+        if keyword == "MAT" and len(cards) >= 2:
+            values = (_fields(cards[0], 10, 8) + _fields(cards[1], 10, 5))
+            record = dict(zip(_MAT_24_FIELDS, map(_number, values)))
+            record["title"] = title
+            points = [[_number(field) for field in _fields(card, 10, 8)]
+                      for card in cards[2:4]] + [[], []]
+            record["eps"] = np.asarray(points[0], dtype=np.float64)
+            record["es"] = np.asarray(points[1], dtype=np.float64)
+            materials.append(record)
+
+        elif keyword == "CURVE" and cards:
+            values = [_number(field) for field in _fields(cards[0], 10, 7)]
+            lcid, _, sfa, sfo, offa, offo = values[:6]
+            points = _curve_points(cards[1:])
+            # LS-Dyna applies the offsets before the scale factors
+            points[:, 0] = (sfa or 1.0)*(points[:, 0] + offa)
+            points[:, 1] = (sfo or 1.0)*(points[:, 1] + offo)
+            curves[int(lcid)] = points
+
+    with open(path, "r", encoding="utf-8", errors="replace") as file:
+        try:
+            for line_no, line in enumerate(file, 1):
+                if line.startswith("$"):
+                    continue
+
+                if line.startswith("*"):
+                    finish()
+                    name = line[1:].strip().upper()
+                    keyword = ("MAT" if name.startswith(_MAT_24_KEYWORDS) else
+                               "CURVE" if name.startswith("DEFINE_CURVE") else None)
+                    has_title = name.endswith("_TITLE")
+                    cards = []
+                    title = ""
+                    continue
+
+                if keyword is None or not line.strip():
+                    continue
+
+                if has_title:
+                    title = line.strip()
+                    has_title = False
+                else:
+                    cards.append(line.rstrip("\r\n"))
+
+            finish()
+
+        except ValueError as error:
+            raise FormatError(path, f"card in line {line_no} is invalid ({error})") from None
+
+    frame = pd.DataFrame(materials, columns=_MAT_24_FIELDS + ["title", "eps", "es"])
+    frame["mid"] = frame["mid"].astype(np.int64)
+    frame["lcss"] = frame["lcss"].astype(np.int64)
+    frame = frame.drop_duplicates("mid").set_index("mid")
+
+    titles = {}
+    for mid, material_title in zip(frame.index, frame["title"]):
+        titles.setdefault(material_title, []).append(int(mid))
+
+    return {"materials": frame, "curves": curves, "titles": titles}
+
+
+def material_curve(deck: dict, key: int | str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Yield curve (effective plastic strain - yield stress) of a material of
+    a deck. The curve LCSS is used if it is defined, otherwise the points of
+    the third and fourth card. Cards written with Mat_24_template.k hold the
+    curve id in the first field of the second card (C), it is used if
+    neither LCSS nor points are defined.
+    ...
+
+    Parameter
+    ---------
+    deck: dict
+        deck as returned by read_deck
+    key: int | str
+        mid or title of the material
+
+    Returns
+    -------
+    _: tuple[ndarray, ndarray]
+        plastic strain and yield stress
+
+    Raises
+    ------
+    KeyError
+        if there is no material with the mid or title, or the curve LCSS
+        is not part of the deck (e.g. a *DEFINE_TABLE)
+    """
+    mid = deck["titles"][key][0] if isinstance(key, str) else key
+    material = deck["materials"].loc[mid]
+
+    eps, es = material["eps"], material["es"]
+    used = min(len(eps), len(es))
+    mask = es[:used] > 0
+
+    lcid = int(material["lcss"])
+    if lcid <= 0 and not mask.any() and material["c"] in deck["curves"]:
+        lcid = int(material["c"])
+
+    if lcid > 0:
+        points = deck["curves"][lcid]
+        return points[:, 0], points[:, 1]
+
+    return eps[:used][mask], es[:used][mask]
+
+
+def main() -> None:
+    """
+    Merge exported keyword files into a material library from the command
+    line.
+
+    Example:
+        python cf_library.py library.k export_1.k export_2.k
+    """
+    parser = argparse.ArgumentParser(description="Merge the material cards and curves of the "
+                                     "given keyword files into a library, only changed "
+                                     "blocks are rewritten.")
+    parser.add_argument("library", type=Path, help="keyword file of the material library")
+    parser.add_argument("inputs", type=Path, nargs="+", help="exported keyword files")
+    args = parser.parse_args()
+
+    args.library.touch(exist_ok=True)
+    contents = [path.read_text(encoding="utf-8") for path in args.inputs]
+    stats = update_library(args.library, contents)
+
+    print(f"{stats['replaced']} replaced, {stats['added']} added, "
+          f"{stats['unchanged']} unchanged blocks.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+from threading import Lock
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, Future
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class AsyncLoader(QObject):
+    """
+    Runs file imports and data preparation in a thread pool. Reading and
+    parsing is mostly I/O and C-level pandas work which releases the GIL, so
+    several files are processed concurrently. Results are reported with Qt
+    signals; signals emitted from the worker threads are queued and the
+    connected slots run in the UI thread, which therefore never waits for a
+    file.
+
+    Every task is identified by a hashable key. A task whose key is already
+    pending is not submitted again. Tasks cancelled before they started are
+    reported with cancelled(key), so state kept per key can be discarded. Slots should be connected with
+    Qt.QueuedConnection, so they are never called from within submit.
+    """
+
+    finished = pyqtSignal(object, object)
+    failed = pyqtSignal(object, str)
+    progress = pyqtSignal(object, int, int)
+    cancelled = pyqtSignal(object)
+
+    def __init__(self, workers: int | None = None, parent: QObject | None = None) -> None:
+        """
+        AsyncLoader init function.
+        ...
+
+        Parameter
+        ---------
+        workers: int | None, default = None
+            number of worker threads, defaults to the ThreadPoolExecutor default
+        parent: QObject | None, default = None
+            parent object
+
+        Returns
+        -------
+        None
+        """
+        super().__init__(parent)
+
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="cf_loader")
+        self._pending: dict[object, Future] = {}
+        self._lock = Lock()
+
+    def submit(self, key, func, *args) -> bool:
+        """
+        Run func(*args) in a worker thread. On completion finished(key, result)
+        or, if an exception was raised, failed(key, message) is emitted.
+        ...
+
+        Parameter
+        ---------
+        key: Hashable
+            key identifying the task
+        func: Callable
+            function to be run
+        *args:
+            arguments of the function
+
+        Returns
+        -------
+        _: bool
+            False if a task with the same key is still pending
+        """
+        with self._lock:
+            if key in self._pending:
+                return False
+
+            future = self._executor.submit(func, *args)
+            self._pending[key] = future
+
+        future.add_done_callback(partial(self._done, key))
+
+        return True
+
+    def report(self, key, done: int, total: int) -> None:
+        """
+        Report the progress of a running task, callable from the worker
+        thread. progress(key, done, total) is emitted.
+        """
+        self.progress.emit(key, done, total)
+
+    def is_pending(self, key) -> bool:
+        """
+        Whether a task with the given key is queued or running.
+        """
+        return key in self._pending
+
+    def cancel(self) -> None:
+        """
+        Cancel all queued tasks, cancelled(key) is emitted for each of them.
+        Running tasks finish, but their results are reported as usual, so
+        slots have to ignore stale keys.
+        """
+        with self._lock:
+            futures = list(self._pending.values())
+
+        for future in futures:
+            future.cancel()
+
+    def shutdown(self) -> None:
+        """
+        Cancel all queued tasks and stop the worker threads without waiting.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _done(self, key, future: Future) -> None:
+        """
+        Done callback of the futures. Runs in the worker thread (or in the
+        submitting thread for cancelled tasks).
+        """
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+        if future.cancelled():
+            self.cancelled.emit(key)
+            return
+
+        error = future.exception()
+        if error is not None:
+            message = error.args[0] if error.args else ""
+            self.failed.emit(key, f"{type(error).__name__} - {message}")
+        else:
+            self.finished.emit(key, future.result())
@@ -1,13 +1,42 @@
 from pathlib import Path
-from csv import Sniffer
-from math import log, e
+from typing import Iterable, Iterator
+from math import log, e, exp
+from time import perf_counter
 from string import Template
 
 import pandas as pd
 import numpy as np
 from scipy.optimize import curve_fit
+from numpy.linalg import LinAlgError
+from scipy.signal import savgol_filter
+from scipy.ndimage import median_filter, uniform_filter1d
 
-from cf_errors import FileError, ExportPointNoError, TemplateError, DataError
+from cf_errors import FileError, ExportPointNoError, TemplateError, DataError, FitError
+from cf_trace import Trace, trace_stage
+from cf_dataset import SharedDataset
+from cf_formats import read_frame
+from cf_library import update_library
+from cf_writers import fixed_width, write_targets
+
+
+_EXTRAP_NAMES = {0: "swift", 1: "voce", 2: "swift_voce"}
+
+# number of samples used to estimate robust scales during screening
+_SCREEN_SAMPLE_NO = 65536
+
+_SMOOTHING_NAMES = {0: "none", 1: "savgol", 2: "median", 3: "moving_average"}
+
+_NECKING_NAMES = {0: "none", 1: "bridgman", 2: "weighted_average"}
+
+# point placeholders a0, o0, ... a101, o101 of the *MAT_24 template
+_POINT_KEYS = ([f"a{j}" for j in range(102)], [f"o{j}" for j in range(102)])
+_EMPTY_POINTS = dict.fromkeys(_POINT_KEYS[0] + _POINT_KEYS[1], "$")
+
+# Physically sensible parameter bounds of the hardening laws
+# Swift: c > 0, 0 <= phi <= 1, 0 < n < 1
+# Voce: sigma >= 0, R > 0, B > 0
+_SWIFT_BOUNDS = ([1e-6, 0.0, 1e-6], [np.inf, 1.0, 1-1e-6])
+_VOCE_BOUNDS = ([0.0, 1e-6, 1e-6], [np.inf, np.inf, np.inf])
 
 
 class LsDynaTemplate(Template):
@@ -19,6 +48,17 @@ class LsDynaTemplate(Template):
     delimiter = "$%"
 
 
+def _as_frame(data: pd.DataFrame | SharedDataset) -> pd.DataFrame:
+    """
+    Dataframe of the given data. Shared datasets are returned as dataframes
+    whose columns are zero-copy views of the shared data.
+    """
+    if isinstance(data, SharedDataset):
+        return data.frame()
+
+    return data
+
+
 def _hooks_straight(x, m) -> float:
     """
     Equation describing the hooks straight.
@@ -47,83 +87,743 @@ def _swift_voce_extrapolation(x, alpha, c, phi, n, sigma, R, B) -> float:
     return alpha*(c*(phi+x)**n) + (1-alpha)*(sigma + R*(1-np.exp(-B*x)))
 
 
-def get_data_from_file(file_path: Path) -> pd.DataFrame:
+class _FitTimeout(Exception):
+    """
+    Raised by the objective of a fit when its wall-clock budget is exceeded.
+    """
+
+
+def _swift_linearized(strain: np.ndarray, stress: np.ndarray) -> list[float]:
+    """
+    Estimate the Swift parameters from a linear regression of log(stress)
+    over log(phi+strain). phi is fixed to the 0.2 % plastic strain at Rp_02.
+    """
+    phi = 0.002
+    mask = stress > 0
+    n, log_c = np.polyfit(np.log(phi+strain[mask]), np.log(stress[mask]), 1)
+
+    return [exp(log_c), phi, float(np.clip(n, _SWIFT_BOUNDS[0][2], _SWIFT_BOUNDS[1][2]))]
+
+
+def _voce_linearized(strain: np.ndarray, stress: np.ndarray) -> list[float]:
+    """
+    Estimate the Voce parameters from a linear regression of
+    log(saturation stress - stress) over strain. The saturation stress is
+    assumed slightly above the maximum stress.
+    """
+    saturation = stress.max() + 0.01*(stress.max()-stress.min()) + 1e-6
+    slope, log_R = np.polyfit(strain, np.log(saturation-stress), 1)
+    R = exp(log_R)
+
+    return [max(saturation-R, 0.0), R, max(-slope, _VOCE_BOUNDS[0][2])]
+
+
+# Objective, bounds and linearized estimate of the single hardening laws
+_LAWS = {0: (_swift_extrapolation, _SWIFT_BOUNDS, _swift_linearized),
+         1: (_voce_extrapolation, _VOCE_BOUNDS, _voce_linearized)}
+
+
+def _bounded_fit(func, strain: np.ndarray, stress: np.ndarray, initial_guess: list[float],
+                 bounds: tuple[list[float], list[float]], maxfev: int,
+                 deadline: float, calls: list[int]) -> np.ndarray:
+    """
+    Fit the given function within the parameter bounds, the maximum number of
+    function evaluations and the wall-clock deadline. Every evaluation of
+    the function (including those of the numerical jacobian) is counted in
+    calls[0], also if the fit fails.
+    ...
+
+    Returns
+    -------
+    _: ndarray
+        fitted parameters
+    """
+    def objective(x, *parameter):
+        if perf_counter() > deadline:
+            raise _FitTimeout()
+        calls[0] += 1
+        return func(x, *parameter)
+
+    lower, upper = np.asarray(bounds[0]), np.asarray(bounds[1])
+    initial_guess = np.clip(np.asarray(initial_guess, dtype=np.float64), lower, upper)
+
+    if not np.all(np.isfinite(initial_guess)):
+        raise ValueError("Initial guess is not finite.")
+
+    res = curve_fit(objective, strain, stress, initial_guess, bounds=(lower, upper),
+                    maxfev=maxfev, full_output=True)
+
+    if not np.all(np.isfinite(res[0])):
+        raise RuntimeError("Fitted parameters are not finite.")
+
+    return res[0]
+
+
+def _fit_law(extrap_type: int, strain: np.ndarray, stress: np.ndarray,
+             initial_guesses: list[tuple[str, list[float]]], maxfev: int,
+             timeout: float) -> tuple[list[float], dict]:
+    """
+    Fit a single hardening law with a fallback sequence. The given initial
+    guesses are tried in order, followed by the linearized estimate. If no
+    fit converges within the budgets the linearized estimate itself is used.
+    ...
+
+    Parameter
+    ---------
+    extrap_type: int
+        0 = Swift, 1 = Voce
+    strain: ndarray
+        plastic strain of the fit window
+    stress: ndarray
+        true stress of the fit window
+    initial_guesses: list[tuple[str, list[float]]]
+        name and parameters of the initial guesses
+    maxfev: int
+        maximum number of function evaluations per attempt
+    timeout: float
+        wall-clock budget of all attempts [s]
+
+    Returns
+    -------
+    _: tuple[list[float], dict]
+        0 = parameters
+        1 = status of the fit (see extrapolate)
+    """
+    func, bounds, linearized = _LAWS[extrap_type]
+
+    t_0 = perf_counter()
+    deadline = t_0 + timeout
+    attempts = []
+    estimate = None
+    # evaluations of all attempts, failed attempts cost as well
+    calls = [0]
+
+    candidates = initial_guesses + [("linearized", None)]
+    for method, initial_guess in candidates:
+        calls_0 = calls[0]
+        try:
+            if initial_guess is None:
+                initial_guess = estimate = linearized(strain, stress)
+
+            parameter = _bounded_fit(func, strain, stress, initial_guess, bounds, maxfev,
+                                     deadline, calls)
+            attempts.append({"method": method, "message": "converged",
+                             "nfev": calls[0]-calls_0})
+
+            return [float(p) for p in parameter], {
+                "law": _EXTRAP_NAMES[extrap_type], "method": method, "success": True,
+                "nfev": calls[0], "time": perf_counter()-t_0, "attempts": attempts}
+
+        except _FitTimeout:
+            attempts.append({"method": method, "message": "wall-clock budget exceeded",
+                             "nfev": calls[0]-calls_0})
+            break
+        except (RuntimeError, ValueError, LinAlgError) as error:
+            attempts.append({"method": method, "message": str(error),
+                             "nfev": calls[0]-calls_0})
+
+    try:
+        if estimate is None:
+            estimate = linearized(strain, stress)
+        if not np.all(np.isfinite(estimate)):
+            raise ValueError("Linearized estimate is not finite.")
+    except (ValueError, LinAlgError) as error:
+        raise FitError(_EXTRAP_NAMES[extrap_type], str(error)) from error
+
+    return [float(p) for p in estimate], {
+        "law": _EXTRAP_NAMES[extrap_type], "method": "linearized_estimate", "success": False,
+        "nfev": calls[0], "time": perf_counter()-t_0, "attempts": attempts}
+
+
+def _strain_rate(strain: np.ndarray, time: np.ndarray) -> np.ndarray:
+    """
+    Local strain rate as central difference of the strain over the time.
+    Samples with repeated time stamps are set to NaN.
+    """
+    if len(strain) < 2:
+        return np.full(len(strain), np.nan)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.gradient(strain, time)
+    rate[~np.isfinite(rate)] = np.nan
+
+    return rate
+
+
+def _mapping_columns(mapping: dict) -> list[str | int]:
     """
-    Read data from given .csv-file and store it in a dataframe.
+    Columns of a file needed for the given column mapping.
+    """
+    if "strain" not in mapping and not {"extension", "gauge_length"} <= mapping.keys():
+        raise ValueError("Column mapping needs a strain or an extension column and gauge length.")
+    if "stress" not in mapping and not {"force", "area"} <= mapping.keys():
+        raise ValueError("Column mapping needs a stress or a force column and area.")
+
+    columns = [mapping[key] for key in ("strain" if "strain" in mapping else "extension",
+                                        "stress" if "stress" in mapping else "force", "time")
+               if key in mapping]
+    if len({isinstance(column, int) for column in columns}) > 1:
+        raise ValueError("Column mapping must use either column names or column indices.")
+
+    return columns
+
+
+def _mapped_channels(data: pd.DataFrame | dict, mapping: dict) -> dict[str, np.ndarray]:
+    """
+    Engineering strain and stress (and time) computed from the mapped
+    channels. All channels are processed as whole arrays.
+    ...
+
+    Parameter
+    ---------
+    data: DataFrame | dict
+        the mapped columns of a file
+    mapping: dict
+        column mapping (see get_data_from_file)
+
+    Returns
+    -------
+    _: dict[str, ndarray]
+        eng_strain, eng_stress and, if mapped, time
+    """
+    if "strain" in mapping:
+        strain = np.asarray(data[mapping["strain"]], dtype=np.float64) * \
+            mapping.get("strain_factor", 1.0)
+    else:
+        strain = np.asarray(data[mapping["extension"]], dtype=np.float64) / \
+            mapping["gauge_length"]
+
+    if "stress" in mapping:
+        stress = np.asarray(data[mapping["stress"]], dtype=np.float64)
+    else:
+        stress = np.asarray(data[mapping["force"]], dtype=np.float64) * \
+            mapping.get("force_factor", 1.0) / mapping["area"]
+
+    channels = {"eng_strain": strain, "eng_stress": stress}
+    if "time" in mapping:
+        channels["time"] = np.asarray(data[mapping["time"]], dtype=np.float64)
+
+    return channels
+
+
+def _read_mapped(file_path: Path, mapping: dict, chunk_size: int | None = None):
+    """
+    Read only the columns of the column mapping as float64.
+    """
+    return read_frame(file_path, _mapping_columns(mapping), np.float64, chunk_size)
+
+
+def get_data_from_file(file_path: Path, trace: Trace | None = None,
+                       mapping: dict | None = None) -> pd.DataFrame:
+    """
+    Read data from given data file and store it in a dataframe. Besides
+    .csv-files, gzip or zstd compressed .csv-files and Parquet or Arrow IPC
+    files are read (see cf_formats.read_frame).
+    Without column mapping the file must contain exactly the strain and
+    stress columns. Multi-channel files are read with a column mapping;
+    only the mapped columns are parsed.
     ...
 
     Parameter
     ---------
     file_path: Path
-        path to the .csv-file
+        path to the data file
+    trace: Trace | None, default = None
+        trace recording timing information of the stage
+    mapping: dict | None, default = None
+        column mapping profile. Columns are given by header name or index.
+        strain = engineering strain column
+        strain_factor = factor of the strain column, e.g. 0.01 for % [float]
+        extension = extension column [mm], used if no strain column is given
+        gauge_length = gauge length [mm]
+        stress = engineering stress column [MPa]
+        force = force column [N], used if no stress column is given
+        force_factor = factor of the force column, e.g. 1000 for kN [float]
+        area = initial cross section [mm²]
+        time = time column [s], adds the columns time and strain_rate
 
     Returns
     -------
     _: DataFrame
-        dataframe containing the data from the .csv-file.
+        dataframe containing the data from the file.
     """
 
-    if file_path.is_file() is True:
-        header, delimiter = _get_csv_info(file_path)
+    with trace_stage(trace, "get_data_from_file", file=str(file_path)) as record:
+        if file_path.is_file() is True and mapping is not None:
+            channels = _mapped_channels(_read_mapped(file_path, mapping), mapping)
+            df = pd.DataFrame(channels, copy=False)
+
+            # pre-load offset removed from the data
+            df.attrs["offset"] = [float(df["eng_strain"][0]), float(df["eng_stress"][0])]
+
+            df["eng_strain"] = df["eng_strain"] - df["eng_strain"][0]
+            df["eng_stress"] = df["eng_stress"] - df["eng_stress"][0]
+
+            if "time" in df:
+                df["strain_rate"] = _strain_rate(df["eng_strain"].to_numpy(),
+                                                 df["time"].to_numpy())
+
+            record["point_no"] = len(df)
+
+            return df
+
+        elif file_path.is_file() is True:
+            df = read_frame(file_path)
+
+            if df.shape[1] != 2:
+                raise DataError(df.shape[1]) from None
+            else:
+                df = df.set_axis(["eng_strain", "eng_stress"],
+                                 axis="columns", copy=False)
+
+                # pre-load offset removed from the data
+                df.attrs["offset"] = [float(df["eng_strain"][0]), float(df["eng_stress"][0])]
+
+                df["eng_strain"] = df["eng_strain"] - df["eng_strain"][0]
+                df["eng_stress"] = df["eng_stress"] - df["eng_stress"][0]
+
+                record["point_no"] = len(df)
 
-        if header is True:
-            df = pd.read_csv(file_path, delimiter=delimiter,
-                             header=0)
+                return df
         else:
-            df = pd.read_csv(file_path, delimiter=delimiter,
-                             header=None)
+            raise FileError(file_path) from None
+
+
+def _specimen_lengths(block: np.ndarray) -> np.ndarray:
+    """
+    Number of rows of every specimen of a multi-specimen block without the
+    NaN tail of shorter specimens.
+    """
+    valid = np.isfinite(block[:, 0::2]) & np.isfinite(block[:, 1::2])
+    # index of the last row in which strain and stress are both present
+    last = len(block) - np.argmax(valid[::-1], axis=0)
+
+    return np.where(valid.any(axis=0), last, 0)
+
+
+def get_specimens_from_file(file_path: Path,
+                            trace: Trace | None = None) -> list[pd.DataFrame]:
+    """
+    Read a data file containing one or several specimens side by side
+    (strain1, stress1, strain2, stress2, ...). The file is parsed once into a
+    column-major float64 block, every specimen is a zero-copy view of its
+    two columns. Shorter specimens are cut before their NaN tail.
+    ...
+
+    Parameter
+    ---------
+    file_path: Path
+        path to the data file (see get_data_from_file)
+    trace: Trace | None, default = None
+        trace recording timing information of the stage
+
+    Returns
+    -------
+    _: list[DataFrame]
+        one dataframe per specimen, see get_data_from_file. The name of the
+        specimen is stored in df.attrs["specimen"].
+    """
+    with trace_stage(trace, "get_specimens_from_file", file=str(file_path)) as record:
+        if file_path.is_file() is not True:
+            raise FileError(file_path) from None
 
-        if df.shape[1] != 2:
+        df = read_frame(file_path, dtype=np.float64)
+
+        # trailing delimiters add an empty column
+        if df.shape[1] % 2 == 1 and df.iloc[:, -1].isna().all():
+            df = df.iloc[:, :-1]
+
+        if df.shape[1] < 2 or df.shape[1] % 2 == 1:
             raise DataError(df.shape[1]) from None
+
+        # columns of files without header are labelled by index
+        names = [name if isinstance(name, str) and not name.isdigit() else f"Specimen {i//2 + 1}"
+                 for i, name in enumerate(df.columns)][1::2]
+        block = np.asfortranarray(df.to_numpy(dtype=np.float64))
+        del df
+
+        # pre-load offsets of all specimens removed in one pass
+        offsets = block[0].copy()
+        block -= offsets
+        lengths = _specimen_lengths(block)
+
+        specimens = []
+        for i, (name, length) in enumerate(zip(names, lengths)):
+            if length == 0:
+                continue
+
+            specimen = pd.DataFrame(block[:length, 2*i:2*i + 2],
+                                    columns=["eng_strain", "eng_stress"], copy=False)
+            specimen.attrs["offset"] = [float(offsets[2*i]), float(offsets[2*i + 1])]
+            specimen.attrs["specimen"] = name
+            specimens.append(specimen)
+
+        if not specimens:
+            raise DataError(0) from None
+
+        record["specimen_no"] = len(specimens)
+        record["point_no"] = int(lengths.sum())
+
+        return specimens
+
+
+def screen_data(df: pd.DataFrame, fix: bool = False, jump_factor: float = 50,
+                spike_factor: float = 10, trace: Trace | None = None) -> pd.DataFrame:
+    """
+    Screens the imported data for common data quality issues. All checks are
+    computed from the sample to sample differences of the data in one
+    vectorized pass. The report is attached to the returned dataframe as
+    df.attrs["screening"].
+    ...
+
+    Parameter
+    ---------
+    df: DataFrame
+        dataframe as returned by get_data_from_file
+    fix: bool, default = False
+        if True spikes are replaced by the mean of their neighbours,
+        strain jumps are removed from the subsequent data and duplicate as
+        well as non-monotonic samples are dropped.
+    jump_factor: float, default = 50
+        strain increments larger than jump_factor times the median
+        increment are flagged as extensometer slip or removal
+    spike_factor: float, default = 10
+        stress samples deviating from the mean of their neighbours by more
+        than spike_factor times the robust standard deviation of that
+        deviation are flagged as load-cell spikes
+    trace: Trace | None, default = None
+        trace recording timing information of the stage
+
+    Returns
+    -------
+    _: DataFrame
+        the screened (and if requested fixed) dataframe. The report
+        df.attrs["screening"] is a dict containing
+        point_no = number of samples [int]
+        non_monotonic = indices of samples with strain below the maximum of
+                        the preceeding samples [list[int]]
+        duplicates = indices of repeated samples [list[int]]
+        strain_jumps = indices of samples after a strain jump [list[int]]
+        stress_spikes = indices of single sample stress spikes [list[int]]
+        preload_offset = strain and stress offset removed at import [list[float]]
+        fixed = whether the issues were fixed [bool]
+    """
+    with trace_stage(trace, "screen_data", point_no=len(df)) as record:
+        strain = df["eng_strain"].to_numpy(dtype=np.float64)
+        stress = df["eng_stress"].to_numpy(dtype=np.float64)
+
+        d_strain = np.diff(strain)
+
+        # Robust scales are estimated on an evenly strided subsample which is
+        # sufficient for a median and keeps the screening cheap for long files.
+        step = max(1, len(d_strain)//_SCREEN_SAMPLE_NO)
+
+        # samples identical to their predecessor
+        repeated = np.flatnonzero(d_strain == 0) + 1
+        duplicates = repeated[stress[repeated] == stress[repeated-1]]
+
+        # extensometer slip or removal: strain jumps much larger than the
+        # typical strain increment
+        abs_d_strain = np.abs(d_strain)
+        typical = np.median(abs_d_strain[::step]) if len(d_strain) else 0
+        if typical == 0:
+            typical = abs_d_strain.mean() if len(d_strain) else 0
+        if typical > 0:
+            jumps = np.flatnonzero(abs_d_strain > jump_factor*typical) + 1
         else:
-            df = df.set_axis(["eng_strain", "eng_stress"],
-                             axis="columns", copy=False)
+            jumps = np.array([], dtype=np.intp)
+
+        # shift all samples after a jump by the excess of the jump
+        excess = np.zeros(len(strain))
+        excess[jumps] = d_strain[jumps-1] - np.sign(d_strain[jumps-1])*typical
+        shifted = strain - np.cumsum(excess)
+
+        # strain below the maximum reached before, not only below the previous
+        # sample, so every sample of a decreasing run is found
+        non_monotonic = np.flatnonzero(shifted < np.maximum.accumulate(shifted))
+
+        # load-cell spikes: single samples deviating from both neighbours in
+        # the same direction. The fracture drop is not a spike since the
+        # stress does not return to its level before the drop.
+        deviation = stress[1:-1] - 0.5*(stress[:-2] + stress[2:])
+        sample = deviation[::step]
+        mad = np.median(np.abs(sample - np.median(sample))) if sample.size else 0
+        if mad > 0:
+            spikes = np.flatnonzero(np.abs(deviation) > spike_factor*1.4826*mad) + 1
+            before = stress[spikes] - stress[spikes-1]
+            after = stress[spikes+1] - stress[spikes]
+            spikes = spikes[(np.sign(before) == -np.sign(after))
+                            & (np.abs(stress[spikes+1] - stress[spikes-1])
+                               < 0.5*np.abs(deviation[spikes-1]))]
+        else:
+            spikes = np.array([], dtype=np.intp)
 
-            df["eng_strain"] = df["eng_strain"] - df["eng_strain"][0]
-            df["eng_stress"] = df["eng_stress"] - df["eng_stress"][0]
+        report = {
+            "point_no": len(df),
+            "non_monotonic": non_monotonic.tolist(),
+            "duplicates": duplicates.tolist(),
+            "strain_jumps": jumps.tolist(),
+            "stress_spikes": spikes.tolist(),
+            "preload_offset": df.attrs.get("offset", [0.0, 0.0]),
+            "fixed": fix,
+        }
 
-            return df
-    else:
-        raise FileError(file_path) from None
+        if fix:
+            stress = stress.copy()
+            stress[spikes] = 0.5*(stress[spikes-1] + stress[spikes+1])
+
+            strain = shifted
 
+            keep = np.ones(len(strain), dtype=bool)
+            keep[non_monotonic] = False
+            keep[duplicates] = False
 
-def _get_csv_info(file_path: Path) -> tuple[bool, str]:
+            attrs = df.attrs
+            columns = {"eng_strain": strain[keep], "eng_stress": stress[keep]}
+            # further channels (e.g. time) are kept for the remaining samples
+            columns.update({column: df[column].to_numpy()[keep] for column in df.columns
+                            if column not in columns})
+            df = pd.DataFrame(columns)
+            df.attrs = attrs
+
+            if "time" in df:
+                df["strain_rate"] = _strain_rate(df["eng_strain"].to_numpy(),
+                                                 df["time"].to_numpy())
+
+        df.attrs["screening"] = report
+        record["issue_no"] = sum(len(report[k]) for k in ("non_monotonic", "duplicates",
+                                                          "strain_jumps", "stress_spikes"))
+
+        return df
+
+
+def _smooth_array(arr: np.ndarray, method: int, window: int, polyorder: int) -> np.ndarray:
+    """
+    Smooth an array along its first axis. The array is padded with its edge
+    values, so that smoothing a block with enough context on both sides
+    gives the same result as smoothing the whole data.
     """
-    Collects information about the given .csv-file regarding existance of a
-    header and the delimiter character.
+    if method == 1:
+        return savgol_filter(arr, window, polyorder, axis=0, mode="nearest")
+    elif method == 2:
+        size = (window,) + (1,)*(arr.ndim-1)
+        return median_filter(arr, size=size, mode="nearest")
+    elif method == 3:
+        return uniform_filter1d(arr, window, axis=0, mode="nearest")
+
+    return arr
+
+
+def smooth_data(df: pd.DataFrame, method: int, window: int = 11, polyorder: int = 3,
+                trace: Trace | None = None) -> pd.DataFrame:
+    """
+    Smooth the engineering stress - strain data in memory.
+    ...
+
+    Parameter
+    ---------
+    df: DataFrame
+        dataframe as returned by get_data_from_file
+    method: int
+        integer indicating the smoothing filter
+        0 = None
+        1 = Savitzky-Golay
+        2 = Median
+        3 = Moving Average
+    window: int, default = 11
+        number of samples of the filter window. Even numbers are
+        increased by one.
+    polyorder: int, default = 3
+        order of the polynomial of the Savitzky-Golay filter
+    trace: Trace | None, default = None
+        trace recording timing information of the stage
+
+    Returns
+    -------
+    _: DataFrame
+        dataframe containing the smoothed data
+    """
+    if method == 0:
+        return df
+
+    window = window | 1
+
+    with trace_stage(trace, f"smooth_data[{_SMOOTHING_NAMES[method]}]", point_no=len(df),
+                     window=window):
+        arr = _smooth_array(df[["eng_strain", "eng_stress"]].to_numpy(dtype=np.float64),
+                            method, window, min(polyorder, window-1))
+
+        attrs = df.attrs
+        smoothed = pd.DataFrame(arr, columns=["eng_strain", "eng_stress"])
+        smoothed.attrs = attrs
+
+        # the smoothed data has to start at the origin as well
+        smoothed["eng_strain"] = smoothed["eng_strain"] - smoothed["eng_strain"][0]
+        smoothed["eng_stress"] = smoothed["eng_stress"] - smoothed["eng_stress"][0]
+
+        # further channels are kept, the strain rate follows the smoothed strain
+        for column in df.columns.difference(smoothed.columns, sort=False):
+            smoothed[column] = df[column].to_numpy()
+        if "time" in smoothed:
+            smoothed["strain_rate"] = _strain_rate(smoothed["eng_strain"].to_numpy(),
+                                                   smoothed["time"].to_numpy())
+
+        return smoothed
+
+
+def smooth_stream(chunks: Iterable[np.ndarray], method: int, window: int = 11,
+                  polyorder: int = 3) -> Iterator[np.ndarray]:
+    """
+    Smooth data given as consecutive chunks with bounded memory. Only the
+    last window-1 samples of the previous chunk are kept as context. The
+    result is identical to smoothing the concatenated data with smooth_data.
+    ...
+
+    Parameter
+    ---------
+    chunks: Iterable[ndarray]
+        consecutive chunks of the data, smoothed along the first axis
+    method: int
+        integer indicating the smoothing filter (see smooth_data)
+    window: int, default = 11
+        number of samples of the filter window. Even numbers are
+        increased by one.
+    polyorder: int, default = 3
+        order of the polynomial of the Savitzky-Golay filter
+
+    Returns
+    -------
+    _: Iterator[ndarray]
+        smoothed chunks. The chunks are delayed by half a window, their
+        lengths therefore differ from the input chunks.
+    """
+    window = window | 1
+    polyorder = min(polyorder, window-1)
+    half = window//2
+
+    carry = None
+    first = True
+
+    for chunk in chunks:
+        buffer = chunk if carry is None else np.concatenate([carry, chunk])
+
+        if len(buffer) < window:
+            carry = buffer
+            continue
+
+        smoothed = _smooth_array(buffer, method, window, polyorder)
+
+        # samples closer than half a window to the end of the buffer lack
+        # context and are computed with the next chunk
+        yield smoothed[0 if first else half:len(buffer)-half]
+
+        carry = buffer[-2*half:] if half else buffer[:0]
+        first = False
+
+    if carry is not None and len(carry):
+        smoothed = _smooth_array(carry, method, window, polyorder)
+        yield smoothed if first else smoothed[half:]
+
+
+def get_smoothed_data_from_file(file_path: Path, method: int, window: int = 11,
+                                polyorder: int = 3, decimation: int = 1,
+                                chunk_size: int = 100000,
+                                trace: Trace | None = None,
+                                mapping: dict | None = None) -> pd.DataFrame:
+    """
+    Read data from given data file in chunks, smooth and optionally decimate
+    it. Only the smoothed (and decimated) data is kept in memory, which
+    allows processing of very long logs.
     ...
 
     Parameter
     ---------
     file_path: Path
-        path to the .csv-file
+        path to the data file (see get_data_from_file)
+    method: int
+        integer indicating the smoothing filter (see smooth_data)
+    window: int, default = 11
+        number of samples of the filter window
+    polyorder: int, default = 3
+        order of the polynomial of the Savitzky-Golay filter
+    decimation: int, default = 1
+        only every n-th smoothed sample is kept
+    chunk_size: int, default = 100000
+        number of rows read per chunk
+    trace: Trace | None, default = None
+        trace recording timing information of the stage
+    mapping: dict | None, default = None
+        column mapping profile (see get_data_from_file)
 
     Returns
     -------
-    _: tuple[bool, str]
-        bool to describe the existance of a header (True == yes)
-        str to return the delimiter
+    _: DataFrame
+        dataframe containing the smoothed data from the file.
     """
-    with open(file_path, 'r') as f:
-        # Sniffer analyzes the first few lines
-        sniffer = Sniffer()
-        sample = f.read(1024)  # Read a sample from the file
-        return sniffer.has_header(sample), sniffer.sniff(sample).delimiter
+    with trace_stage(trace, "get_smoothed_data_from_file", file=str(file_path),
+                     window=window, decimation=decimation) as record:
+        if file_path.is_file() is not True:
+            raise FileError(file_path) from None
+
+        columns = ["eng_strain", "eng_stress"]
+
+        if mapping is None:
+            reader = read_frame(file_path, chunk_size=chunk_size)
+        else:
+            reader = _read_mapped(file_path, mapping, chunk_size)
+            if "time" in mapping:
+                columns.append("time")
 
+        def raw_chunks():
+            for chunk in reader:
+                if mapping is not None:
+                    yield np.column_stack(list(_mapped_channels(chunk, mapping).values()))
+                elif chunk.shape[1] != 2:
+                    raise DataError(chunk.shape[1]) from None
+                else:
+                    yield chunk.to_numpy(dtype=np.float64)
 
-def comp_true_stress_strain(df: pd.DataFrame, rp02_i: int, rm_i: int) -> pd.DataFrame:
+        parts = []
+        position = 0
+        for smoothed in smooth_stream(raw_chunks(), method, window, polyorder):
+            # keep the global sample positions that are multiples of decimation
+            parts.append(smoothed[-position % decimation::decimation])
+            position += len(smoothed)
+
+        arr = np.concatenate(parts) if parts else np.empty((0, len(columns)))
+
+        df = pd.DataFrame(arr, columns=columns)
+
+        df.attrs["offset"] = [float(df["eng_strain"][0]), float(df["eng_stress"][0])]
+
+        df["eng_strain"] = df["eng_strain"] - df["eng_strain"][0]
+        df["eng_stress"] = df["eng_stress"] - df["eng_stress"][0]
+
+        if "time" in df:
+            df["strain_rate"] = _strain_rate(df["eng_strain"].to_numpy(), df["time"].to_numpy())
+
+        record["point_no"] = len(df)
+
+        return df
+
+
+def comp_true_stress_strain(df: pd.DataFrame | SharedDataset, rp02_i: int, rm_i: int,
+                            trace: Trace | None = None) -> pd.DataFrame:
     """
     Computes the true stress - true strain curve of the given data.
     ...
 
     Parameter
     ---------
-    df: DataFrame
-        dataframe containing the data
+    df: DataFrame | SharedDataset
+        dataframe or shared dataset containing the data. For a shared
+        dataset a new dataframe viewing the shared columns is returned.
     rp02_i: int
         index of the datapoint for rp02
     rm_i: int
         index of the datapoint for rm
+    trace: Trace | None, default = None
+        trace recording timing information of the stage
 
     Returns
     -------
@@ -132,30 +832,189 @@ def comp_true_stress_strain(df: pd.DataFrame, rp02_i: int, rm_i: int) -> pd.Data
         data of the true stress - true strain curve.
     """
 
-    df["strain"] = np.log(1+(df["eng_strain"][0:rm_i])
-                          )             # strain [-]
-    df["stress"] = df["eng_stress"][0:rm_i] * \
-        np.exp(df["strain"][0:rm_i]
-               )                                # stress [MPa]
+    df = _as_frame(df)
+
+    with trace_stage(trace, "comp_true_stress_strain", point_no=len(df)):
+        df["strain"] = np.log(1+(df["eng_strain"][0:rm_i])
+                              )             # strain [-]
+        df["stress"] = df["eng_stress"][0:rm_i] * \
+            np.exp(df["strain"][0:rm_i]
+                   )                                # stress [MPa]
+
+        df["plst_strain"] = df["strain"].loc[rp02_i:] - df["strain"][rp02_i]
+        df["plst_stress"] = df["stress"].loc[rp02_i:]
+
+        return df
+
+
+def _offset_intersection(strain: np.ndarray, stress: np.ndarray, E: float,
+                         offset: float) -> tuple[int, float]:
+    """
+    Find the first intersection of the data with the hooks straight shifted by
+    the given strain offset. The difference between data and straight is
+    searched for its first sign change, the intersection is then linearly
+    interpolated between the two bracketing samples.
+    ...
+
+    Returns
+    -------
+    _: tuple[int, float]
+        0 = index of the sample closest to the intersection [int]
+        1 = interpolated stress at the intersection [float]
+    """
+    difference = stress - (strain-offset)*E
+
+    crossing = np.flatnonzero((difference[:-1] >= 0) & (difference[1:] < 0))
+
+    if crossing.size == 0:
+        # no intersection, fall back to the closest sample
+        i = int(np.abs(difference).argmin())
+        return i, float(stress[i])
+
+    i = int(crossing[0])
+    t = difference[i]/(difference[i]-difference[i+1])
+
+    return i + int(t >= 0.5), float(stress[i] + t*(stress[i+1]-stress[i]))
+
+
+def _peak_fit(strain: np.ndarray, stress: np.ndarray, peak_i: int,
+              band: float = 0.005) -> tuple[float, float]:
+    """
+    Estimate the maximum of the data from the vertex of a parabola fitted to
+    a window symmetric around the sample maximum. The half width of the
+    window is the wider side of the contiguous region within the given
+    relative band below the maximum, at least the direct neighbours. The
+    vertex strain and stress are used together, the sample maximum only if
+    the fit is degenerate.
+    ...
+
+    Returns
+    -------
+    _: tuple[float, float]
+        0 = strain at the maximum [float]
+        1 = maximum stress [float]
+    """
+    below = stress < (1-band)*stress[peak_i]
+
+    # half width of the region around the peak within the band
+    before = np.flatnonzero(below[:peak_i])
+    after = np.flatnonzero(below[peak_i:])
+    half = max(peak_i - (before[-1]+1 if before.size else 0),
+               (peak_i+after[0] if after.size else len(stress)) - 1 - peak_i, 1)
+    half = min(half, peak_i, len(stress)-1-peak_i)
+
+    if half < 1:
+        return float(strain[peak_i]), float(stress[peak_i])
+
+    window = slice(peak_i-half, peak_i+half+1)
+    x = strain[window] - strain[peak_i]
+    a, b, c = np.polyfit(x, stress[window], 2)
+
+    if a >= 0:
+        return float(strain[peak_i]), float(stress[peak_i])
+
+    x_max = -b/(2*a)
+
+    # the parabola has to peak between the outer samples used
+    if not x[0] <= x_max <= x[-1]:
+        return float(strain[peak_i]), float(stress[peak_i])
+
+    return float(strain[peak_i] + x_max), float(c - b**2/(4*a))
+
+
+def _fracture_index(stress: np.ndarray, rm_i: int, rm: float, drop: float = 0.5) -> int:
+    """
+    Index of the last sample before fracture. Fracture is the first sample
+    after Rm whose stress falls below the given fraction of Rm, so that
+    single glitches in the data are not mistaken for the fracture. Data
+    ending above 50 MPa is regarded as not broken.
+    """
+    if stress[-1] > 50:
+        return len(stress)-1
+
+    broken = np.flatnonzero(stress[rm_i:] < drop*rm)
 
-    df["plst_strain"] = df["strain"].loc[rp02_i:] - df["strain"][rp02_i]
-    df["plst_stress"] = df["stress"].loc[rp02_i:]
+    if broken.size == 0:
+        return len(stress)-1
 
-    return df
+    return rm_i + int(broken[0]) - 1
 
 
-def comp_material_data(df: pd.DataFrame, e_start: int, e_end: int) -> list[float | int]:
+def _fracture_point(strain: np.ndarray, stress: np.ndarray, rm_i: int, rm: float,
+                    drop: float = 0.5) -> tuple[float, float]:
+    """
+    Strain and stress at fracture. The crossing of the given fraction of Rm
+    is linearly interpolated between the last sample before fracture and
+    the first sample below it, like Rp_02 in _offset_intersection. If that
+    sample carries no load anymore, its strain is not measured on the
+    specimen and the last sample before fracture is used. Data which is
+    not broken ends at its last sample.
+    """
+    i = _fracture_index(stress, rm_i, rm, drop)
+
+    if i+1 >= len(stress) or not 0 < stress[i+1] < stress[i]:
+        return float(strain[i]), float(stress[i])
+
+    t = (stress[i]-drop*rm)/(stress[i]-stress[i+1])
+
+    # strain falling back after the crack is not interpolated
+    strain_next = max(strain[i], strain[i+1])
+
+    return float(strain[i] + t*(strain_next-strain[i])), drop*rm
+
+
+def window_indices(strain: pd.Series | np.ndarray, lower: float, upper: float,
+                   first: int = 0, last: int | None = None) -> tuple[int, int]:
+    """
+    Indices of the data points inside a fit window given by strain values,
+    e.g. a window selected in a graph. Noisy strain is made monotonic by its
+    running maximum, so the window is always contiguous.
+    ...
+
+    Parameter
+    ---------
+    strain: Series | ndarray
+        strain values of the data points
+    lower: float
+        lower strain of the window
+    upper: float
+        upper strain of the window
+    first: int, default = 0
+        index of the first data point the window may contain
+    last: int | None, default = None
+        index after the last data point the window may contain, defaults to
+        the end of the data
+
+    Returns
+    -------
+    _: tuple[int, int]
+        0 = index of the first data point inside the window [int]
+        1 = index after the last data point inside the window [int]
+    """
+    strain = np.asarray(strain, dtype=np.float64)[first:last]
+
+    # NaN samples do not break the running maximum
+    running = np.fmax.accumulate(strain)
+
+    return (first + int(np.searchsorted(running, lower, "left")),
+            first + int(np.searchsorted(running, upper, "right")))
+
+
+def comp_material_data(df: pd.DataFrame | SharedDataset, e_start: int, e_end: int,
+                       trace: Trace | None = None) -> list[float | int]:
     """
     Computing different material characteristics.
 
     Parameter
     ---------
-    df: DataFrame
-        dataframe containing the data
+    df: DataFrame | SharedDataset
+        dataframe or shared dataset containing the data
     e_start: int
         index of the first data point used for computation of youngs modulus
     e_end: int
         index of the last data point used for computation of youngs modulus
+    trace: Trace | None, default = None
+        trace recording timing information of the stage
 
     Returns
     -------
@@ -170,52 +1029,205 @@ def comp_material_data(df: pd.DataFrame, e_start: int, e_end: int) -> list[float
         6 = failure strain [float]
     """
 
-    # compute youngs modulus
-    res = curve_fit(_hooks_straight,
-                    df["eng_strain"][e_start:e_end], df["eng_stress"][e_start:e_end])
-    E = res[0][0]
+    df = _as_frame(df)
 
-    # compute Rp_02
-    # Compute difference between measurement data and hooks straight
-    difference = df["eng_stress"] - (df["eng_strain"]-0.002)*E
+    with trace_stage(trace, "comp_material_data", point_no=len(df)) as record:
+        # compute youngs modulus
+        res = curve_fit(_hooks_straight,
+                        df["eng_strain"][e_start:e_end], df["eng_stress"][e_start:e_end],
+                        full_output=True)
+        E = res[0][0]
+        record["nfev"] = res[2]["nfev"]
+        record["fit_point_no"] = len(df["eng_strain"][e_start:e_end])
 
-    rp02_i = np.abs(difference).argmin()
-    # Rp_0.2 of the material
-    rp02 = df["eng_stress"][rp02_i]
+        strain = df["eng_strain"].to_numpy(dtype=np.float64)
+        stress = df["eng_stress"].to_numpy(dtype=np.float64)
 
-    # Compute Failure strain A_5
-    if df["eng_stress"].iloc[-1] > 50:
-        a5_i = df["eng_strain"].index[-1]
+        # compute Rp_02
+        # Intersection of the measurement data with the hooks straight shifted
+        # by 0.2 % strain, interpolated between the bracketing samples.
+        rp02_i, rp02 = _offset_intersection(strain, stress, E, 0.002)
 
-    else:
-        # Compute pandas series with stress drops
-        stress_drop = pd.Series(df["eng_stress"].diff())
-        a5_i = stress_drop.idxmin()-1
+        # Rm of the material and the strain at Rm from a parabola fitted to
+        # the peak of the data
+        rm_i = int(np.argmax(stress))
+        rm_strain, rm = _peak_fit(strain, stress, rm_i)
+
+        # Compute Failure strain A_5
+        a5_strain, a5_stress = _fracture_point(strain, stress, rm_i, rm)
+
+        # Compute failure strain
+        af = a5_strain - a5_stress/E
 
-    # Compute failure strain
-    af = (df["eng_strain"][a5_i]) - (df["eng_stress"][a5_i]/E)
+        # Unifrom strain
+        ag = rm_strain - rm/E
 
-    # Rm of the material
-    rm_i = df["eng_stress"].idxmax()
-    rm = df["eng_stress"][rm_i]
+        return [E, rp02, rm, rp02_i, rm_i, ag, af]
 
-    # Unifrom strain
-    ag = (df["eng_strain"][rm_i]) - (rm/E)
 
-    return [E, rp02, rm, rp02_i, rm_i, ag, af]
+def _neck_strain(eng_strain: np.ndarray, e_u: float, neck_length: float) -> np.ndarray:
+    """
+    True strain in the neck, if the elongation beyond uniform strain e_u is
+    localized in a neck of the given length relative to the gauge length.
+    """
+    return log(1+e_u) + np.log1p((eng_strain-e_u)/(neck_length*(1+e_u)))
+
+
+def _bridgman_factor(true_strain: np.ndarray, eps_u: float) -> np.ndarray:
+    """
+    Ratio of the average axial stress to the flow stress in the neck after
+    Bridgman, (1 + 2R/a) ln(1 + a/2R), with the neck geometry
+    a/R = 1.1 (eps - eps_u) of Le Roy et al.
+    """
+    ratio = np.maximum(1.1*(true_strain-eps_u), 1e-12)
+
+    return (1 + 2/ratio)*np.log1p(ratio/2)
+
+
+def _weighted_average(true_strain: np.ndarray, eps_u: float, sigma_u: float,
+                      w: float | np.ndarray) -> np.ndarray:
+    """
+    Flow curve of Ling beyond uniform strain, w*linear + (1-w)*power law,
+    between the tangent at Rm and the power law with n = eps_u. Both bounds
+    satisfy the Considere condition at Rm.
+    """
+    return sigma_u*(w*(1 + true_strain - eps_u) + (1-w)*(true_strain/eps_u)**eps_u)
+
+
+def _neck_load(eng_strain: np.ndarray, w: float | np.ndarray, neck_length: float | np.ndarray,
+               e_u: float, sigma_u: float) -> np.ndarray:
+    """
+    Engineering stress (load per initial area) of a neck with the given
+    relative length and a weighted average flow curve.
+    """
+    eps_u = log(1+e_u)
+    true_strain = _neck_strain(eng_strain, e_u, neck_length)
+
+    return (_weighted_average(true_strain, eps_u, sigma_u, w)*np.exp(-true_strain)
+            * _bridgman_factor(true_strain, eps_u))
+
+
+def comp_necking_correction(df: pd.DataFrame | SharedDataset, rp02_i: int, rm_i: int,
+                            rm: float, method: int, point_no: int = 50,
+                            trace: Trace | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Estimate the yield curve beyond uniform elongation from the engineering
+    data between Rm and fracture, which comp_true_stress_strain discards.
+    The necking region is resampled to point_no points equally spaced in
+    strain, so its weight in the fit does not depend on the sampling rate.
+
+    Without a cross-section measurement the strain in the neck is unknown.
+    The elongation beyond Rm is therefore assumed to localize in a neck of
+    unknown relative length. The neck length and the weight w of Ling's
+    weighted average flow curve are fitted to the measured load drop,
+    taking the Bridgman correction of the neck into account. A coarse grid
+    of both parameters is evaluated in one vectorized pass over the necking
+    region and the best grid point is refined by least squares.
+
+    bridgman: the measured load is converted to the average true stress in
+    the neck and corrected for the triaxial stress state after Bridgman.
+    weighted_average: the fitted weighted average flow curve.
+    ...
+
+    Parameter
+    ---------
+    df: DataFrame | SharedDataset
+        dataframe or shared dataset containing the data
+    rp02_i: int
+        index of the datapoint for rp02
+    rm_i: int
+        index of the datapoint for rm
+    rm: float
+        Rm as returned by comp_material_data, used to detect the fracture
+    method: int
+        0 = none, 1 = Bridgman, 2 = weighted average
+    point_no: int, default = 50
+        number of points of the necking region
+    trace: Trace | None, default = None
+        trace recording timing information of the stage
+
+    Returns
+    -------
+    _: tuple[ndarray, ndarray]
+        0 = plastic strain of the necking region [ndarray]
+        1 = corrected true stress [ndarray]
+        both are empty for method 0 or if the data ends at Rm
+    """
+    df = _as_frame(df)
+
+    with trace_stage(trace, f"comp_necking_correction[{_NECKING_NAMES[method]}]",
+                     point_no=len(df)) as record:
+        eng_strain = df["eng_strain"].to_numpy(dtype=np.float64)
+        eng_stress = df["eng_stress"].to_numpy(dtype=np.float64)
+
+        end_i = _fracture_index(eng_stress, rm_i, rm) + 1
+
+        # noisy strain is made monotonic by its running maximum for the resampling
+        strain = np.fmax.accumulate(eng_strain[rm_i:end_i])
+        stress = eng_stress[rm_i:end_i]
+
+        if method == 0 or len(strain) < 2 or not strain[-1] > strain[0] > 0:
+            record["necking_point_no"] = 0
+            return np.empty(0), np.empty(0)
+
+        eng_grid = np.linspace(strain[0], strain[-1], point_no+1)[1:]
+        eng_grid_stress = np.interp(eng_grid, strain, stress)
+
+        e_u = float(strain[0])
+        sigma_u = float(stress[0])*(1+e_u)
+
+        # coarse grid of weight and relative neck length, evaluated at once
+        weights = np.linspace(0, 1, 11)[:, None, None]
+        neck_lengths = np.geomspace(1e-3, 1, 31)[None, :, None]
+        residual = np.mean((_neck_load(eng_grid, weights, neck_lengths, e_u, sigma_u)
+                            - eng_grid_stress)**2, axis=2)
+        i, j = np.unravel_index(np.argmin(residual), residual.shape)
+        parameter = [weights[i, 0, 0], neck_lengths[0, j, 0]]
+
+        try:
+            parameter = curve_fit(
+                lambda x, w, neck_length: _neck_load(x, w, neck_length, e_u, sigma_u),
+                eng_grid, eng_grid_stress, parameter, bounds=([0, 1e-3], [1, 1]))[0]
+        except (RuntimeError, ValueError):
+            pass
+
+        w, neck_length = float(parameter[0]), float(parameter[1])
+        record["weight"] = w
+        record["neck_length"] = neck_length
+
+        true_strain = _neck_strain(eng_grid, e_u, neck_length)
+        eps_u = log(1+e_u)
+
+        if method == 1:
+            true_stress = (eng_grid_stress*np.exp(true_strain)
+                           / _bridgman_factor(true_strain, eps_u))
+        else:
+            true_stress = _weighted_average(true_strain, eps_u, sigma_u, w)
+
+        record["necking_point_no"] = point_no
+
+        return true_strain - log(1+eng_strain[rp02_i]), true_stress
 
 
 def extrapolate(data: list, extrap_type: int, end: int = 1,
-                resolution: int = 100) -> list[pd.Series | list[float]]:
+                resolution: int = 100, trace: Trace | None = None,
+                initial_guess: list[float] | None = None, maxfev: int = 2000,
+                timeout: float = 5.0,
+                necking: tuple[np.ndarray, np.ndarray] | None = None
+                ) -> list[pd.Series | list[float] | dict]:
     """
     Fit and extrapolate curve with selected fitting type.
+    The fits are bounded to physically sensible parameters and limited by
+    an iteration and wall-clock budget. If a fit does not converge, the
+    fallback sequence warm start, default initial guess, linearized
+    estimate and (for Swift-Voce) simpler law is followed.
     ...
 
     Parameter
     ---------
     data: list
         list containg necessary user_input data
-        0 = dataframe with data to be fitted
+        0 = dataframe or shared dataset with data to be fitted
         1 = index of start point for data fitting (index of Rp_02)
         2 = index of end point for data fitting (index of Rm)
     extrap_type: int
@@ -227,6 +1239,17 @@ def extrapolate(data: list, extrap_type: int, end: int = 1,
         integer indicating upto what strain the curve shall be extraploated 
     resolution: int, default = 100
         integer indicating the number of datapoints to be returned
+    trace: Trace | None, default = None
+        trace recording timing information of the stage
+    initial_guess: list[float] | None, default = None
+        parameters used as warm start before the default initial guess
+    maxfev: int, default = 2000
+        maximum number of function evaluations per fit attempt
+    timeout: float, default = 5.0
+        wall-clock budget per law [s]
+    necking: tuple[ndarray, ndarray] | None, default = None
+        plastic strain and true stress beyond Rm as returned by
+        comp_necking_correction, fitted together with the data of the window
 
     Returns
     -------
@@ -235,102 +1258,296 @@ def extrapolate(data: list, extrap_type: int, end: int = 1,
         0 = strain values [Series]
         1 = stress values [Series]
         2 = parameter [list[float]]
+        3 = status [dict]
+            law = name of the fitted law [str]
+            method = initial guess of the converged fit or fallback used:
+                     "warm_start", "initial_guess", "linearized",
+                     "linearized_estimate" (not fitted) or "simpler_law" [str]
+            success = whether the curve is based on converged fits [bool]
+            nfev = number of function evaluations of all attempts [int]
+            time = wall time of the fit [float]
+            attempts = failed and converged attempts (single laws) [list[dict]]
+            components = status of the Swift and Voce fit (Swift-Voce) [list[dict]]
+            necking_point_no = number of fitted points beyond Rm [int]
 
+    Raises
+    ------
+    FitError
+        if not even the linearized estimate can be computed
     """
 
-    df = data[0]
-    start_index = data[1]
-    end_index = data[2]
+    with trace_stage(trace, f"extrapolate[{_EXTRAP_NAMES[extrap_type]}]") as record:
+        df = _as_frame(data[0])
+        start_index = data[1]
+        end_index = data[2]
 
-    if end == 1:
-        extrap_strain = pd.Series(np.linspace(0, end, resolution+1))
-    else:
-        extrap_strain = pd.Series(
-            np.linspace(0, df["plst_strain"][end-1], resolution))
+        if necking is None:
+            necking = (np.empty(0), np.empty(0))
 
-    if extrap_type == 0:
-        # Swift extrapolation
-        ag = data[3]
-        rm = data[4]
+        record["fit_point_no"] = len(df["plst_strain"][start_index:end_index])+len(necking[0])
 
-        n_0 = log(ag+1)
-        c_0 = rm*(e/n_0)**n_0
-        phi_0 = 0.1
+        if end == 1:
+            extrap_strain = pd.Series(np.linspace(0, end, resolution+1))
+        else:
+            extrap_strain = pd.Series(
+                np.linspace(0, df["plst_strain"][end-1], resolution))
+
+        fit_strain = df["plst_strain"][start_index:end_index].to_numpy(dtype=np.float64)
+        fit_stress = df["plst_stress"][start_index:end_index].to_numpy(dtype=np.float64)
+        fit_strain = np.concatenate((fit_strain, necking[0]))
+        fit_stress = np.concatenate((fit_stress, necking[1]))
+
+        initial_guesses = []
+        if initial_guess is not None and extrap_type != 2:
+            initial_guesses.append(("warm_start", list(initial_guess)))
+
+        if extrap_type == 0:
+            # Swift extrapolation
+            ag = data[3]
+            rm = data[4]
+
+            n_0 = log(ag+1)
+            c_0 = rm*(e/n_0)**n_0
+            phi_0 = 0.1
+
+            initial_guesses.append(("initial_guess", [c_0, phi_0, n_0]))
+
+            parameter, status = _fit_law(0, fit_strain, fit_stress, initial_guesses,
+                                         maxfev, timeout)
+
+            extrap_stress = _swift_extrapolation(
+                extrap_strain, parameter[0], parameter[1], parameter[2])
+
+        elif extrap_type == 1:
+            # Voce
+            sigma_0 = df["plst_stress"][start_index]
+            R_0 = df["plst_stress"].max()-sigma_0
+
+            eps_50 = df["plst_strain"][abs(
+                df["plst_stress"]-(sigma_0+0.5*R_0)).argmin()]
+            B_0 = 1/eps_50
+
+            initial_guesses.append(("initial_guess", [sigma_0, R_0, B_0]))
+
+            parameter, status = _fit_law(1, fit_strain, fit_stress, initial_guesses,
+                                         maxfev, timeout)
+
+            extrap_stress = _voce_extrapolation(
+                extrap_strain, parameter[0], parameter[1], parameter[2])
+
+        elif extrap_type == 2:
+            # Combined Swift Voce
+            swift_guess = voce_guess = None
+            if initial_guess is not None:
+                swift_guess, voce_guess = initial_guess[1:4], initial_guess[4:7]
+
+            # Get swift and Voce curves with respective parameter
+            _, swift_stress, swift_parameter, swift_status = extrapolate(
+                data, 0, end_index, end_index-start_index, trace, swift_guess, maxfev, timeout,
+                necking)
+            _, voce_stress, voce_parameter, voce_status = extrapolate(
+                data, 1, end_index, end_index-start_index, trace, voce_guess, maxfev, timeout,
+                necking)
+
+            # The numerator quantifies how well the difference between the Swift and Voce models
+            # (Swift - Voce) aligns with the residuals of the Voce model (measured - Voce).
+            # A larger numerator indicates that the Swift model improves upon the Voce model
+            # in regions where the Voce model deviates from the measured data.
+            numerator = np.sum((df["plst_stress"][start_index:end_index].values-voce_stress.values)
+                               * (swift_stress-voce_stress))
+
+            # The denominator represents the magnitude of the difference between the Swift
+            # and Voce models (Swift - Voce) across the overlapping region. It normalizes
+            # the calculation of the weighing factor (alpha) to ensure that the weighting
+            # accounts for how distinct the two models are from each other.
+            denominator = np.sum((swift_stress-voce_stress)**2)
+
+            method = "combined"
+            if swift_status["success"] != voce_status["success"]:
+                # Only one of the laws could be fitted, fall back to that law
+                alpha = 1.0 if swift_status["success"] else 0.0
+                method = "simpler_law"
+            elif denominator < 0.0001:
+                alpha = 0.5
+            elif abs(numerator)/denominator > 10:
+                alpha = 0.5
+            else:
+                alpha = np.clip(abs(numerator)/denominator, 0, 1)
+
+            parameter = [alpha]
+            parameter.extend(swift_parameter)
+            parameter.extend(voce_parameter)
+
+            status = {"law": _EXTRAP_NAMES[2], "method": method,
+                      "success": swift_status["success"] or voce_status["success"],
+                      "nfev": swift_status["nfev"] + voce_status["nfev"],
+                      "time": swift_status["time"] + voce_status["time"],
+                      "components": [swift_status, voce_status]}
+
+            extrap_stress = _swift_voce_extrapolation(
+                extrap_strain, parameter[0], parameter[1], parameter[2], parameter[3],
+                parameter[4], parameter[5], parameter[6])
+
+        status["necking_point_no"] = len(necking[0])
+
+        record["nfev"] = status["nfev"]
+        record["fit_method"] = status["method"]
+
+        result = [extrap_strain, extrap_stress, parameter, status]
+        return result
+
+
+def refit_curve(strain: np.ndarray, stress: np.ndarray, extrap_type: int,
+                fit_end: float | None = None, resolution: int = 100,
+                initial_guess: list[float] | None = None, maxfev: int = 2000,
+                timeout: float = 5.0) -> list[pd.Series | list[float] | dict]:
+    """
+    Fit a hardening law to an existing yield curve, e.g. of a legacy material
+    card, so it can be compared to a fit of new test data with the same law
+    and fit window.
+    ...
 
-        initial_guess = [c_0, phi_0, n_0]
+    Parameter
+    ---------
+    strain: ndarray
+        plastic strain of the yield curve
+    stress: ndarray
+        yield stress of the yield curve
+    extrap_type: int
+        0 = Swift, 1 = Voce, 2 = Swift-Voce
+    fit_end: float | None, default = None
+        plastic strain up to which the curve is fitted, e.g. the uniform
+        strain of the new test data. Defaults to the whole curve.
+    resolution: int, default = 100
+        integer indicating the number of datapoints to be returned
+    initial_guess: list[float] | None, default = None
+        parameters used as warm start, e.g. of the fit of the new test data
+    maxfev: int, default = 2000
+        maximum number of function evaluations per fit attempt
+    timeout: float, default = 5.0
+        wall-clock budget per law [s]
 
-        res = curve_fit(_swift_extrapolation, df["plst_strain"][start_index:end_index],
-                        df["plst_stress"][start_index:end_index], initial_guess)
+    Returns
+    -------
+    _: list
+        same structure as returned by extrapolate
 
-        parameter = res[0]
+    Raises
+    ------
+    FitError
+        if less than three points are within the fit window or the law
+        could not be fitted
+    """
+    strain = np.asarray(strain, dtype=np.float64)
+    stress = np.asarray(stress, dtype=np.float64)
 
-        extrap_stress = _swift_extrapolation(
-            extrap_strain, parameter[0], parameter[1], parameter[2])
+    mask = np.isfinite(strain) & np.isfinite(stress)
+    if fit_end is not None:
+        mask &= strain <= fit_end
+    if mask.sum() < 3:
+        raise FitError(_EXTRAP_NAMES[extrap_type], "less than three points to fit.")
 
-    elif extrap_type == 1:
-        # Voce
-        sigma_0 = df["plst_stress"][start_index]
-        R_0 = df["plst_stress"].max()-sigma_0
+    df = pd.DataFrame({"plst_strain": strain[mask], "plst_stress": stress[mask]})
 
-        eps_50 = df["plst_strain"][abs(
-            df["plst_stress"]-(sigma_0+0.5*R_0)).argmin()]
-        B_0 = 1/eps_50
+    # engineering uniform strain and tensile strength of the curve end for
+    # the initial guess of the Swift law (Considere: n = true uniform strain)
+    eps_u = df["plst_strain"].iloc[-1]
+    ag = exp(eps_u) - 1
+    rm = df["plst_stress"].iloc[-1]*exp(-eps_u)
 
-        initial_guess = [sigma_0, R_0, B_0]
+    return extrapolate([df, 0, len(df), ag, rm], extrap_type, resolution=resolution,
+                       initial_guess=initial_guess, maxfev=maxfev, timeout=timeout)
 
-        res = curve_fit(_voce_extrapolation, df["plst_strain"][start_index:end_index],
-                        df["plst_stress"][start_index:end_index], initial_guess)
 
-        parameter = res[0]
+def eval_extrapolation(parameter: list[float], extrap_type: int,
+                       resolution: int = 100, end: float = 1) -> list[pd.Series | list[float]]:
+    """
+    Evaluate an extrapolated curve from already fitted parameters.
+    ...
 
-        extrap_stress = _voce_extrapolation(
-            extrap_strain, parameter[0], parameter[1], parameter[2])
+    Parameter
+    ---------
+    parameter: list[float]
+        fitted parameters as returned by extrapolate
+    extrap_type: int
+        integer indicating the fitting type of the parameters
+        0 = Swift
+        1 = Voce
+        2 = Swift-Voce
+    resolution: int, default = 100
+        integer indicating the number of datapoints to be returned
+    end: float, default = 1 (=100%)
+        plastic strain upto which the curve is evaluated
+
+    Returns
+    -------
+    _: list
+        same structure as returned by extrapolate
+        0 = strain values [Series]
+        1 = stress values [Series]
+        2 = parameter [list[float]]
+        3 = status [dict], method "evaluated" without function evaluations
+    """
+    extrap_strain = pd.Series(np.linspace(0, end, resolution+1))
 
+    if extrap_type == 0:
+        extrap_stress = _swift_extrapolation(extrap_strain, *parameter)
+    elif extrap_type == 1:
+        extrap_stress = _voce_extrapolation(extrap_strain, *parameter)
     elif extrap_type == 2:
-        # Combined Swift Voce
-
-        # Get swift and Voce curves with respective parameter
-        _, swift_stress, swift_parameter = extrapolate(
-            data, 0, end_index, end_index-start_index)
-        _, voce_stress, voce_parameter = extrapolate(
-            data, 1, end_index, end_index-start_index)
-
-        # The numerator quantifies how well the difference between the Swift and Voce models
-        # (Swift - Voce) aligns with the residuals of the Voce model (measured - Voce).
-        # A larger numerator indicates that the Swift model improves upon the Voce model
-        # in regions where the Voce model deviates from the measured data.
-        numerator = np.sum((df["plst_stress"][start_index:end_index].values-voce_stress.values)
-                           * (swift_stress-voce_stress))
-
-        # The denominator represents the magnitude of the difference between the Swift
-        # and Voce models (Swift - Voce) across the overlapping region. It normalizes
-        # the calculation of the weighing factor (alpha) to ensure that the weighting
-        # accounts for how distinct the two models are from each other.
-        denominator = np.sum((swift_stress-voce_stress)**2)
-
-        if denominator < 0.0001:
-            alpha = 0.5
-        elif abs(numerator)/denominator > 10:
-            alpha = 0.5
-        else:
-            alpha = np.clip(abs(numerator)/denominator, 0, 1)
+        extrap_stress = _swift_voce_extrapolation(extrap_strain, *parameter)
+
+    status = {"law": _EXTRAP_NAMES[extrap_type], "method": "evaluated", "success": True,
+              "nfev": 0, "time": 0.0}
+
+    return [extrap_strain, extrap_stress, list(parameter), status]
+
 
-        parameter = [alpha]
-        parameter.extend(swift_parameter)
-        parameter.extend(voce_parameter)
+def export_point_ids(point_no: int, spacing: str) -> list[int]:
+    """
+    Indices of the points of an extrapolated curve (101 points between 0 and
+    100 % plastic strain) to be exported.
+    ...
+
+    Parameter
+    ---------
+    point_no: int
+        number of datapoints to be exported
+    spacing: str
+        spacing type. "equi" for equidistant points, "uneven" for 60 % of
+        the points below 50 % plastic strain
+
+    Returns
+    -------
+    _: list[int]
+        sorted indices of the points
+    """
+    if spacing == "equi":
+        ids = np.round(np.linspace(0, 100, point_no+1)).astype(int)
+
+    else:
+        point_no_1 = round(point_no*0.6)
+        point_no_2 = point_no - point_no_1
 
-        extrap_stress = _swift_voce_extrapolation(
-            extrap_strain, parameter[0], parameter[1], parameter[2], parameter[3],
-            parameter[4], parameter[5], parameter[6])
+        ids_1 = np.linspace(0, 50, point_no_1)
+        ids_1 = np.round(ids_1).astype(int)
+        ids = set(ids_1)
 
-    result = [extrap_strain, extrap_stress, parameter]
-    return result
+        ids_2 = np.linspace(51, 100, point_no_2)
+        ids_2 = np.round(ids_2).astype(int)
+
+        ids.update(ids_2)
+
+    return sorted(ids)
 
 
 def export_data(user_input: list[str], fitted_data: list[list], E: float, path_str: str,
-                template_path_str: str) -> Path:
+                template_path_str: str, trace: Trace | None = None,
+                incremental: bool = True, formats: list[str] | None = None) -> Path:
     """
-    Prepate fitted and extrapolated data for export to .k-file.
+    Prepate fitted and extrapolated data for export to .k-file. The points
+    are sampled and formatted once, additional targets (see
+    cf_writers.FORMATS) are written next to the .k-file from the same points.
     ...
 
     Parameter
@@ -355,65 +1572,60 @@ def export_data(user_input: list[str], fitted_data: list[list], E: float, path_s
         string indicating the path to which the file shall be exported
     template_path_str: str
         string pointing to the template path
+    trace: Trace | None, default = None
+        trace recording timing information of the stage
+    incremental: bool, default = True
+        merge the cards into the existing file, see write_to_file
+    formats: list[str] | None, default = None
+        additional export targets, see cf_writers.FORMATS
 
     Returns:
     _: Path
         path to which the file was saved.
     """
 
-    if int(user_input[5]) > 100 or int(user_input[5]) < 2:
-        raise ExportPointNoError from None
-    else:
-        export_data: dict = {}
-        export_data["Title"] = user_input[0]
-        export_data["mid"] = user_input[1].rjust(10)
-        export_data["ro"] = user_input[2].rjust(10)
-        export_data["E"] = str(round(E, 2)).rjust(10)
-        export_data["pr"] = user_input[3].rjust(10)
-        export_data["fail"] = user_input[4].rjust(10)
-
-        if user_input[7] == "equi" or user_input[5] == 100:
-            ids = np.linspace(0, 100, int(user_input[5])+1)
-
+    with trace_stage(trace, "export_data", point_no=user_input[5]):
+        if int(user_input[5]) > 100 or int(user_input[5]) < 2:
+            raise ExportPointNoError from None
         else:
-            point_no_1 = round(int(user_input[5])*0.6)
-            point_no_2 = int(user_input[5]) - point_no_1
-
-            ids_1 = np.linspace(0, 50, point_no_1)
-            ids_1 = np.round(ids_1).astype(int)
-            ids = set(ids_1)
+            # unused point slots of the template are commented out
+            export_data: dict = dict(_EMPTY_POINTS)
+            export_data["Title"] = user_input[0]
+            export_data["mid"] = user_input[1].rjust(10)
+            export_data["ro"] = user_input[2].rjust(10)
+            export_data["E"] = fixed_width(E, 10)[0]
+            export_data["pr"] = user_input[3].rjust(10)
+            export_data["fail"] = user_input[4].rjust(10)
 
-            ids_2 = np.linspace(51, 100, point_no_2)
-            ids_2 = np.round(ids_2).astype(int)
+            ids = export_point_ids(int(user_input[5]), user_input[7])
+            strain = np.asarray(fitted_data[0], dtype=np.float64)[ids]
+            stress = np.asarray(fitted_data[1], dtype=np.float64)[ids]
 
-            ids.update(ids_2)
+            export_data.update(zip(_POINT_KEYS[0], fixed_width(strain, 20)))
+            export_data.update(zip(_POINT_KEYS[1], fixed_width(stress, 20)))
 
-        for j, i in enumerate(ids):
-            key_a = f"a{j}"
-            key_o = f"o{j}"
+            path: Path = write_to_file(export_data, path_str, template_path_str, incremental)
 
-            export_data[key_a] = str(round(fitted_data[0][i], 3)).rjust(20)
-            export_data[key_o] = str(round(fitted_data[1][i], 3)).rjust(20)
+            if formats:
+                material = {"title": user_input[0], "mid": user_input[1], "ro": user_input[2],
+                            "E": E, "pr": user_input[3], "fail": user_input[4]}
+                if len(fitted_data) > 3:
+                    material["law"] = fitted_data[3]["law"]
+                    material["parameter"] = fitted_data[2]
 
-        j += 1
+                write_targets(material, strain, stress, Path(path_str.replace("\"", "")),
+                              formats, incremental)
 
-        while j <= 101:
-            key_a = f"a{j}"
-            key_o = f"o{j}"
+            return path
 
-            export_data[key_a] = "$"
-            export_data[key_o] = "$"
 
-            j += 1
-
-        path: Path = write_to_file(export_data, path_str, template_path_str)
-
-        return path
-
-
-def write_to_file(data: dict[str, str], path_str: str, template_path_str: str) -> None:
+def write_to_file(data: dict[str, str], path_str: str, template_path_str: str,
+                  incremental: bool = True) -> None:
     """
-    Write data to be exported to file.
+    Write data to be exported to file. Incremental exports merge the cards
+    into the existing file, so a material library keeps its other materials
+    and only the blocks with the exported MID and LCIDs are rewritten if
+    their content changed.
     ...
 
     Parameter
@@ -424,6 +1636,8 @@ def write_to_file(data: dict[str, str], path_str: str, template_path_str: str) -
         string indicating the path to which the file shall be exported
     template_path_str: str
         string pointing to the template path
+    incremental: bool, default = True
+        merge the cards into the file instead of overwriting it
 
     Returns
     -------
@@ -433,6 +1647,8 @@ def write_to_file(data: dict[str, str], path_str: str, template_path_str: str) -
     ------
     FileError
     TemplateError
+    DuplicateIdError
+        if merged curve ids are used by other curves or tables of the file
 
     """
     template_path = Path(template_path_str)
@@ -442,11 +1658,16 @@ def write_to_file(data: dict[str, str], path_str: str, template_path_str: str) -
 
         if path.is_file():
 
-            with open(template_path, "r") as template, open(path, "w") as file:
+            with open(template_path, "r") as template:
                 mat_card_content: str = LsDynaTemplate(
                     template.read()).substitute(data)
 
-                file.writelines(mat_card_content)
+            if incremental:
+                update_library(path, [mat_card_content])
+
+            else:
+                with open(path, "w") as file:
+                    file.writelines(mat_card_content)
 
         else:
             raise FileError(path) from None
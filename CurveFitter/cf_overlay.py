@@ -0,0 +1,136 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+def decimate(x: np.ndarray, y: np.ndarray, max_points: int = 500) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a curve to about max_points points for plotting. The data points
+    are split into max_points/2 consecutive buckets, of which the points with
+    the lowest and highest y value are kept (min-max decimation), so peaks
+    like Rm or the fracture drop survive. The first and last point are always
+    kept.
+    ...
+
+    Parameter
+    ---------
+    x: ndarray
+        x values of the curve
+    y: ndarray
+        y values of the curve
+    max_points: int, default = 500
+        number of points the curve is reduced to
+
+    Returns
+    -------
+    _: tuple[ndarray, ndarray]
+        x and y values of the decimated curve
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    point_no = len(y)
+
+    bucket_no = max(max_points//2, 1)
+    if point_no <= max_points or point_no <= 2*bucket_no:
+        return x, y
+
+    size = -(-point_no//bucket_no)
+    padded = np.full(bucket_no*size, np.nan)
+    padded[:point_no] = y
+    buckets = padded.reshape(bucket_no, size)
+
+    finite = np.isfinite(buckets)
+    low = np.where(finite, buckets, np.inf).argmin(axis=1)
+    high = np.where(finite, buckets, -np.inf).argmax(axis=1)
+    start = np.arange(bucket_no)*size
+
+    # buckets only containing padding point past the end of the curve
+    index = np.unique(np.minimum(
+        np.concatenate(([0], start + low, start + high, [point_no - 1])), point_no - 1))
+
+    return x[index], y[index]
+
+
+class CurveIndex:
+    """
+    Spatial index of the points of many curves for finding the curve under
+    the mouse. The points are indexed in display coordinates (pixels), so
+    the search radius is independent of the axis scaling. The KD-tree is
+    rebuilt only when the transformation of the axes changed, e.g. after
+    zooming or resizing.
+    """
+
+    def __init__(self, segments: list[np.ndarray]) -> None:
+        """
+        CurveIndex init function.
+        ...
+
+        Parameter
+        ---------
+        segments: list[ndarray]
+            points (n x 2) of every curve in data coordinates
+
+        Returns
+        -------
+        None
+        """
+        lengths = [len(segment) for segment in segments]
+        points = np.concatenate(segments) if segments else np.empty((0, 2))
+        owners = np.repeat(np.arange(len(segments)), lengths)
+
+        finite = np.isfinite(points).all(axis=1)
+        self._points = points[finite]
+        self._owners = owners[finite]
+        self._tree: cKDTree | None = None
+        self._matrix: np.ndarray | None = None
+
+    def update(self, transform) -> None:
+        """
+        Rebuild the KD-tree if the transformation of the axes changed. The
+        unbalanced tree builds about twice as fast, queries are not slower.
+        ...
+
+        Parameter
+        ---------
+        transform: Transform
+            data to display transformation of the axes (axes.transData)
+
+        Returns
+        -------
+        None
+        """
+        matrix = transform.get_affine().get_matrix()
+        if self._tree is not None and np.array_equal(matrix, self._matrix):
+            return
+
+        self._tree = cKDTree(transform.transform(self._points), balanced_tree=False,
+                             compact_nodes=False)
+        self._matrix = matrix.copy()
+
+    def nearest(self, transform, x: float, y: float, radius: float = 5) -> int | None:
+        """
+        Curve with the point closest to the given display position.
+        ...
+
+        Parameter
+        ---------
+        transform: Transform
+            data to display transformation of the axes (axes.transData)
+        x: float
+            x position [px]
+        y: float
+            y position [px]
+        radius: float, default = 5
+            search radius [px]
+
+        Returns
+        -------
+        _: int | None
+            index of the curve, None if no point is within the radius
+        """
+        if len(self._points) == 0:
+            return None
+
+        self.update(transform)
+        distance, i = self._tree.query((x, y), distance_upper_bound=radius)
+
+        return int(self._owners[i]) if np.isfinite(distance) else None
@@ -0,0 +1,297 @@
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.collections import LineCollection
+from matplotlib.backends.backend_qt5agg import \
+    FigureCanvasQTAgg as FigureCanvas
+from PyQt5.QtWidgets import (QDialog, QDialogButtonBox, QLabel, QComboBox,
+                             QVBoxLayout, QHBoxLayout, QSizePolicy)
+from PyQt5.QtGui import QFont
+
+from cf_overlay import decimate, CurveIndex
+
+
+class OverlayDialog(QDialog):
+    """
+    Dialog window overlaying many curves, e.g. of a test series, of the fits
+    stored in the database or of existing material cards. All curves are
+    drawn as one LineCollection and coloured by a selectable property, the
+    curve under the mouse is highlighted by blitting.
+    """
+
+    def __init__(self, parent=None) -> None:
+        """
+        Overlay Dialogs init function.
+        ...
+
+        Parameter
+        ---------
+        parent: QWidget
+            parent widget of the dialog, defaults to None.
+
+        Return
+        ------
+        None
+        """
+        super().__init__(parent)
+
+        self._segments: list[np.ndarray] = []
+        self._labels: list[str] = []
+        self._properties: dict[str, np.ndarray] = {}
+        self._collection: LineCollection | None = None
+        self._index: CurveIndex | None = None
+        self._hovered: int | None = None
+        self._background = None
+
+        self.setWindowTitle("Overlay View")
+        self.resize(1000, 600)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self._create_fonts()
+        self._create_lbls()
+        self._create_cmbs()
+        self._create_btns()
+        self._create_graph()
+        self._layout = QVBoxLayout()
+        self._layout_ctrl = QHBoxLayout()
+        self.setLayout(self._layout)
+
+        self._layout_ctrl.addWidget(self._lbl_source)
+        self._layout_ctrl.addWidget(self.cmb_source)
+        self._layout_ctrl.addWidget(self._lbl_color)
+        self._layout_ctrl.addWidget(self.cmb_color)
+        self._layout_ctrl.addStretch()
+        self._layout.addLayout(self._layout_ctrl)
+        self._layout.addWidget(self._graph)
+        self._layout.addWidget(self.lbl_info)
+        self._layout.addWidget(self.btnbx)
+
+        self.cmb_color.currentIndexChanged.connect(self._color_curves)
+        self._graph.mpl_connect("draw_event", self._update_background)
+        self._graph.mpl_connect("motion_notify_event", self._hover)
+
+    def _create_btns(self) -> None:
+        """
+        Create the buttons for the dialog.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Return
+        ------
+        None
+        """
+        self.btnbx = QDialogButtonBox(QDialogButtonBox.Close)
+
+    def _create_lbls(self) -> None:
+        """
+        Create the labels necessary for the dialog.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self._lbl_source = QLabel("Curves")
+        self._lbl_source.setFont(self._font)
+
+        self._lbl_color = QLabel("Colour by")
+        self._lbl_color.setFont(self._font)
+
+        self.lbl_info = QLabel()
+        self.lbl_info.setFont(self._font)
+
+    def _create_cmbs(self) -> None:
+        """
+        Create the comboboxes necessary for the dialog.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self.cmb_source = QComboBox()
+        self.cmb_source.setFixedSize(250, 25)
+        self.cmb_source.setFont(self._font)
+        self.cmb_source.addItems(["Imported Specimens", "Database Fits",
+                                  "Material Cards (.k)"])
+
+        self.cmb_color = QComboBox()
+        self.cmb_color.setFixedSize(200, 25)
+        self.cmb_color.setFont(self._font)
+
+    def _create_graph(self) -> None:
+        """
+        Create the graph for the curves.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self._graph = FigureCanvas(Figure())
+        self._graph.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+        self._axes = self._graph.figure.subplots()
+        self._colorbar = None
+
+    def _create_fonts(self) -> None:
+        """
+        Create the fonts necessary for the dialog.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self._font = QFont("Calibri", 12)
+
+    def show_curves(self, curves: list[tuple[np.ndarray, np.ndarray]], labels: list[str],
+                    properties: dict[str, np.ndarray], x_label: str, y_label: str,
+                    max_points: int = 500) -> None:
+        """
+        Plot the curves. Every curve is decimated to max_points points before
+        it is added to the collection and the spatial index.
+        ...
+
+        Parameter
+        ---------
+        curves: list[tuple[ndarray, ndarray]]
+            x and y values per curve
+        labels: list[str]
+            name per curve
+        properties: dict[str, ndarray]
+            properties the curves can be coloured by, one value per curve
+        x_label: str
+            label of the x axis
+        y_label: str
+            label of the y axis
+        max_points: int, default = 500
+            number of points every curve is reduced to
+
+        Returns
+        -------
+        None
+        """
+        if self._colorbar is not None:
+            self._colorbar.remove()
+            self._colorbar = None
+        self._axes.cla()
+
+        self._segments = [np.column_stack(decimate(x, y, max_points)) for x, y in curves]
+        self._labels = labels
+        self._properties = {name: np.asarray(values, dtype=np.float64)
+                            for name, values in properties.items()}
+        self._hovered = None
+
+        self._collection = LineCollection(self._segments, linewidths=0.8, cmap="viridis")
+        self._axes.add_collection(self._collection)
+        self._axes.autoscale_view()
+        self._axes.set_xlabel(x_label)
+        self._axes.set_ylabel(y_label)
+        self._axes.grid(True)
+        self._index = CurveIndex(self._segments)
+
+        self._highlight = self._axes.plot([], [], color="black", linewidth=2.5,
+                                          animated=True)[0]
+        self._annotation = self._axes.annotate(
+            "", (0, 0), xytext=(10, 10), textcoords="offset points", animated=True,
+            bbox={"boxstyle": "round", "facecolor": "white", "alpha": 0.9})
+
+        point_no = sum(len(segment) for segment in self._segments)
+        self.lbl_info.setText(f"{len(self._segments)} curves, {point_no} points plotted.")
+
+        self.cmb_color.blockSignals(True)
+        self.cmb_color.clear()
+        self.cmb_color.addItems(["None"] + list(self._properties))
+        self.cmb_color.setCurrentIndex(1 if self._properties else 0)
+        self.cmb_color.blockSignals(False)
+
+        self._color_curves()
+
+    def _color_curves(self) -> None:
+        """
+        Colour the curves by the property selected in the combobox.
+        """
+        if self._collection is None:
+            return
+
+        if self._colorbar is not None:
+            self._colorbar.remove()
+            self._colorbar = None
+
+        name = self.cmb_color.currentText()
+        values = self._properties.get(name)
+
+        if values is not None and np.isfinite(values).any():
+            # reset the fixed colour of "None", otherwise the mapping is not shown
+            self._collection.set_edgecolor(None)
+            self._collection.set_array(np.ma.masked_invalid(values))
+            self._collection.set_clim(np.nanmin(values), np.nanmax(values))
+            self._colorbar = self._graph.figure.colorbar(self._collection, ax=self._axes)
+            self._colorbar.set_label(name)
+        else:
+            self._collection.set_array(None)
+            self._collection.set_color("tab:blue")
+
+        self._graph.draw_idle()
+
+    def _update_background(self, _) -> None:
+        """
+        Cache the rendered figure after every full draw as background of the
+        highlight and update the spatial index if the axes were zoomed or
+        resized. The animated highlight is not part of full draws.
+        """
+        self._background = self._graph.copy_from_bbox(self._graph.figure.bbox)
+        self._hovered = None
+
+        if self._index is not None:
+            self._index.update(self._axes.transData)
+
+    def _hover(self, event) -> None:
+        """
+        Highlight the curve under the mouse. Only the highlight and its
+        annotation are drawn onto the cached background.
+        """
+        if self._index is None or self._background is None:
+            return
+
+        curve = None
+        if event.inaxes is self._axes:
+            curve = self._index.nearest(self._axes.transData, event.x, event.y)
+
+        if curve == self._hovered:
+            return
+        self._hovered = curve
+
+        self._graph.restore_region(self._background)
+
+        if curve is not None:
+            text = self._labels[curve]
+            name = self.cmb_color.currentText()
+            if name in self._properties:
+                text += f"\n{name}: {self._properties[name][curve]:.4g}"
+
+            self._highlight.set_data(self._segments[curve][:, 0], self._segments[curve][:, 1])
+            self._annotation.xy = (event.xdata, event.ydata)
+            self._annotation.set_text(text)
+            self._axes.draw_artist(self._highlight)
+            self._axes.draw_artist(self._annotation)
+
+        self._graph.blit(self._graph.figure.bbox)
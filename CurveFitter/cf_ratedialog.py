@@ -0,0 +1,273 @@
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import \
+    FigureCanvasQTAgg as FigureCanvas
+from PyQt5.QtWidgets import (QDialog, QPushButton, QDialogButtonBox, QLabel, QComboBox,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QVBoxLayout,
+                             QHBoxLayout, QSizePolicy)
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont
+
+
+class RateDialog(QDialog):
+    """
+    Dialog window to fit a family of tests at different strain rates and
+    export it as *DEFINE_TABLE.
+    """
+
+    def __init__(self, parent=None) -> None:
+        """
+        Rate Dialogs init function.
+        ...
+
+        Parameter
+        ---------
+        parent: QWidget
+            parent widget of the dialog, defaults to None.
+
+        Return
+        ------
+        None
+        """
+        super().__init__(parent)
+
+        self.setWindowTitle("Strain Rate Family")
+        self.resize(1000, 600)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self._create_fonts()
+        self._create_lbls()
+        self._create_cmbs()
+        self._create_btns()
+        self._create_table()
+        self._create_graph()
+        self._layout = QHBoxLayout()
+        self._layout_ctrl = QVBoxLayout()
+        self._layout_files = QHBoxLayout()
+        self._layout_graph = QVBoxLayout()
+        self.setLayout(self._layout)
+
+        self._layout_files.addWidget(self.btn_add)
+        self._layout_files.addWidget(self.btn_remove)
+        self._layout_ctrl.addLayout(self._layout_files)
+        self._layout_ctrl.addWidget(self.table)
+        self._layout_ctrl.addWidget(self._lbl_law)
+        self._layout_ctrl.addWidget(self.cmb_law)
+        self._layout_ctrl.addWidget(self._lbl_rate_law)
+        self._layout_ctrl.addWidget(self.cmb_rate_law)
+        self._layout_ctrl.addWidget(self.btn_fit)
+        self._layout_ctrl.addWidget(self.lbl_result)
+        self._layout_ctrl.addStretch()
+        self._layout_ctrl.addWidget(self.btn_export)
+        self._layout_graph.addWidget(self._graph)
+        self._layout_graph.addWidget(self.btnbx)
+        self._layout.addLayout(self._layout_ctrl, 2)
+        self._layout.addLayout(self._layout_graph, 3)
+
+    def _create_btns(self) -> None:
+        """
+        Create the buttons for the dialog.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Return
+        ------
+        None
+        """
+        self.btnbx = QDialogButtonBox(QDialogButtonBox.Close)
+
+        self.btn_add = QPushButton("Add Files...")
+        self.btn_add.setFont(self._font)
+
+        self.btn_remove = QPushButton("Remove")
+        self.btn_remove.setFont(self._font)
+
+        self.btn_fit = QPushButton("Fit Family")
+        self.btn_fit.setFont(self._font)
+
+        self.btn_export = QPushButton("Export Table...")
+        self.btn_export.setFont(self._font)
+        self.btn_export.setEnabled(False)
+
+    def _create_lbls(self) -> None:
+        """
+        Create the labels necessary for the dialog.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self._lbl_law = QLabel("Hardening Law")
+        self._lbl_law.setFont(self._font)
+
+        self._lbl_rate_law = QLabel("Rate Law")
+        self._lbl_rate_law.setFont(self._font)
+
+        self.lbl_result = QLabel("")
+        self.lbl_result.setFont(self._font)
+        self.lbl_result.setWordWrap(True)
+
+    def _create_cmbs(self) -> None:
+        """
+        Create the comboboxes necessary for the dialog.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self.cmb_law = QComboBox()
+        self.cmb_law.setFont(self._font)
+        self.cmb_law.addItems(["Swift", "Voce"])
+
+        self.cmb_rate_law = QComboBox()
+        self.cmb_rate_law.setFont(self._font)
+        self.cmb_rate_law.addItems(["Cowper-Symonds", "Johnson-Cook"])
+
+    def _create_table(self) -> None:
+        """
+        Create the table listing the files and their strain rates.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self.table = QTableWidget(0, 2)
+        self.table.setFont(self._font)
+        self.table.setHorizontalHeaderLabels(["File", "Strain Rate [1/s]"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
+
+    def _create_graph(self) -> None:
+        """
+        Create the graph for the measured and fitted curves.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self._graph = FigureCanvas(Figure())
+        self._graph.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self._axes = self._graph.figure.subplots()
+
+    def _create_fonts(self) -> None:
+        """
+        Create the fonts necessary for the dialog.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self._font = QFont("Calibri", 12)
+
+    def add_file(self, path_str: str, rate: float | None) -> None:
+        """
+        Add a file to the table.
+        ...
+
+        Parameter
+        ---------
+        path_str: str
+            path of the file
+        rate: float | None
+            strain rate of the test, None if unknown
+
+        Returns
+        -------
+        None
+        """
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+
+        item = QTableWidgetItem(path_str)
+        item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+        self.table.setItem(row, 0, item)
+        self.table.setItem(row, 1, QTableWidgetItem("" if rate is None else f"{rate:g}"))
+
+    def remove_selected(self) -> None:
+        """
+        Remove the selected files from the table.
+        """
+        for row in sorted({index.row() for index in self.table.selectedIndexes()},
+                          reverse=True):
+            self.table.removeRow(row)
+
+    def files(self) -> list[tuple[str, str]]:
+        """
+        Files and strain rates entered in the table.
+        ...
+
+        Returns
+        -------
+        _: list[tuple[str, str]]
+            path and strain rate text of every row
+        """
+        return [(self.table.item(row, 0).text(),
+                 self.table.item(row, 1).text() if self.table.item(row, 1) else "")
+                for row in range(self.table.rowCount())]
+
+    def show_result(self, curves: list[tuple[np.ndarray, np.ndarray]], rates: list[float],
+                    strain: np.ndarray, stress: np.ndarray, text: str) -> None:
+        """
+        Plot the measured curves and the fitted family.
+        ...
+
+        Parameter
+        ---------
+        curves: list[tuple[ndarray, ndarray]]
+            plastic strain and true stress of the measured curves
+        rates: list[float]
+            strain rates of the curves
+        strain: ndarray
+            plastic strain of the fitted curves
+        stress: ndarray
+            stress of the fitted curves, one row per strain rate
+        text: str
+            text describing the fitted parameters
+
+        Returns
+        -------
+        None
+        """
+        self._axes.cla()
+
+        for i, ((curve_strain, curve_stress), rate) in enumerate(zip(curves, rates)):
+            self._axes.plot(curve_strain, curve_stress, ".", markersize=2, color=f"C{i}",
+                            label=f"{rate:g} 1/s")
+            self._axes.plot(strain, stress[i], "-", color=f"C{i}")
+
+        self._axes.set_xlabel("Plastic Strain [-]")
+        self._axes.set_ylabel("True Stress [MPa]")
+        self._axes.grid(True)
+        self._axes.legend()
+        self._graph.figure.tight_layout()
+        self._graph.draw_idle()
+
+        self.lbl_result.setText(text)
+        self.btn_export.setEnabled(True)
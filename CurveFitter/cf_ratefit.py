@@ -0,0 +1,353 @@
+import re
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import least_squares
+
+import cf_model
+from cf_dataset import SharedDataset
+from cf_errors import ExportPointNoError, FitError
+from cf_writers import fixed_width
+from cf_library import TABLE_CURVE_START, table_curve_ids
+from cf_trace import Trace, trace_stage
+
+
+_BASE_NAMES = {0: "swift", 1: "voce"}
+
+_RATE_NAMES = {0: "cowper_symonds", 1: "johnson_cook"}
+
+# Parameter bounds of the quasi-static hardening laws and the rate laws
+# Swift: c > 0, 0 <= phi <= 1, 0 < n < 1
+# Voce: sigma >= 0, R > 0, B > 0
+# Cowper-Symonds: C > 0, P > 0
+# Johnson-Cook: C >= 0
+_BASE_BOUNDS = {0: ([1e-6, 0.0, 1e-6], [np.inf, 1.0, 1-1e-6]),
+                1: ([0.0, 1e-6, 1e-6], [np.inf, np.inf, np.inf])}
+_RATE_BOUNDS = {0: ([1e-6, 0.1], [np.inf, 50.0]),
+                1: ([0.0], [10.0])}
+
+# Strain rate in file names, e.g. "DP600_0.1s-1.csv" or "DP600_100ps.csv"
+_RATE_PATTERN = re.compile(r"(\d+(?:[.,]\d+)?(?:e[-+]?\d+)?)\s*(?:s-1|ps)(?![a-z])", re.I)
+
+
+def _base_stress(strain: np.ndarray, law: int, parameter: np.ndarray) -> np.ndarray:
+    """
+    Quasi-static flow stress of the hardening law.
+    """
+    if law == 0:
+        c, phi, n = parameter
+        return c*(phi+strain)**n
+
+    sigma, R, B = parameter
+    return sigma + R*(1-np.exp(-B*strain))
+
+
+def _rate_factor(rate: np.ndarray, rate_law: int, parameter: np.ndarray,
+                 reference_rate: float) -> np.ndarray:
+    """
+    Factor scaling the quasi-static flow stress to the given strain rates.
+    Cowper-Symonds: 1 + (rate/C)^(1/P)
+    Johnson-Cook: 1 + C*ln(rate/reference_rate), rates below the reference
+    rate are not scaled
+    """
+    if rate_law == 0:
+        C, P = parameter
+        return 1 + (rate/C)**(1/P)
+
+    return 1 + parameter[0]*np.log(np.maximum(rate/reference_rate, 1))
+
+
+def rate_from_name(name: str) -> float | None:
+    """
+    Read the strain rate from a file name, e.g. "DP600_0.1s-1.csv" or
+    "DP600_100ps.csv".
+    ...
+
+    Parameter
+    ---------
+    name: str
+        file name
+
+    Returns
+    -------
+    _: float | None
+        strain rate [1/s] or None if the name contains no strain rate
+    """
+    match = _RATE_PATTERN.search(Path(name).stem)
+    if match is None:
+        return None
+
+    return float(match.group(1).replace(",", "."))
+
+
+def _initial_rate_parameter(rate_law: int, rates: np.ndarray, ratios: np.ndarray,
+                            reference_rate: float) -> list[float]:
+    """
+    Estimate the rate law parameters from the mean ratio of the measured
+    stress to the quasi-static stress of every curve.
+    """
+    if rate_law == 0:
+        mask = ratios > 1.001
+        if np.count_nonzero(mask) >= 2:
+            # log(ratio-1) = 1/P*log(rate) - 1/P*log(C)
+            slope, intercept = np.polyfit(np.log(rates[mask]), np.log(ratios[mask]-1), 1)
+            if slope > 0:
+                P = 1/slope
+                return [float(np.exp(-intercept*P)), float(np.clip(P, 0.1, 50.0))]
+
+        # typical values of mild steel
+        return [40.4, 5.0]
+
+    log_rate = np.log(np.maximum(rates/reference_rate, 1))
+    if np.any(log_rate > 0):
+        return [float(max(np.sum((ratios-1)*log_rate)/np.sum(log_rate**2), 0.0))]
+
+    return [0.01]
+
+
+def fit_rate_family(curves: list[pd.DataFrame | SharedDataset],
+                    mat_chars: list[list[float | int]],
+                    rates: list[float], law: int = 0, rate_law: int = 0,
+                    maxfev: int = 2000, trace: Trace | None = None) -> dict:
+    """
+    Fit a family of tests at different strain rates together. All curves
+    share the parameters of the quasi-static hardening law, which is scaled
+    by the rate law:
+
+        stress(strain, rate) = base(strain) * rate_factor(rate)
+
+    The fit windows of all curves are concatenated once and the residual
+    is evaluated for all rates in one vectorized expression. Every curve is
+    weighted equally, independent of its number of data points.
+    ...
+
+    Parameter
+    ---------
+    curves: list[DataFrame | SharedDataset]
+        true stress - strain curves as returned by comp_true_stress_strain
+    mat_chars: list[list[float|int]]
+        material characteristics of every curve as returned by
+        comp_material_data. The fit windows range from Rp_02 to Rm.
+    rates: list[float]
+        strain rate of every curve [1/s]
+    law: int, default = 0
+        quasi-static hardening law (0 = Swift, 1 = Voce)
+    rate_law: int, default = 0
+        rate law (0 = Cowper-Symonds, 1 = Johnson-Cook)
+    maxfev: int, default = 2000
+        maximum number of function evaluations
+    trace: Trace | None, default = None
+        trace recording timing information of the stage
+
+    Returns
+    -------
+    _: dict
+        law = quasi-static hardening law [int]
+        rate_law = rate law [int]
+        parameter = parameters of the hardening law [list[float]]
+        rate_parameter = parameters of the rate law, (C, P) for
+                         Cowper-Symonds, (C,) for Johnson-Cook [list[float]]
+        reference_rate = lowest strain rate of the family [float]
+        rates = strain rates of the curves [list[float]]
+        rms = root mean square stress residual per curve [list[float]]
+        nfev = number of function evaluations [int]
+        success = whether the fit converged [bool]
+        time = wall time of the fit [float]
+
+    Raises
+    ------
+    ValueError
+        if fewer than two curves or non-positive rates are given
+    FitError
+        if the fit fails
+    """
+    rates_arr = np.asarray(rates, dtype=np.float64)
+    if len(curves) < 2 or len(curves) != len(mat_chars) or len(curves) != len(rates_arr):
+        raise ValueError("At least two curves with characteristics and strain rate are required.")
+    if np.any(rates_arr <= 0):
+        raise ValueError("Strain rates must be positive.")
+
+    with trace_stage(trace, f"fit_rate_family[{_BASE_NAMES[law]}, {_RATE_NAMES[rate_law]}]",
+                     curve_no=len(curves)) as record:
+        t_0 = perf_counter()
+
+        strain_parts, stress_parts = [], []
+        for curve, mat_char in zip(curves, mat_chars):
+            df = curve.frame() if isinstance(curve, SharedDataset) else curve
+            start, end = mat_char[3], mat_char[4]
+            strain_parts.append(df["plst_strain"][start:end].to_numpy(dtype=np.float64))
+            stress_parts.append(df["plst_stress"][start:end].to_numpy(dtype=np.float64))
+
+        lengths = np.array([len(part) for part in strain_parts])
+        if np.any(lengths < 3):
+            raise ValueError("Every fit window needs at least 3 data points.")
+
+        strain = np.concatenate(strain_parts)
+        stress = np.concatenate(stress_parts)
+        curve_i = np.repeat(np.arange(len(curves)), lengths)
+        rate = rates_arr[curve_i]
+        weight = 1/np.sqrt(lengths[curve_i])
+        reference_rate = float(rates_arr.min())
+        record["point_no"] = len(strain)
+
+        # The quasi-static parameters are initialised from a single fit of
+        # the curve with the lowest strain rate.
+        ref = int(np.argmin(rates_arr))
+        ref_char = mat_chars[ref]
+        base_0 = np.asarray(cf_model.extrapolate(
+            [curves[ref], ref_char[3], ref_char[4], ref_char[5], ref_char[2]], law,
+            maxfev=maxfev)[2], dtype=np.float64)
+
+        base_stress_0 = _base_stress(strain, law, base_0)
+        ratios = np.array([np.median(stress[curve_i == i]/base_stress_0[curve_i == i])
+                           for i in range(len(curves))]) / \
+            np.median(stress[curve_i == ref]/base_stress_0[curve_i == ref])
+        rate_0 = _initial_rate_parameter(rate_law, rates_arr, ratios, reference_rate)
+
+        if rate_law == 0:
+            # The reference curve is already scaled by the Cowper-Symonds
+            # factor, c (Swift) or sigma and R (Voce) are scaled back.
+            scale = 1/_rate_factor(np.array([reference_rate]), 0, np.asarray(rate_0),
+                                   reference_rate)[0]
+            base_0[:1 if law == 0 else 2] *= scale
+
+        base_no = len(base_0)
+        lower = np.concatenate([_BASE_BOUNDS[law][0], _RATE_BOUNDS[rate_law][0]])
+        upper = np.concatenate([_BASE_BOUNDS[law][1], _RATE_BOUNDS[rate_law][1]])
+        initial_guess = np.clip(np.concatenate([base_0, rate_0]), lower, upper)
+
+        def residual(parameter):
+            model = _base_stress(strain, law, parameter[:base_no]) * \
+                _rate_factor(rate, rate_law, parameter[base_no:], reference_rate)
+            return (model-stress)*weight
+
+        try:
+            res = least_squares(residual, initial_guess, bounds=(lower, upper),
+                                x_scale="jac", max_nfev=maxfev)
+        except (ValueError, np.linalg.LinAlgError) as error:
+            raise FitError(f"{_BASE_NAMES[law]}-{_RATE_NAMES[rate_law]}", str(error)) from error
+
+        if not np.all(np.isfinite(res.x)):
+            raise FitError(f"{_BASE_NAMES[law]}-{_RATE_NAMES[rate_law]}",
+                           "Fitted parameters are not finite.")
+
+        squared = (res.fun/weight)**2
+        rms = np.sqrt(np.bincount(curve_i, squared)/lengths)
+        record["nfev"] = res.nfev
+
+        return {"law": law, "rate_law": rate_law,
+                "parameter": [float(p) for p in res.x[:base_no]],
+                "rate_parameter": [float(p) for p in res.x[base_no:]],
+                "reference_rate": reference_rate, "rates": [float(r) for r in rates_arr],
+                "rms": [float(r) for r in rms], "nfev": int(res.nfev),
+                "success": bool(res.success), "time": perf_counter()-t_0}
+
+
+def eval_rate_family(result: dict, rates: list[float] | None = None, end: float = 1,
+                     resolution: int = 100) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Evaluate the fitted family at the given strain rates.
+    ...
+
+    Parameter
+    ---------
+    result: dict
+        result as returned by fit_rate_family
+    rates: list[float] | None, default = None
+        strain rates [1/s], defaults to the rates of the fitted curves
+    end: float, default = 1 (=100%)
+        plastic strain upto which the curves are evaluated
+    resolution: int, default = 100
+        number of intervals of the curves
+
+    Returns
+    -------
+    _: tuple[ndarray, ndarray]
+        0 = plastic strain, shape (resolution+1,)
+        1 = stress, shape (rates, resolution+1)
+    """
+    rates_arr = np.asarray(result["rates"] if rates is None else rates, dtype=np.float64)
+    strain = np.linspace(0, end, resolution+1)
+
+    base = _base_stress(strain, result["law"], np.asarray(result["parameter"]))
+    factor = _rate_factor(rates_arr, result["rate_law"], np.asarray(result["rate_parameter"]),
+                          result["reference_rate"])
+
+    return strain, factor[:, None]*base[None, :]
+
+
+def export_rate_table(user_input: list[str], result: dict, E: float, path_str: str,
+                      template_path_str: str, rates: list[float] | None = None,
+                      trace: Trace | None = None, incremental: bool = True) -> Path:
+    """
+    Export the fitted family as *MAT_24 card referencing a *DEFINE_TABLE
+    with one *DEFINE_CURVE per strain rate. The table id is the material id,
+    the curve ids are allocated from TABLE_CURVE_START on, above all ids of
+    the file the table is merged into (see cf_library.table_curve_ids).
+    ...
+
+    Parameter
+    ---------
+    user_input: list[str]
+        user input from the export dialog (see export_data)
+    result: dict
+        result as returned by fit_rate_family
+    E: float
+        the youngs modulus
+    path_str: str
+        string indicating the path to which the file shall be exported
+    template_path_str: str
+        string pointing to the table template path
+    rates: list[float] | None, default = None
+        strain rates of the table, defaults to the rates of the fitted curves
+    trace: Trace | None, default = None
+        trace recording timing information of the stage
+    incremental: bool, default = True
+        merge the cards into the existing file, see cf_model.write_to_file
+
+    Returns
+    -------
+    _: Path
+        path to which the file was saved.
+    """
+    with trace_stage(trace, "export_rate_table", point_no=user_input[5]):
+        point_no = int(user_input[5])
+        if point_no > 100 or point_no < 2:
+            raise ExportPointNoError from None
+
+        rates_arr = np.sort(np.asarray(result["rates"] if rates is None else rates,
+                                       dtype=np.float64))
+        strain, stress = eval_rate_family(result, rates_arr)
+        ids = cf_model.export_point_ids(point_no, user_input[7])
+        ids = np.asarray(ids, dtype=int)
+
+        mid = int(user_input[1])
+        if incremental:
+            lcids = table_curve_ids(Path(path_str.replace("\"", "")), mid, len(rates_arr))
+        else:
+            lcids = list(range(TABLE_CURVE_START, TABLE_CURVE_START + len(rates_arr)))
+
+        table = "\n".join(f"{r:>20.6g}{lcid:>20d}" for r, lcid in zip(rates_arr, lcids))
+
+        curves = []
+        for lcid, curve_stress in zip(lcids, stress):
+            curves.append("*DEFINE_CURVE\n"
+                          "$#    lcid      sidr       sfa       sfo      offa      offo    dattyp\n"
+                          f"{lcid:>10}         0       1.0       1.0       0.0       0.0\n"
+                          "$#                a1                  o1")
+            curves.extend(map(str.__add__, fixed_width(strain[ids], 20),
+                              fixed_width(curve_stress[ids], 20)))
+
+        export_data = {"Title": user_input[0],
+                       "mid": user_input[1].rjust(10),
+                       "ro": user_input[2].rjust(10),
+                       "E": fixed_width(E, 10)[0],
+                       "pr": user_input[3].rjust(10),
+                       "fail": user_input[4].rjust(10),
+                       "tbid": str(mid).rjust(10),
+                       "table": table,
+                       "curves": "\n".join(curves)}
+
+        return cf_model.write_to_file(export_data, path_str, template_path_str, incremental)
@@ -0,0 +1,477 @@
+import re
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+from matplotlib.collections import LineCollection
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+
+import cf_model
+from cf_errors import FileError, DataError, FitError, FormatError
+from cf_formats import file_stem, data_files
+from cf_overlay import decimate
+
+
+_LAW_NAMES = ["Swift", "Voce", "Swift-Voce"]
+
+_PARAMETER_NAMES = [["c", "phi", "n"], ["sigma", "R", "B"],
+                    ["alpha", "c", "phi", "n", "sigma", "R", "B"]]
+
+# A4 landscape [inch]
+_PAGE_SIZE = (11.69, 8.27)
+
+# Report figure of a worker process, set by _init_worker
+_worker_data: dict = {}
+
+
+def report_data(df: pd.DataFrame, label: str, e_start: int = 0, e_end: int = 300,
+                extrap_type: int = 0, screening_fix: bool = False, smoothing_method: int = 0,
+                smoothing_window: int = 11, smoothing_polyorder: int = 3,
+                max_points: int = 2000) -> dict:
+    """
+    Fit one specimen like the GUI does and collect the curves of its report.
+    The curves are decimated, so the record is small enough to be sent from
+    a worker process and rendered quickly.
+    ...
+
+    Parameter
+    ---------
+    df: DataFrame
+        dataframe as returned by get_data_from_file
+    label: str
+        name of the specimen
+    e_start: int, default = 0
+        index of the first data point of the youngs modulus window
+    e_end: int, default = 300
+        index of the last data point of the youngs modulus window
+    extrap_type: int, default = 0
+        0 = Swift, 1 = Voce, 2 = Swift-Voce
+    screening_fix: bool, default = False
+        whether the issues found by the data screening are fixed
+    smoothing_method: int, default = 0
+        smoothing filter, see CFModel.smooth_data
+    smoothing_window: int, default = 11
+        number of samples of the smoothing filter window
+    smoothing_polyorder: int, default = 3
+        order of the polynomial of the Savitzky-Golay filter
+    max_points: int, default = 2000
+        number of points every curve is reduced to
+
+    Returns
+    -------
+    _: dict
+        label = name of the specimen [str]
+        mat_char = material characteristics [list[float]]
+        law = extrapolation method [int]
+        parameter = fitted parameters [list[float]]
+        success = whether the fit converged [bool]
+        eng, true, plastic, curve = x and y values of the engineering,
+            true and plastic (fit window) data and of the extrapolated
+            curve [tuple[ndarray, ndarray]]
+    """
+    df = cf_model.screen_data(df, screening_fix)
+    df = cf_model.smooth_data(df, smoothing_method, smoothing_window, smoothing_polyorder)
+
+    mat_char = cf_model.comp_material_data(df, e_start, e_end)
+    rp02_i, rm_i = mat_char[3], mat_char[4]
+    df = cf_model.comp_true_stress_strain(df, rp02_i, rm_i)
+
+    strain, stress, parameter, status = cf_model.extrapolate(
+        [df, rp02_i, rm_i, mat_char[5], mat_char[2]], extrap_type)
+
+    return {"label": label, "mat_char": [float(value) for value in mat_char],
+            "law": extrap_type, "parameter": [float(p) for p in parameter],
+            "success": bool(status["success"]),
+            "eng": decimate(df["eng_strain"], df["eng_stress"], max_points),
+            "true": decimate(df["strain"][:rm_i], df["stress"][:rm_i], max_points),
+            "plastic": decimate(df["plst_strain"][rp02_i:rm_i], df["plst_stress"][rp02_i:rm_i],
+                                max_points),
+            "curve": (strain.to_numpy(dtype=np.float64), stress.to_numpy(dtype=np.float64))}
+
+
+class ReportFigure:
+    """
+    Report page of one specimen: engineering curve with the youngs modulus,
+    Rp_02 and Rm on the left, true and plastic data with the extrapolated
+    yield curve on the right. The figure is rendered by the Agg canvas
+    without pyplot or a GUI. Figure, axes and artists are created once and
+    only their data is replaced for every specimen.
+    """
+
+    def __init__(self) -> None:
+        """
+        ReportFigure init function.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self.figure = Figure(figsize=_PAGE_SIZE)
+        FigureCanvasAgg(self.figure)
+        self.figure.subplots_adjust(bottom=0.22, wspace=0.25)
+
+        self._axes_eng, self._axes_flow = self.figure.subplots(1, 2)
+        self._title = self.figure.suptitle("", fontsize=14)
+
+        self._axes_eng.set_title("Stress - Strain (eng.)")
+        self._axes_eng.set_xlabel("Strain")
+        self._axes_eng.set_ylabel("Stress")
+        self._axes_eng.grid(True)
+        self._eng = self._axes_eng.plot([], [], label="eng. stress-strain")[0]
+        self._modulus = self._axes_eng.plot([], [], "--", label="Youngs Modulus")[0]
+        self._points = self._axes_eng.plot([], [], "o", label="Rp_02, Rm")[0]
+        self._axes_eng.legend(loc="lower right")
+
+        self._axes_flow.set_title("Yield Curve")
+        self._axes_flow.set_xlabel("Plastic Strain")
+        self._axes_flow.set_ylabel("True Stress")
+        self._axes_flow.grid(True)
+        self._true = self._axes_flow.plot([], [], label="true stress-strain")[0]
+        self._plastic = self._axes_flow.plot([], [], linewidth=3,
+                                             label="plst. stress-strain")[0]
+        self._curve = self._axes_flow.plot([], [], "--", label="Swift")[0]
+        self._legend = self._axes_flow.legend(loc="lower right")
+
+        self._info = self.figure.text(0.08, 0.03, "", family="monospace", fontsize=9,
+                                      verticalalignment="bottom")
+
+    def render(self, record: dict) -> None:
+        """
+        Replace the data of the artists by the curves of a specimen.
+        ...
+
+        Parameter
+        ---------
+        record: dict
+            record as returned by report_data, or a record with the keys
+            label and error for specimens that could not be fitted
+
+        Returns
+        -------
+        None
+        """
+        self._title.set_text(record["label"])
+
+        lines = [self._eng, self._modulus, self._points, self._true, self._plastic,
+                 self._curve]
+
+        if "error" in record:
+            for line in lines:
+                line.set_data([], [])
+            self._info.set_text(record["error"])
+            return
+
+        E, rp02, rm, _, _, ag, af = record["mat_char"]
+        law = record["law"]
+
+        self._eng.set_data(*record["eng"])
+        self._modulus.set_data([0, 1.2*rp02/E], [0, 1.2*rp02])
+        self._points.set_data([rp02/E + 0.002, ag + rm/E], [rp02, rm])
+        self._true.set_data(*record["true"])
+        self._plastic.set_data(*record["plastic"])
+        self._curve.set_data(*record["curve"])
+        self._legend.get_texts()[2].set_text(_LAW_NAMES[law])
+
+        for axes, curves in ((self._axes_eng, [record["eng"]]),
+                             (self._axes_flow, [record["true"], record["curve"]])):
+            axes.set_xlim(0, 1.05*max(np.nanmax(x, initial=0) for x, _ in curves))
+            axes.set_ylim(0, 1.1*max(np.nanmax(y, initial=0) for _, y in curves))
+
+        parameters = ", ".join(f"{name} = {value:.5g}" for name, value in
+                               zip(_PARAMETER_NAMES[law], record["parameter"]))
+        self._info.set_text(
+            f"E = {E:.1f}   Rp_02 = {rp02:.1f}   Rm = {rm:.1f}   Ag = {ag:.4f}   "
+            f"A = {af:.4f}\n{_LAW_NAMES[law]}: {parameters}"
+            + ("" if record["success"] else "\nFit did not converge, linearized estimate used."))
+
+    def save(self, path: Path) -> None:
+        """
+        Write the current page, the format is given by the file suffix (.png,
+        .pdf, .svg, ...). PNG files are written with a low compression level,
+        which saves about a fifth of the time per report.
+        """
+        if path.suffix.lower() == ".png":
+            self.figure.savefig(path, dpi=150, pil_kwargs={"compress_level": 1})
+        else:
+            self.figure.savefig(path, dpi=150)
+
+
+def _file_name(label: str) -> str:
+    """
+    File name of the report of a specimen, characters not allowed in file
+    names are replaced.
+    """
+    return re.sub(r'[\\/:*?"<>|]', "_", label)
+
+
+def _unique_stems(paths: list[Path]) -> list[str]:
+    """
+    File stems of the input files, numbered if files of different
+    directories share a stem.
+    """
+    stems, seen = [], {}
+    for path in paths:
+        stem = file_stem(path)
+        seen[stem] = seen.get(stem, 0) + 1
+        stems.append(stem if seen[stem] == 1 else f"{stem}_{seen[stem]}")
+
+    return stems
+
+
+def _init_worker(out_dir: Path, fmt: str, settings: dict) -> None:
+    """
+    Create the report figure of a worker process, it is reused for all files
+    the worker renders.
+    """
+    _worker_data["figure"] = ReportFigure()
+    _worker_data["out_dir"] = out_dir
+    _worker_data["format"] = fmt
+    _worker_data["settings"] = settings
+
+
+def _report_file(file_path: Path, stem: str) -> list[dict]:
+    """
+    Fit and render all specimens of one file in a worker process.
+    ...
+
+    Parameter
+    ---------
+    file_path: Path
+        path of the data file
+    stem: str
+        name of the file used for the specimen labels
+
+    Returns
+    -------
+    _: list[dict]
+        one record per specimen (see report_data) with the additional keys
+        source and path, failed specimens have the key error instead of the
+        curves
+    """
+    figure: ReportFigure = _worker_data["figure"]
+
+    try:
+        specimens = cf_model.get_specimens_from_file(file_path)
+    except (FileError, DataError, FormatError, OSError, ValueError) as error:
+        specimens = []
+        records = [{"label": stem,
+                    "error": f"{type(error).__name__} - {error.args[-1] if error.args else ''}"}]
+    else:
+        records = []
+
+    for specimen in specimens:
+        label = stem if len(specimens) == 1 else f"{stem} {specimen.attrs['specimen']}"
+
+        try:
+            records.append(report_data(specimen, label, **_worker_data["settings"]))
+        except (FitError, RuntimeError, ValueError, TypeError, IndexError, KeyError) as error:
+            message = error.args[0] if error.args else ""
+            records.append({"label": label, "error": f"{type(error).__name__} - {message}"})
+
+    for record in records:
+        record["source"] = str(file_path)
+        record["path"] = str(_worker_data["out_dir"]/f"{_file_name(record['label'])}."
+                             f"{_worker_data['format']}")
+
+        figure.render(record)
+        figure.save(Path(record["path"]))
+
+    return records
+
+
+def write_summary(records: list[dict], path: Path, pages: bool = False,
+                  page_rows: int = 30) -> None:
+    """
+    Write the multi-page summary of a batch: an overview of all curves
+    coloured by Rm with the scatter of the characteristics, a table of all
+    specimens and, optionally, the report page of every specimen. Every page
+    type is drawn on one reused figure.
+    ...
+
+    Parameter
+    ---------
+    records: list[dict]
+        records as returned by render_batch
+    path: Path
+        path of the .pdf-file
+    pages: bool, default = False
+        whether the report pages of the specimens are appended. They are
+        rendered in the calling process, one page at a time.
+    page_rows: int, default = 30
+        number of specimens per table page
+
+    Returns
+    -------
+    None
+    """
+    fitted = [record for record in records if "error" not in record]
+
+    with PdfPages(path) as pdf:
+        figure = Figure(figsize=_PAGE_SIZE)
+        FigureCanvasAgg(figure)
+        figure.subplots_adjust(bottom=0.2, wspace=0.25)
+        figure.suptitle(f"Batch Summary - {len(fitted)} of {len(records)} specimens fitted",
+                        fontsize=14)
+
+        axes_eng, axes_flow = figure.subplots(1, 2)
+        if fitted:
+            rm = np.array([record["mat_char"][2] for record in fitted])
+
+            for axes, key, title in ((axes_eng, "eng", "Stress - Strain (eng.)"),
+                                     (axes_flow, "curve", "Yield Curves")):
+                collection = LineCollection([np.column_stack(record[key]) for record in fitted],
+                                            linewidths=0.8, cmap="viridis", array=rm)
+                axes.add_collection(collection)
+                axes.autoscale_view()
+                axes.set_title(title)
+                axes.grid(True)
+            figure.colorbar(collection, ax=axes_flow).set_label("Rm")
+
+            characteristics = np.array([record["mat_char"] for record in fitted])
+            std = characteristics.std(axis=0, ddof=1) if len(fitted) > 1 else \
+                np.zeros(characteristics.shape[1])
+            figure.text(0.08, 0.05, "\n".join(
+                f"{name:<6} {mean:>12.4g} ± {deviation:.3g}" for name, mean, deviation in
+                zip(["E", "Rp_02", "Rm"], characteristics.mean(axis=0)[:3], std[:3])) + "\n" +
+                "\n".join(f"{name:<6} {mean:>12.4f} ± {deviation:.3g}" for name, mean, deviation
+                          in zip(["Ag", "A"], characteristics.mean(axis=0)[5:],
+                                 std[5:])), family="monospace", fontsize=9)
+        pdf.savefig(figure)
+
+        figure.clear()
+        axes = figure.subplots()
+        axes.axis("off")
+        columns = ["Specimen", "E", "Rp_02", "Rm", "Ag", "A", "Law", "Parameters"]
+        for start in range(0, len(records), page_rows):
+            rows = []
+            for record in records[start:start + page_rows]:
+                if "error" in record:
+                    rows.append([record["label"], "", "", "", "", "", "", record["error"][:60]])
+                    continue
+
+                E, rp02, rm, _, _, ag, af = record["mat_char"]
+                rows.append([record["label"], f"{E:.0f}", f"{rp02:.1f}", f"{rm:.1f}",
+                             f"{ag:.4f}", f"{af:.4f}", _LAW_NAMES[record["law"]],
+                             ", ".join(f"{p:.4g}" for p in record["parameter"])
+                             + ("" if record["success"] else " (estimate)")])
+
+            table = axes.table(cellText=rows, colLabels=columns, loc="upper center",
+                               cellLoc="left")
+            table.auto_set_font_size(False)
+            table.set_fontsize(7)
+            table.auto_set_column_width(list(range(len(columns))))
+            figure.suptitle(f"Specimens {start + 1} - {start + len(rows)} of {len(records)}")
+            pdf.savefig(figure)
+            table.remove()
+
+        if pages:
+            report = ReportFigure()
+            for record in records:
+                report.render(record)
+                pdf.savefig(report.figure)
+
+
+def render_batch(paths: list[Path], out_dir: Path, fmt: str = "png",
+                 summary: str | None = "summary.pdf", pages: bool = False,
+                 workers: int | None = None, **settings) -> list[dict]:
+    """
+    Render the reports of all specimens of the given files in a process
+    pool. Every worker process creates one report figure and reuses it for
+    all specimens it renders. The records of all specimens are collected for
+    the multi-page summary.
+    ...
+
+    Parameter
+    ---------
+    paths: list[Path]
+        paths of the data files
+    out_dir: Path
+        directory of the reports, created if necessary
+    fmt: str, default = "png"
+        file format of the reports of the specimens (png, pdf or svg)
+    summary: str | None, default = "summary.pdf"
+        file name of the summary in out_dir, None for no summary
+    pages: bool, default = False
+        whether the report pages of the specimens are appended to the summary
+    workers: int | None, default = None
+        number of worker processes, defaults to the number of CPUs
+    **settings:
+        fit settings passed to report_data (e_start, e_end, extrap_type, ...)
+
+    Returns
+    -------
+    _: list[dict]
+        one record per specimen in the order of the files, see _report_file
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(out_dir, fmt, settings)) as pool:
+        records = [record for file_records in
+                   pool.map(_report_file, paths, _unique_stems(paths))
+                   for record in file_records]
+
+    if summary:
+        write_summary(records, out_dir/summary, pages)
+
+    return records
+
+
+def main() -> None:
+    """
+    Render the reports of a batch from the command line.
+
+    Example:
+        python cf_report.py data/ reports/ --format pdf --law 2
+    """
+    parser = argparse.ArgumentParser(description="Render the report of every specimen of the "
+                                     "given data files or directories and a batch summary.")
+    parser.add_argument("inputs", type=Path, nargs="+",
+                        help="data files or directories containing data files")
+    parser.add_argument("out_dir", type=Path, help="directory of the reports")
+    parser.add_argument("--format", choices=["png", "pdf", "svg"], default="png")
+    parser.add_argument("--law", type=int, choices=[0, 1, 2], default=0,
+                        help="0 = Swift, 1 = Voce, 2 = Swift-Voce")
+    parser.add_argument("--e-start", type=int, default=0,
+                        help="first data point of the youngs modulus window")
+    parser.add_argument("--e-end", type=int, default=300,
+                        help="last data point of the youngs modulus window")
+    parser.add_argument("--screening-fix", action="store_true")
+    parser.add_argument("--smoothing", type=int, choices=[0, 1, 2, 3], default=0,
+                        help="0 = None, 1 = Savitzky-Golay, 2 = Median, 3 = Moving Average")
+    parser.add_argument("--window", type=int, default=11, help="smoothing window")
+    parser.add_argument("--summary", default="summary.pdf",
+                        help="file name of the summary, 'none' for no summary")
+    parser.add_argument("--pages", action="store_true",
+                        help="append the report of every specimen to the summary")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    paths = []
+    for path in args.inputs:
+        paths.extend(data_files(path) if path.is_dir() else [path])
+
+    records = render_batch(paths, args.out_dir, args.format,
+                           None if args.summary == "none" else args.summary,
+                           args.pages, args.workers, e_start=args.e_start,
+                           e_end=args.e_end, extrap_type=args.law,
+                           screening_fix=args.screening_fix, smoothing_method=args.smoothing,
+                           smoothing_window=args.window)
+
+    failed = [record for record in records if "error" in record]
+    print(f"{len(records) - len(failed)} of {len(records)} specimens reported.")
+    for record in failed:
+        print(f"{record['label']}: {record['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from cf_database import CfDatabase
+
+
+_LAW_NAMES = {0: "Swift", 1: "Voce", 2: "Swift-Voce"}
+
+
+def _features(rp02: np.ndarray, rm: np.ndarray, ag: np.ndarray) -> np.ndarray:
+    """
+    Coordinates of materials in the seed index. Logarithms of Rp_02, Rm and
+    Ag, so distances are relative differences of the characteristics.
+    """
+    return np.column_stack([np.log(np.maximum(np.asarray(x, dtype=np.float64), 1e-9))
+                            for x in (rp02, rm, ag)])
+
+
+class SeedStore:
+    """
+    Spatial index over the material characteristics of the fits stored in
+    the database. The parameters of the nearest previous fit of the same
+    law are used as warm start of new fits.
+    """
+
+    def __init__(self, db: CfDatabase, max_distance: float = 0.1) -> None:
+        """
+        SeedStore init function. The index is built on the first lookup.
+        ...
+
+        Parameter
+        ---------
+        db: CfDatabase
+            database containing the previous fits
+        max_distance: float, default = 0.1
+            maximum distance of a seed in the index (approximately the
+            relative difference of Rp_02, Rm and Ag)
+
+        Returns
+        -------
+        None
+        """
+        self._db = db
+        self.max_distance = max_distance
+        self._index: dict[int, tuple[cKDTree, np.ndarray, list[list[float]]]] | None = None
+
+    def _build(self) -> None:
+        """
+        Build one KD-tree per law over all stored fits.
+        """
+        df = self._db.query_fits()
+
+        self._index = {}
+        for law, group in df.groupby("law"):
+            tree = cKDTree(_features(group["rp02"], group["rm"], group["ag"]))
+            self._index[int(law)] = (tree, group["fit_id"].to_numpy(),
+                                     list(group["parameters"]))
+
+    def invalidate(self) -> None:
+        """
+        Discard the index, e.g. after fits were deleted. It is rebuilt
+        on the next lookup.
+        """
+        self._index = None
+
+    def add(self, fit_id: int, mat_char: list[float | int], law: int,
+            parameter: list[float]) -> None:
+        """
+        Add a newly stored fit to the index without querying the database.
+        A fit id already in the index (a refit updating the stored fit)
+        replaces its entry. Only the tree of the given law is rebuilt from the
+        points in memory, not at all if just the parameters changed. If the
+        index was not built yet, the fit is included on the first lookup.
+        ...
+
+        Parameter
+        ---------
+        fit_id: int
+            id of the stored fit
+        mat_char: list[float|int]
+            material characteristics as returned by comp_material_data
+        law: int
+            extrapolation method (0 = Swift, 1 = Voce, 2 = Swift-Voce)
+        parameter: list[float]
+            fitted parameters
+
+        Returns
+        -------
+        None
+        """
+        if self._index is None:
+            return
+
+        point = _features([mat_char[1]], [mat_char[2]], [mat_char[5]])
+
+        for other, (tree, fit_ids, parameters) in list(self._index.items()):
+            stored = np.flatnonzero(fit_ids == fit_id)
+            if not stored.size:
+                continue
+
+            if other == law and np.array_equal(tree.data[stored[0]], point[0]):
+                parameters[stored[0]] = list(parameter)
+                return
+
+            keep = fit_ids != fit_id
+            if keep.any():
+                self._index[other] = (cKDTree(tree.data[keep]), fit_ids[keep],
+                                      [p for p, k in zip(parameters, keep) if k])
+            else:
+                del self._index[other]
+
+        if law in self._index:
+            tree, fit_ids, parameters = self._index[law]
+            point = np.vstack([tree.data, point])
+            fit_ids = np.append(fit_ids, fit_id)
+            parameters = parameters + [list(parameter)]
+        else:
+            fit_ids, parameters = np.array([fit_id]), [list(parameter)]
+
+        self._index[law] = (cKDTree(point), fit_ids, parameters)
+
+    def nearest(self, mat_char: list[float | int],
+                law: int) -> tuple[int, list[float], float] | None:
+        """
+        Find the stored fit of the given law closest to the given material.
+        ...
+
+        Parameter
+        ---------
+        mat_char: list[float|int]
+            material characteristics as returned by comp_material_data
+        law: int
+            extrapolation method (0 = Swift, 1 = Voce, 2 = Swift-Voce)
+
+        Returns
+        -------
+        _: tuple[int, list[float], float] | None
+            None if no fit lies within max_distance, otherwise
+            0 = id of the fit [int]
+            1 = fitted parameters [list[float]]
+            2 = distance to the material [float]
+        """
+        if self._index is None:
+            self._build()
+
+        if law not in self._index:
+            return None
+
+        tree, fit_ids, parameters = self._index[law]
+        distance, i = tree.query(_features([mat_char[1]], [mat_char[2]], [mat_char[5]])[0],
+                                 distance_upper_bound=self.max_distance)
+
+        if not np.isfinite(distance):
+            return None
+
+        return int(fit_ids[i]), parameters[i], float(distance)
+
+    def report(self) -> pd.DataFrame:
+        """
+        Compare the number of function evaluations of fits with and
+        without warm start.
+        ...
+
+        Returns
+        -------
+        _: DataFrame
+            one row per law with the columns
+            law = name of the law
+            cold_fits, seeded_fits = number of fits without and with warm start
+            cold_nfev, seeded_nfev = mean function evaluations
+            reduction = relative reduction of the function evaluations [%]
+        """
+        df = self._db.query_fits().dropna(subset=["nfev"])
+        df["seeded"] = df["seed_fit_id"].notna()
+
+        rows = []
+        for law, group in df.groupby("law"):
+            cold = group.loc[~group["seeded"], "nfev"]
+            seeded = group.loc[group["seeded"], "nfev"]
+            cold_nfev = cold.mean() if len(cold) else np.nan
+            seeded_nfev = seeded.mean() if len(seeded) else np.nan
+
+            rows.append({"law": _LAW_NAMES.get(int(law), str(law)),
+                         "cold_fits": len(cold), "seeded_fits": len(seeded),
+                         "cold_nfev": cold_nfev, "seeded_nfev": seeded_nfev,
+                         "reduction": (1 - seeded_nfev/cold_nfev)*100})
+
+        return pd.DataFrame(rows, columns=["law", "cold_fits", "seeded_fits", "cold_nfev",
+                                           "seeded_nfev", "reduction"])
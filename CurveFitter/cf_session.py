@@ -0,0 +1,160 @@
+import json
+import struct
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from cf_errors import FileError, SessionError
+
+
+# File layout of a session file (.cfs):
+#   8 byte magic | 8 byte little endian header length | JSON header | arrays
+# The header is padded so that the array section starts aligned to _ALIGN bytes.
+# Every array is stored as raw little endian data aligned to _ALIGN bytes, so
+# that it can be memory-mapped on load without copying.
+_MAGIC = b"CFSESS01"
+_ALIGN = 64
+
+
+def _pad(length: int) -> int:
+    """
+    Number of bytes needed to pad the given length to the array alignment.
+    """
+    return -length % _ALIGN
+
+
+def save_session(path: Path, data: pd.DataFrame, mat_char: list[float | int],
+                 fitted_data: list, settings: dict) -> None:
+    """
+    Save the current session to a binary session file.
+    ...
+
+    Parameter
+    ---------
+    path: Path
+        path of the session file
+    data: DataFrame
+        dataframe containing the imported and computed data
+    mat_char: list[float|int]
+        material characteristics as returned by comp_material_data
+    fitted_data: list
+        fitted data as returned by extrapolate
+    settings: dict
+        settings the session was computed with (e_start, e_end,
+        extrap_method, template_path, source, data_hash)
+
+    Returns
+    -------
+    None
+    """
+    arrays: dict[str, np.ndarray] = {
+        # All dataframe columns are stored as one block which is restored
+        # as the dataframe without copying the data.
+        "data": np.ascontiguousarray(data.to_numpy(dtype="<f8")),
+    }
+
+    if fitted_data:
+        arrays["fitted_strain"] = np.ascontiguousarray(
+            np.asarray(fitted_data[0], dtype="<f8"))
+        arrays["fitted_stress"] = np.ascontiguousarray(
+            np.asarray(fitted_data[1], dtype="<f8"))
+
+    header: dict = {
+        "version": 1,
+        "columns": list(data.columns),
+        "mat_characteristics": [float(c) for c in mat_char],
+        "parameters": [float(p) for p in fitted_data[2]] if fitted_data else [],
+        "status": fitted_data[3] if len(fitted_data) > 3 else None,
+        "settings": settings,
+        "arrays": {},
+    }
+
+    # Offsets are relative to the start of the (aligned) data section.
+    offset = 0
+    for name, arr in arrays.items():
+        header["arrays"][name] = {"offset": offset, "shape": arr.shape, "dtype": "<f8"}
+        offset += arr.nbytes + _pad(arr.nbytes)
+
+    header_bytes = json.dumps(header).encode()
+    header_bytes += b" " * _pad(len(_MAGIC) + 8 + len(header_bytes))
+
+    with open(path, "wb") as file:
+        file.write(_MAGIC)
+        file.write(struct.pack("<Q", len(header_bytes)))
+        file.write(header_bytes)
+
+        for arr in arrays.values():
+            file.write(arr.tobytes())
+            file.write(b"\0" * _pad(arr.nbytes))
+
+
+def load_session(path: Path, mmap: bool = True) -> tuple[pd.DataFrame, list[float | int], list, dict]:
+    """
+    Load a session from a binary session file.
+    ...
+
+    Parameter
+    ---------
+    path: Path
+        path of the session file
+    mmap: bool, default = True
+        memory-map the arrays instead of reading them into memory.
+        Mapped arrays are copy on write, the file is never modified.
+
+    Returns
+    -------
+    _: tuple
+        0 = dataframe containing the imported and computed data [DataFrame]
+        1 = material characteristics [list[float|int]]
+        2 = fitted data, same structure as returned by extrapolate [list]
+        3 = settings [dict]
+
+    Raises
+    ------
+    FileError
+    SessionError
+    """
+    if not path.is_file():
+        raise FileError(path) from None
+
+    with open(path, "rb") as file:
+        if file.read(len(_MAGIC)) != _MAGIC:
+            raise SessionError(path) from None
+        try:
+            header_len = struct.unpack("<Q", file.read(8))[0]
+            header = json.loads(file.read(header_len))
+        except (struct.error, ValueError):
+            raise SessionError(path) from None
+        data_start = file.tell()
+
+    if header.get("version") != 1:
+        raise SessionError(path) from None
+
+    arrays: dict[str, np.ndarray] = {}
+    for name, info in header["arrays"].items():
+        shape = tuple(info["shape"])
+        if mmap and np.prod(shape) > 0:
+            arrays[name] = np.memmap(path, dtype=info["dtype"], mode="c",
+                                     offset=data_start+info["offset"], shape=shape)
+        else:
+            arrays[name] = np.fromfile(path, dtype=info["dtype"], count=int(np.prod(shape)),
+                                       offset=data_start+info["offset"]).reshape(shape)
+
+    data = pd.DataFrame(arrays["data"], columns=header["columns"], copy=False)
+
+    mat_char: list[float | int] = header["mat_characteristics"]
+    if mat_char:
+        # indices of Rp_02 and Rm
+        mat_char[3] = int(mat_char[3])
+        mat_char[4] = int(mat_char[4])
+
+    fitted_data: list = []
+    if "fitted_strain" in arrays:
+        fitted_data = [pd.Series(arrays["fitted_strain"], copy=False),
+                       pd.Series(arrays["fitted_stress"], copy=False),
+                       header["parameters"]]
+        if header.get("status") is not None:
+            fitted_data.append(header["status"])
+
+    return data, mat_char, fitted_data, header["settings"]
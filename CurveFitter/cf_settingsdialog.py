@@ -6,7 +6,8 @@ from pathlib import Path
 
 class SettingsDialog(QDialog):
     def __init__(self, cwd: Path, extrap_methods: list[str], extrap_index: int, e_start: int, e_end: int,
-                 template_path_str: str, parent=None) -> None:
+                 template_path_str: str, smoothing_methods: list[str], smoothing_index: int,
+                 smoothing_window: int, parent=None) -> None:
         """
         Settings Dialogs init function.
         ...
@@ -25,6 +26,12 @@ class SettingsDialog(QDialog):
             index of the datapoint at which the interval for the youngs modulus extrapolation ends.
         template_path_str:
             path to the .k-file template as a string.
+        smoothing_methods: list[str]
+            list containing the available smoothing filters
+        smoothing_index: int
+            the currently used smoothing filter represented by an integer
+        smoothing_window: int
+            number of samples of the smoothing filter window
         parent: QWidget
             parent widget of the dialog, defaults to None.
 
@@ -40,8 +47,8 @@ class SettingsDialog(QDialog):
         self._create_fonts()
         self._create_btns(cwd)
         self._create_lbls()
-        self._create_tbs(e_start, e_end, template_path_str)
-        self._create_cmbs(extrap_methods, extrap_index)
+        self._create_tbs(e_start, e_end, template_path_str, smoothing_window)
+        self._create_cmbs(extrap_methods, extrap_index, smoothing_methods, smoothing_index)
         self._create_line()
         self._create_spacers()
         self._layout = QFormLayout()
@@ -55,6 +62,10 @@ class SettingsDialog(QDialog):
         self._layout.addItem(self._spacer_2)
         self._layout.addRow(self._lbl_extrap_method)
         self._layout.addRow(self.cmb_extrap_method)
+        self._layout.addRow(self._line_smoothing)
+        self._layout.addRow(self._lbl_title_smoothing)
+        self._layout.addRow(self._lbl_smoothing_method, self._lbl_smoothing_window)
+        self._layout.addRow(self.cmb_smoothing_method, self.tb_smoothing_window)
         self._layout.addRow(self._line)
         self._layout.addRow(self._lbl_title_export)
         self._layout.addRow(self._lbl_template_path)
@@ -112,12 +123,20 @@ class SettingsDialog(QDialog):
         self._lbl_extrap_method = QLabel("Extrapolation Method")
         self._lbl_extrap_method.setFont(self._font)
 
+        self._lbl_title_smoothing = QLabel("Smoothing")
+        self._lbl_title_smoothing.setFont(self._title_font)
+        self._lbl_smoothing_method = QLabel("Filter")
+        self._lbl_smoothing_method.setFont(self._font)
+        self._lbl_smoothing_window = QLabel("Window")
+        self._lbl_smoothing_window.setFont(self._font)
+
         self._lbl_title_export = QLabel("Export")
         self._lbl_title_export.setFont(self._title_font)
         self._lbl_template_path = QLabel("Template File")
         self._lbl_template_path.setFont(self._font)
 
-    def _create_tbs(self, e_start: int, e_end: int, template_path_str: str) -> None:
+    def _create_tbs(self, e_start: int, e_end: int, template_path_str: str,
+                    smoothing_window: int) -> None:
         """
         Create the textboxes necessary for the dialog.
         ...
@@ -130,6 +149,8 @@ class SettingsDialog(QDialog):
             index of the datapoint at which the interval for the youngs modulus extrapolation ends.
         template_path_str:
             path to the .k-file template as a string.
+        smoothing_window: int
+            number of samples of the smoothing filter window
 
         Return
         ------
@@ -145,8 +166,12 @@ class SettingsDialog(QDialog):
         self.tb_template_path = QLineEdit(template_path_str)
         self.tb_template_path.setFont(self._font)
         self.tb_template_path.setFixedSize(200, 25)
+        self.tb_smoothing_window = QLineEdit(str(smoothing_window))
+        self.tb_smoothing_window.setFont(self._font)
+        self.tb_smoothing_window.setFixedSize(50, 25)
 
-    def _create_cmbs(self, extrap_methods: list[str], extrap_index: int) -> None:
+    def _create_cmbs(self, extrap_methods: list[str], extrap_index: int,
+                     smoothing_methods: list[str], smoothing_index: int) -> None:
         """
         Create the comboboxes necessary for the dialog.
         ...
@@ -157,6 +182,10 @@ class SettingsDialog(QDialog):
             list containing the available extrapolation methods
         extrap_index: int
             the currently used extrapolation method represented by an integer
+        smoothing_methods: list[str]
+            list containing the available smoothing filters
+        smoothing_index: int
+            the currently used smoothing filter represented by an integer
 
         Returns
         -------
@@ -169,6 +198,12 @@ class SettingsDialog(QDialog):
         self.cmb_extrap_method.addItems(extrap_methods)
         self.cmb_extrap_method.setCurrentIndex(extrap_index)
 
+        self.cmb_smoothing_method = QComboBox()
+        self.cmb_smoothing_method.setFixedSize(175, 25)
+        self.cmb_smoothing_method.setFont(self._font)
+        self.cmb_smoothing_method.addItems(smoothing_methods)
+        self.cmb_smoothing_method.setCurrentIndex(smoothing_index)
+
     def _create_fonts(self) -> None:
         """
         Create the fonts necessary for the dialog.
@@ -188,7 +223,7 @@ class SettingsDialog(QDialog):
 
     def _create_line(self) -> None:
         """
-        Create a horizontal line.
+        Create horizontal lines.
         ...
 
         Parameter
@@ -204,6 +239,10 @@ class SettingsDialog(QDialog):
         self._line.setFrameShape(QFrame.HLine)
         self._line.setFrameShadow(QFrame.Sunken)
 
+        self._line_smoothing = QFrame()
+        self._line_smoothing.setFrameShape(QFrame.HLine)
+        self._line_smoothing.setFrameShadow(QFrame.Sunken)
+
     def _create_spacers(self) -> None:
         """
         Create a create_spacers.
@@ -0,0 +1,216 @@
+from typing import Callable
+from threading import Event
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+import cf_model
+from cf_dataset import SharedDataset
+from cf_errors import FitError
+
+
+# Columns of the shared input block
+_COLUMNS = ["eng_strain", "eng_stress", "plst_strain", "plst_stress"]
+
+# Shared input data of a worker process, set by _init_worker
+_worker_data: dict = {}
+
+
+def _init_worker(dataset: SharedDataset, mat_char: list[float | int],
+                 extrap_type: int, strain_at: float) -> None:
+    """
+    Attach a worker process to the shared input data. Only the handle of the
+    dataset is pickled, the data itself is mapped.
+    """
+    _worker_data["dataset"] = dataset
+    _worker_data["mat_char"] = mat_char
+    _worker_data["extrap_type"] = extrap_type
+    _worker_data["strain_at"] = strain_at
+
+
+def _fit_row(mode: int, first: int, lasts: list[int]) -> list[tuple[float, list[float]]]:
+    """
+    Fit all windows of one row of the sweep grid in a worker process.
+    ...
+
+    Parameter
+    ---------
+    mode: int
+        0 = plastic fit window, 1 = youngs modulus window
+    first: int
+        index of the first data point of the windows
+    lasts: list[int]
+        indices of the last data points of the windows
+
+    Returns
+    -------
+    _: list[tuple[float, list[float]]]
+        extrapolated stress at the sweep strain and fitted parameters per
+        window. Failed and not converged fits are returned as NaN and an empty
+        list.
+    """
+    dataset: SharedDataset = _worker_data["dataset"]
+    mat_char = _worker_data["mat_char"]
+    extrap_type = _worker_data["extrap_type"]
+
+    results = []
+    for last in lasts:
+        try:
+            if last - first < 3:
+                raise ValueError("window too small")
+
+            if mode == 0:
+                window_char = mat_char
+                fit_df = dataset
+                start_i, end_i = first, last
+            else:
+                window_char = cf_model.comp_material_data(dataset, first, last)
+                # new frame of zero-copy views, the true stress columns are added to it
+                fit_df = cf_model.comp_true_stress_strain(
+                    pd.DataFrame({"eng_strain": dataset.array("eng_strain"),
+                                  "eng_stress": dataset.array("eng_stress")}, copy=False),
+                    window_char[3], window_char[4])
+                start_i, end_i = window_char[3], window_char[4]
+
+            _, _, parameter, status = cf_model.extrapolate(
+                [fit_df, start_i, end_i, window_char[5], window_char[2]], extrap_type)
+            if not status["success"]:
+                raise RuntimeError("fit did not converge")
+
+            stress_at = float(cf_model.eval_extrapolation(
+                parameter, extrap_type, 1, _worker_data["strain_at"])[1].iloc[-1])
+
+            results.append((stress_at, [float(p) for p in parameter]))
+        except (RuntimeError, ValueError, TypeError, IndexError, KeyError, FitError):
+            results.append((np.nan, []))
+
+    return results
+
+
+def default_grid(mat_char: list[float | int], mode: int = 0, e_start: int = 0,
+                 e_end: int = 300, point_no: int = 10) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Default grid of window start and end indices around the current windows.
+    ...
+
+    Parameter
+    ---------
+    mat_char: list[float|int]
+        material characteristics as returned by comp_material_data
+    mode: int, default = 0
+        0 = plastic fit window [rp02_i, rm_i]
+        1 = youngs modulus window [e_start, e_end]
+    e_start: int, default = 0
+        current first data point of the youngs modulus window
+    e_end: int, default = 300
+        current last data point of the youngs modulus window
+    point_no: int, default = 10
+        number of start and end indices
+
+    Returns
+    -------
+    _: tuple[ndarray, ndarray]
+        0 = start indices
+        1 = end indices
+    """
+    if mode == 0:
+        first, last = mat_char[3], mat_char[4]
+    else:
+        first, last = e_start, e_end
+
+    span = last - first
+    starts = np.linspace(first, first + 0.4*span, point_no)
+    ends = np.linspace(first + 0.6*span, last, point_no)
+
+    return np.unique(np.round(starts).astype(int)), np.unique(np.round(ends).astype(int))
+
+
+def sweep_fit_window(df: pd.DataFrame, mat_char: list[float | int], extrap_type: int,
+                     starts: np.ndarray, ends: np.ndarray, mode: int = 0,
+                     strain_at: float = 1.0, workers: int | None = None,
+                     progress: Callable[[int, int], None] | None = None,
+                     cancel: Event | None = None) -> dict:
+    """
+    Fit the data over a grid of window start and end indices in a process pool
+    and evaluate the sensitivity of the extrapolated curve. The input data is
+    placed in shared memory once and mapped by every worker.
+    ...
+
+    Parameter
+    ---------
+    df: DataFrame
+        dataframe as returned by comp_true_stress_strain
+    mat_char: list[float|int]
+        material characteristics as returned by comp_material_data
+    extrap_type: int
+        integer indicating the fitting type (0 = Swift, 1 = Voce, 2 = Swift-Voce)
+    starts: ndarray
+        indices of the first data points of the windows
+    ends: ndarray
+        indices of the last data points of the windows
+    mode: int, default = 0
+        0 = sweep the plastic fit window (default [rp02_i, rm_i])
+        1 = sweep the youngs modulus window (default [e_start, e_end]).
+            Material characteristics and true stress are recomputed per window.
+    strain_at: float, default = 1.0
+        plastic strain at which the extrapolated stress is evaluated
+    workers: int | None, default = None
+        number of worker processes, defaults to the number of CPUs
+    progress: Callable[[int, int], None] | None, default = None
+        called with the number of finished and of all rows of the grid
+    cancel: Event | None, default = None
+        if set, the rows not started yet are skipped and left NaN
+
+    Returns
+    -------
+    _: dict
+        starts = start indices [ndarray]
+        ends = end indices [ndarray]
+        stress = extrapolated stress per window, shape (starts, ends) [ndarray]
+        parameters = fitted parameters, shape (starts, ends, parameters) [ndarray]
+        stability = coefficient of variation of every parameter [ndarray]
+        stress_at = strain at which the stress was evaluated [float]
+        cancelled = whether the sweep was cancelled [bool]
+    """
+    rows = [[] for _ in starts]
+    cancelled = False
+
+    with SharedDataset.create(df, _COLUMNS) as dataset:
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(dataset, list(mat_char), extrap_type,
+                                           strain_at)) as pool:
+            futures = {pool.submit(_fit_row, mode, int(start), [int(e) for e in ends]): i
+                       for i, start in enumerate(starts)}
+
+            for done, future in enumerate(as_completed(futures), 1):
+                rows[futures[future]] = future.result()
+
+                if progress is not None:
+                    progress(done, len(starts))
+
+                if cancel is not None and cancel.is_set():
+                    # running rows finish, queued rows are dropped
+                    for pending in futures:
+                        pending.cancel()
+                    cancelled = True
+                    break
+
+    parameter_no = max((len(p) for row in rows for _, p in row), default=0)
+
+    stress = np.full((len(starts), len(ends)), np.nan)
+    parameters = np.full((len(starts), len(ends), parameter_no), np.nan)
+
+    for i, row in enumerate(rows):
+        for j, (stress_at, parameter) in enumerate(row):
+            stress[i, j] = stress_at
+            if parameter:
+                parameters[i, j] = parameter
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        stability = (np.nanstd(parameters, axis=(0, 1)) /
+                     np.abs(np.nanmean(parameters, axis=(0, 1))))
+
+    return {"starts": np.asarray(starts), "ends": np.asarray(ends), "stress": stress,
+            "parameters": parameters, "stability": stability, "strain_at": strain_at,
+            "cancelled": cancelled}
@@ -0,0 +1,196 @@
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import \
+    FigureCanvasQTAgg as FigureCanvas
+from PyQt5.QtWidgets import (QDialog, QPushButton, QDialogButtonBox, QLabel, QComboBox,
+                             QVBoxLayout, QHBoxLayout, QSizePolicy)
+from PyQt5.QtGui import QFont
+
+
+class SweepDialog(QDialog):
+    """
+    Dialog window showing the sensitivity of the extrapolated curve
+    to the fit windows.
+    """
+
+    def __init__(self, parameter_names: list[str], parent=None) -> None:
+        """
+        Sweep Dialogs init function.
+        ...
+
+        Parameter
+        ---------
+        parameter_names: list[str]
+            names of the parameters of the selected extrapolation method
+        parent: QWidget
+            parent widget of the dialog, defaults to None.
+
+        Return
+        ------
+        None
+        """
+        super().__init__(parent)
+
+        self._parameter_names = parameter_names
+
+        self.setWindowTitle("Fit Window Sweep")
+        self.resize(1000, 500)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self._create_fonts()
+        self._create_lbls()
+        self._create_cmbs()
+        self._create_btns()
+        self._create_graph()
+        self._layout = QVBoxLayout()
+        self._layout_ctrl = QHBoxLayout()
+        self.setLayout(self._layout)
+
+        self._layout_ctrl.addWidget(self._lbl_mode)
+        self._layout_ctrl.addWidget(self.cmb_mode)
+        self._layout_ctrl.addWidget(self.btn_run)
+        self._layout_ctrl.addWidget(self.lbl_progress)
+        self._layout_ctrl.addStretch()
+        self._layout.addLayout(self._layout_ctrl)
+        self._layout.addWidget(self._graph)
+        self._layout.addWidget(self.btnbx)
+
+    def _create_btns(self) -> None:
+        """
+        Create the buttons for the dialog.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Return
+        ------
+        None
+        """
+        self.btnbx = QDialogButtonBox(QDialogButtonBox.Close)
+
+        self.btn_run = QPushButton("Run Sweep")
+        self.btn_run.setFont(self._font)
+
+    def _create_lbls(self) -> None:
+        """
+        Create the labels necessary for the dialog.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self._lbl_mode = QLabel("Window")
+        self._lbl_mode.setFont(self._font)
+
+        self.lbl_progress = QLabel()
+        self.lbl_progress.setFont(self._font)
+
+    def _create_cmbs(self) -> None:
+        """
+        Create the comboboxes necessary for the dialog.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self.cmb_mode = QComboBox()
+        self.cmb_mode.setFixedSize(250, 25)
+        self.cmb_mode.setFont(self._font)
+        self.cmb_mode.addItems(["Plastic Fit Window", "Youngs Modulus Window"])
+
+    def _create_graph(self) -> None:
+        """
+        Create the graph for the heat map and the parameter stability.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self._graph = FigureCanvas(Figure())
+        self._graph.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+        self._axes_map, self._axes_stability = self._graph.figure.subplots(
+            1, 2, gridspec_kw={"width_ratios": [3, 2]})
+        self._colorbar = None
+
+    def _create_fonts(self) -> None:
+        """
+        Create the fonts necessary for the dialog.
+        ...
+
+        Parameter
+        ---------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self._font = QFont("Calibri", 12)
+
+    def set_running(self, running: bool) -> None:
+        """
+        Switch the run button to cancel a running sweep and lock the window
+        selection while the sweep is running.
+        """
+        self.btn_run.setText("Cancel Sweep" if running else "Run Sweep")
+        self.cmb_mode.setEnabled(not running)
+
+    def show_progress(self, done: int, total: int) -> None:
+        """
+        Show the number of finished rows of the sweep grid.
+        """
+        self.lbl_progress.setText(f"{done} of {total} rows")
+
+    def show_result(self, result: dict) -> None:
+        """
+        Plot the result of a fit window sweep.
+        ...
+
+        Parameter
+        ---------
+        result: dict
+            result as returned by cf_sweep.sweep_fit_window
+
+        Returns
+        -------
+        None
+        """
+        if self._colorbar is not None:
+            self._colorbar.remove()
+        self._axes_map.cla()
+        self._axes_stability.cla()
+
+        stress = np.ma.masked_invalid(result["stress"])
+        image = self._axes_map.pcolormesh(result["ends"], result["starts"], stress,
+                                          shading="nearest", cmap="viridis")
+        self._colorbar = self._graph.figure.colorbar(image, ax=self._axes_map)
+        self._colorbar.set_label(f"Stress at strain {result['strain_at']:g}")
+        self._axes_map.set_xlabel("Window End Index")
+        self._axes_map.set_ylabel("Window Start Index")
+        self._axes_map.set_title("Extrapolated Stress")
+
+        names = self._parameter_names[:len(result["stability"])]
+        self._axes_stability.bar(names, result["stability"]*100)
+        self._axes_stability.set_ylabel("Coefficient of Variation [%]")
+        self._axes_stability.set_title("Parameter Stability")
+        self._axes_stability.grid(True, axis="y")
+
+        self._graph.figure.tight_layout()
+        self._graph.draw_idle()
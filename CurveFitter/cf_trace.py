@@ -0,0 +1,122 @@
+import json
+import tracemalloc
+from time import perf_counter
+from datetime import datetime
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+
+class Trace:
+    """
+    Structured record of the stages of a model pipeline run.
+    Every stage records its wall time, memory delta and additional
+    information provided by the stage (e.g. array sizes or the number of
+    function evaluations of a fit).
+    """
+
+    def __init__(self, name: str = "", memory: bool = False) -> None:
+        """
+        Trace init function.
+        ...
+
+        Parameter
+        ---------
+        name: str
+            name identifying the traced run (e.g. the input file)
+        memory: bool, default = False
+            trace memory deltas with tracemalloc. Memory tracing slows
+            down numpy heavy stages noticeably.
+
+        Returns
+        -------
+        None
+        """
+        self.name = name
+        self.date = datetime.now().isoformat(timespec="seconds")
+        self.stages: list[dict] = []
+        self._memory = memory
+        self._depth = 0
+
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name: str, **info):
+        """
+        Context manager recording one stage. The yielded dict can be used
+        to add information to the stage record.
+        ...
+
+        Parameter
+        ---------
+        name: str
+            name of the stage
+        info:
+            additional information to be recorded
+
+        Returns
+        -------
+        _: dict
+            the record of the stage
+        """
+        record = {"stage": name, "depth": self._depth, **info}
+        self.stages.append(record)
+        self._depth += 1
+
+        if self._memory:
+            mem_0 = tracemalloc.get_traced_memory()[0]
+        t_0 = perf_counter()
+
+        try:
+            yield record
+        except Exception as error:
+            record["error"] = f"{type(error).__name__}: {error}"
+            raise
+        finally:
+            record["time"] = perf_counter() - t_0
+            if self._memory:
+                record["mem_delta"] = tracemalloc.get_traced_memory()[0] - mem_0
+            self._depth -= 1
+
+    def total_time(self) -> float:
+        """
+        Summed wall time of all top level stages [s].
+        """
+        return sum(s["time"] for s in self.stages if s["depth"] == 0 and "time" in s)
+
+    def to_dict(self) -> dict:
+        """
+        Trace as a JSON serializable dict.
+        """
+        return {"name": self.name, "date": self.date, "total_time": self.total_time(),
+                "stages": self.stages}
+
+    def write_json_line(self, path: Path) -> None:
+        """
+        Append the trace as one JSON line to the given file.
+        ...
+
+        Parameter
+        ---------
+        path: Path
+            path to the JSON lines log file
+
+        Returns
+        -------
+        None
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(path, "a") as file:
+            file.write(json.dumps(self.to_dict(), default=float) + "\n")
+
+
+def trace_stage(trace: Trace | None, name: str, **info):
+    """
+    Context manager recording a stage in the given trace. If trace is None
+    nothing is recorded and an unused dict is yielded instead.
+    """
+    if trace is None:
+        return nullcontext({})
+
+    return trace.stage(name, **info)
@@ -0,0 +1,354 @@
+import re
+import json
+from pathlib import Path
+
+import numpy as np
+
+from cf_library import update_library
+
+
+# name, file suffix and description of the additional export targets
+FORMATS = {"mat123": (".mat123.k", "LS-Dyna *MAT_123"),
+           "abaqus": (".inp", "Abaqus *PLASTIC"),
+           "pamcrash": (".pc", "PAM-CRASH"),
+           "json": (".json", "JSON"),
+           "csv": (".curve.csv", "CSV")}
+
+# targets which are keyword files and can be merged into a library
+_KEYWORD_FORMATS = ("mat123",)
+
+# characters not allowed in Abaqus names
+_ABAQUS_INVALID = re.compile(r"[^A-Za-z0-9_\-.]")
+
+
+def _short_exponent(text: str) -> str:
+    """
+    Drop the leading zero of an exponent (1e-05 -> 1e-5) to save a character.
+    """
+    return text.replace("e-0", "e-").replace("e+0", "e+")
+
+
+def fixed_width(values: np.ndarray, width: int | None = 20, digits: int = 10) -> list[str]:
+    """
+    Format values right-aligned in fields of a fixed width, e.g. the 10 or
+    20 character fields of LS-Dyna cards. The precision is chosen per value:
+    values are written with the given number of significant digits, values
+    in exponent notation or not fitting into the field are reformatted with
+    one digit less until they fit. Small strains therefore keep their
+    significant digits (1.234567891e-5 instead of 0.0), while 10 digits
+    avoid writing the binary representation error of the fitted curve
+    (0.41000000000000003).
+    The values are not formatted with vectorized numpy string functions:
+    one preformatted %-specification is mapped over the values as Python
+    floats, which measured faster than np.char.mod and np.savetxt. Only the
+    few values needing a different precision are formatted again.
+    ...
+
+    Parameter
+    ---------
+    values: ndarray
+        values to be formatted
+    width: int | None, default = 20
+        width of the fields, None for unpadded values without length limit
+    digits: int, default = 10
+        maximum number of significant digits
+
+    Returns
+    -------
+    _: list[str]
+        formatted fields
+    """
+    values = np.asarray(values, dtype=np.float64).ravel().tolist()
+    fields = list(map(f"%{width or ''}.{digits}g".__mod__, values))
+
+    refit = [i for i, field in enumerate(fields)
+             if "e" in field or (width is not None and len(field) > width)]
+
+    for i in refit:
+        for precision in range(digits, 0, -1):
+            field = _short_exponent(f"{values[i]:.{precision}g}")
+            if width is None or len(field) <= width:
+                break
+        fields[i] = field.rjust(width or 0)
+
+    return fields
+
+
+def target_path(path: Path, fmt: str) -> Path:
+    """
+    Path of an additional export target, next to the *MAT_24 file.
+    ...
+
+    Parameter
+    ---------
+    path: Path
+        path of the *MAT_24 file
+    fmt: str
+        name of the format, see FORMATS
+
+    Returns
+    -------
+    _: Path
+        path of the target
+    """
+    return path.with_name(path.stem + FORMATS[fmt][0])
+
+
+def _curve_rows(fields: dict, key: str) -> str:
+    """
+    Data cards of a curve from the formatted fields, one point per line.
+    """
+    strain, stress = fields[key]
+
+    return "\n".join(map(str.__add__, strain, stress))
+
+
+def mat123_text(material: dict, fields: dict) -> str:
+    """
+    *MAT_MODIFIED_PIECEWISE_LINEAR_PLASTICITY card referencing a
+    *DEFINE_CURVE with the yield curve, the curve id is the material id.
+    ...
+
+    Parameter
+    ---------
+    material: dict
+        material data, see write_targets
+    fields: dict
+        formatted points, see write_targets
+
+    Returns
+    -------
+    _: str
+        content of the keyword file
+    """
+    mid = material["mid"]
+
+    return ("*KEYWORD\n"
+            "*MAT_MODIFIED_PIECEWISE_LINEAR_PLASTICITY_TITLE\n"
+            "$# title\n"
+            f"{material['title']}\n"
+            "$#     mid        ro         e        pr      sigy      etan      fail      tdel\n"
+            f"{mid:>10}{material['ro']:>10}{fixed_width(material['E'], 10)[0]}{material['pr']:>10}"
+            f"         0         0{material['fail']:>10}\n"
+            "$#       c         p      lcss      lcsr        vp   epsthin    epsmaj    numint\n"
+            f"         0         0{mid:>10}         0         0         0       0.0         0\n"
+            "$#    eps1      eps2      eps3      eps4      eps5      eps6      eps7      eps8\n"
+            "\n"
+            "$#     es1       es2       es3       es4       es5       es6       es7       es8\n"
+            "\n"
+            "*DEFINE_CURVE\n"
+            "$#    lcid      sidr       sfa       sfo      offa      offo    dattyp\n"
+            f"{mid:>10}         0       1.0       1.0       0.0       0.0\n"
+            "$#                a1                  o1\n"
+            f"{_curve_rows(fields, 'dyna')}\n"
+            "*END\n")
+
+
+def abaqus_name(title: str) -> str:
+    """
+    Material name for Abaqus from the title. Characters other than letters,
+    digits, "_", "-" and "." (e.g. blanks and commas, which break the
+    keyword line) are replaced by "_", the name starts with a letter and is
+    at most 80 characters long.
+    """
+    name = _ABAQUS_INVALID.sub("_", title.strip())
+    if not name[:1].isalpha():
+        name = "M_" + name
+
+    return name[:80]
+
+
+def abaqus_text(material: dict, fields: dict) -> str:
+    """
+    Abaqus *MATERIAL definition with *ELASTIC and a *PLASTIC table (yield
+    stress, plastic strain).
+    ...
+
+    Parameter
+    ---------
+    material: dict
+        material data, see write_targets
+    fields: dict
+        formatted points, see write_targets
+
+    Returns
+    -------
+    _: str
+        content of the input file
+    """
+    strain, stress = fields["abaqus"]
+    rows = "\n".join(map(",".join, zip(stress, strain)))
+
+    return (f"** {material['title']}, MID {material['mid']}\n"
+            f"*MATERIAL, NAME={abaqus_name(material['title'])}\n"
+            "*DENSITY\n"
+            f"{material['ro']},\n"
+            "*ELASTIC\n"
+            f"{fixed_width(material['E'], None)[0]}, {material['pr']}\n"
+            "*PLASTIC\n"
+            f"{rows}\n")
+
+
+def pamcrash_text(material: dict, fields: dict) -> str:
+    """
+    PAM-CRASH elastic-plastic material (type 103) referencing a FUNCT with
+    the yield curve, the function id is the material id. Fields are 10
+    characters wide for the material and 20 for the curve points.
+    ...
+
+    Parameter
+    ---------
+    material: dict
+        material data, see write_targets
+    fields: dict
+        formatted points, see write_targets
+
+    Returns
+    -------
+    _: str
+        content of the include file
+    """
+    mid = material["mid"]
+
+    return ("#\n"
+            f"# {material['title']}\n"
+            "#\n"
+            "#         IDMAT  MATYP             RHO   ISINT   ISHG  ISTRAT  IFROZ\n"
+            f"MATER / {mid:>8}    103{material['ro']:>16}       0      0       0      0\n"
+            f"NAME {material['title']}\n"
+            "#                 E      NU\n"
+            f"{fixed_width(material['E'], 20)[0]}{material['pr']:>8}\n"
+            "#            IFUNC        EPS_MAX\n"
+            f"{mid:>18}{material['fail']:>15}\n"
+            "END_MATER\n"
+            "#\n"
+            "#        IDFUN\n"
+            f"FUNCT / {mid:>8}\n"
+            f"NAME {material['title']} yield curve\n"
+            "#           plastic strain        yield stress\n"
+            f"{_curve_rows(fields, 'pamcrash')}\n"
+            "END_FUNCT\n")
+
+
+def json_text(material: dict, strain: np.ndarray, stress: np.ndarray) -> str:
+    """
+    Exchange format with the material data, the fitted law and the points
+    of the yield curve in full precision.
+    ...
+
+    Parameter
+    ---------
+    material: dict
+        material data, see write_targets
+    strain: ndarray
+        plastic strain of the exported points
+    stress: ndarray
+        yield stress of the exported points
+
+    Returns
+    -------
+    _: str
+        content of the JSON file
+    """
+    data = {key: material[key] for key in ("title", "mid", "ro", "E", "pr", "fail")}
+    data["law"] = material.get("law")
+    data["parameter"] = [float(p) for p in material.get("parameter", [])]
+    data["plastic_strain"] = strain.tolist()
+    data["yield_stress"] = stress.tolist()
+
+    return json.dumps(data, indent=2)
+
+
+def csv_text(material: dict, strain: np.ndarray, stress: np.ndarray) -> str:
+    """
+    Exchange format with the points of the yield curve in full precision,
+    the material data is written as comment lines.
+    ...
+
+    Parameter
+    ---------
+    material: dict
+        material data, see write_targets
+    strain: ndarray
+        plastic strain of the exported points
+    stress: ndarray
+        yield stress of the exported points
+
+    Returns
+    -------
+    _: str
+        content of the CSV file
+    """
+    header = "".join(f"# {key}: {material[key]}\n"
+                     for key in ("title", "mid", "ro", "E", "pr", "fail"))
+    rows = "\n".join(map("{!r},{!r}".format, strain.tolist(), stress.tolist()))
+
+    return f"{header}plastic_strain,yield_stress\n{rows}\n"
+
+
+def write_targets(material: dict, strain: np.ndarray, stress: np.ndarray, path: Path,
+                  formats: list[str], incremental: bool = True) -> dict[str, Path]:
+    """
+    Write the exported points of a yield curve to additional targets next
+    to the *MAT_24 file. The points are sampled once by the caller and every
+    distinct field layout is formatted once for all targets using it.
+    ...
+
+    Parameter
+    ---------
+    material: dict
+        title, mid, ro, pr, fail [str], E [float] and optionally the fitted
+        law and its parameter
+    strain: ndarray
+        plastic strain of the exported points
+    stress: ndarray
+        yield stress of the exported points
+    path: Path
+        path of the *MAT_24 file
+    formats: list[str]
+        names of the targets, see FORMATS
+    incremental: bool, default = True
+        merge keyword targets into existing files, see cf_library.update_library
+
+    Returns
+    -------
+    _: dict[str, Path]
+        path per written target
+    """
+    strain = np.asarray(strain, dtype=np.float64)
+    stress = np.asarray(stress, dtype=np.float64)
+
+    layouts = {"mat123": "dyna", "pamcrash": "pamcrash", "abaqus": "abaqus"}
+    widths = {"dyna": 20, "pamcrash": 20, "abaqus": None}
+    fields = {}
+    for fmt in formats:
+        layout = layouts.get(fmt)
+        if layout is not None and layout not in fields:
+            fields[layout] = (fixed_width(strain, widths[layout]),
+                              fixed_width(stress, widths[layout]))
+
+    paths = {}
+    for fmt in formats:
+        if fmt == "mat123":
+            text = mat123_text(material, fields)
+        elif fmt == "abaqus":
+            text = abaqus_text(material, fields)
+        elif fmt == "pamcrash":
+            text = pamcrash_text(material, fields)
+        elif fmt == "json":
+            text = json_text(material, strain, stress)
+        elif fmt == "csv":
+            text = csv_text(material, strain, stress)
+        else:
+            raise ValueError(f"Unknown export format {fmt}.")
+
+        fmt_path = target_path(path, fmt)
+        if incremental and fmt in _KEYWORD_FORMATS:
+            fmt_path.touch(exist_ok=True)
+            update_library(fmt_path, [text])
+        else:
+            fmt_path.write_text(text)
+
+        paths[fmt] = fmt_path
+
+    return paths
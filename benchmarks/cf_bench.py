@@ -0,0 +1,317 @@
+"""
+Benchmark suite for the *MAT_24 CurveFitter model.
+
+Generates synthetic tensile curves and times every stage of the model
+separately. Results are written as JSON so that runs can be compared
+over time.
+
+Example:
+    python cf_bench.py --sizes 1e3 1e4 1e5 --out results.json
+"""
+import sys
+import json
+import platform
+import tracemalloc
+import argparse
+from time import perf_counter
+from pathlib import Path
+from datetime import datetime
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import pandas as pd
+import scipy
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent/"CurveFitter"))
+
+import cf_model  # noqa: E402
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+EXTRAP_TYPES = {0: "swift", 1: "voce", 2: "swift_voce"}
+
+NECKING_METHODS = {1: "bridgman", 2: "weighted_average"}
+
+
+def synthetic_curve(point_no: int, E: float = 210000, law: str = "swift",
+                    law_parameter: tuple[float, ...] | None = None, noise: float = 0.0,
+                    failure_drop: float = 0.2, necking_strain: float = 0.05,
+                    seed: int = 0) -> pd.DataFrame:
+    """
+    Generate a synthetic engineering stress - strain curve.
+    ...
+
+    Parameter
+    ---------
+    point_no: int
+        number of data points of the curve
+    E: float, default = 210000
+        slope of the elastic part (youngs modulus)
+    law: str, default = "swift"
+        hardening law of the true plastic part ("swift" or "voce")
+    law_parameter: tuple[float, ...] | None
+        parameters of the hardening law (c, phi, n) for Swift or
+        (sigma, R, B) for Voce. Defaults to a typical steel.
+    noise: float, default = 0.0
+        standard deviation of gaussian noise relative to the maximum stress
+    failure_drop: float, default = 0.2
+        relative drop of the engineering stress between Rm and fracture
+    necking_strain: float, default = 0.05
+        engineering strain between Rm and fracture
+    seed: int, default = 0
+        seed of the random number generator
+
+    Returns
+    -------
+    _: DataFrame
+        dataframe with the columns "strain" and "stress"
+    """
+    rng = np.random.default_rng(seed)
+
+    if law == "swift":
+        c, phi, n = law_parameter or (1000, 0.01, 0.2)
+
+        def flow(eps_p):
+            return c*(phi+eps_p)**n
+    elif law == "voce":
+        sigma, R, B = law_parameter or (300, 250, 15)
+
+        def flow(eps_p):
+            return sigma + R*(1-np.exp(-B*eps_p))
+    else:
+        raise ValueError(f"Unknown hardening law {law}.")
+
+    # Points are spread over the elastic part, uniform elongation, necking
+    # and the final failure drop.
+    elastic_no = max(point_no//10, 10)
+    drop_no = max(point_no//100, 5)
+    hardening_no = (point_no - elastic_no - drop_no)*2//3
+    necking_no = point_no - elastic_no - drop_no - hardening_no
+
+    sig_y = flow(0.0)
+    elastic_stress = np.linspace(0, sig_y, elastic_no, endpoint=False)
+    elastic_strain = elastic_stress/E
+
+    # Uniform elongation up to the Considère criterion (max. eng. stress)
+    eps_p = np.linspace(0, 1, 100000)
+    true_stress = flow(eps_p)
+    true_strain = eps_p + true_stress/E
+    eng_stress_all = true_stress/np.exp(true_strain)
+    m = int(np.argmax(eng_stress_all))
+    eps_p_grid = np.linspace(0, eps_p[m], hardening_no)
+    true_stress = flow(eps_p_grid)
+    true_strain = eps_p_grid + true_stress/E
+    hardening_strain = np.exp(true_strain) - 1
+    hardening_stress = true_stress/np.exp(true_strain)
+
+    rm = hardening_stress[-1]
+    ag = hardening_strain[-1]
+
+    t = np.linspace(0, 1, necking_no+1)[1:]
+    necking_strain_arr = ag + necking_strain*t
+    necking_stress = rm*(1-failure_drop*t**2)
+
+    drop_strain = necking_strain_arr[-1] + np.linspace(0, 1e-4, drop_no+1)[1:]
+    drop_stress = np.linspace(necking_stress[-1], 0, drop_no+1)[1:]
+
+    strain = np.concatenate([elastic_strain, hardening_strain, necking_strain_arr, drop_strain])
+    stress = np.concatenate([elastic_stress, hardening_stress, necking_stress, drop_stress])
+
+    if noise > 0:
+        stress = stress + rng.normal(0, noise*rm, stress.shape)
+        stress[0] = 0
+
+    return pd.DataFrame({"strain": strain, "stress": stress})
+
+
+def _measure(func, *args, **kwargs) -> tuple:
+    """
+    Call the given function and measure wall time and peak memory.
+    ...
+
+    Returns
+    -------
+    _: tuple
+        0 = return value of the function
+        1 = wall time [s]
+        2 = peak memory allocated during the call [bytes]
+    """
+    tracemalloc.reset_peak()
+    mem_0 = tracemalloc.get_traced_memory()[0]
+    t_0 = perf_counter()
+    res = func(*args, **kwargs)
+    t_1 = perf_counter()
+    peak = tracemalloc.get_traced_memory()[1] - mem_0
+
+    return res, t_1 - t_0, peak
+
+
+def necking_sensitivity(df: pd.DataFrame, mat_char: list, method: int,
+                        change: float = 0.1) -> float:
+    """
+    Largest relative change of the necking correction if the engineering
+    stress beyond Rm is raised by the given fraction. A correction which
+    does not use the measured post-necking data returns 0.
+    """
+    reference = cf_model.comp_necking_correction(df, mat_char[3], mat_char[4], mat_char[2],
+                                                 method)[1]
+
+    changed = df[["eng_strain", "eng_stress"]].copy()
+    changed.iloc[mat_char[4]+1:, 1] *= 1+change
+    stress = cf_model.comp_necking_correction(changed, mat_char[3], mat_char[4], mat_char[2],
+                                              method)[1]
+
+    if reference.size == 0 or stress.size != reference.size:
+        return float("nan")
+
+    return float(np.max(np.abs(stress/reference - 1)))
+
+
+def bench_size(point_no: int, work_dir: Path, repeat: int, law: str, noise: float,
+               seed: int, E: float = 210000, failure_drop: float = 0.2) -> list[dict]:
+    """
+    Benchmark all model stages for a synthetic curve of the given size.
+    ...
+
+    Parameter
+    ---------
+    point_no: int
+        number of data points of the synthetic curve
+    work_dir: Path
+        directory for the generated input and output files
+    repeat: int
+        number of repetitions of every stage
+    law: str
+        hardening law of the synthetic curve
+    noise: float
+        relative noise of the synthetic curve
+    seed: int
+        seed of the random number generator
+    E: float, default = 210000
+        youngs modulus of the synthetic curve
+    failure_drop: float, default = 0.2
+        relative drop of the engineering stress between Rm and fracture
+
+    Returns
+    -------
+    _: list[dict]
+        one record per stage
+    """
+    csv_path = work_dir/f"synthetic_{point_no}.csv"
+    synthetic_curve(point_no, E=E, law=law, noise=noise, failure_drop=failure_drop,
+                    seed=seed).to_csv(csv_path, sep=";", index=False)
+
+    out_path = work_dir/"out.k"
+    out_path.touch()
+    template_path = ROOT/"data"/"Mat_24_template.k"
+    export_input = ["Bench", "1", "7.85e-9", "0.3", "0.2", "100", str(out_path), "uneven"]
+
+    # Youngs modulus is fitted on the first half of the elastic part
+    e_end = max(point_no//20, 5)
+
+    timings: dict[str, list[tuple[float, int]]] = {}
+
+    def record(stage, t, peak):
+        timings.setdefault(stage, []).append((t, peak))
+
+    for _ in range(repeat):
+        df, t, peak = _measure(cf_model.get_data_from_file, csv_path)
+        record("get_data_from_file", t, peak)
+
+        df, t, peak = _measure(cf_model.screen_data, df)
+        record("screen_data", t, peak)
+
+        _, t, peak = _measure(cf_model.smooth_data, df, 1)
+        record("smooth_data[savgol]", t, peak)
+
+        mat_char, t, peak = _measure(cf_model.comp_material_data, df, 0, e_end)
+        record("comp_material_data", t, peak)
+
+        df, t, peak = _measure(cf_model.comp_true_stress_strain, df, mat_char[3], mat_char[4])
+        record("comp_true_stress_strain", t, peak)
+
+        for method, name in NECKING_METHODS.items():
+            _, t, peak = _measure(cf_model.comp_necking_correction, df, mat_char[3],
+                                  mat_char[4], mat_char[2], method)
+            record(f"comp_necking_correction[{name}]", t, peak)
+
+        for extrap_type, name in EXTRAP_TYPES.items():
+            fitted, t, peak = _measure(
+                cf_model.extrapolate, [df, mat_char[3], mat_char[4], mat_char[5], mat_char[2]],
+                extrap_type)
+            record(f"extrapolate[{name}]", t, peak)
+
+        _, t, peak = _measure(cf_model.export_data, export_input, fitted, mat_char[0],
+                              str(out_path), str(template_path))
+        record("export_data", t, peak)
+
+    sensitivities = {f"comp_necking_correction[{name}]": necking_sensitivity(df, mat_char, method)
+                     for method, name in NECKING_METHODS.items()}
+
+    records = []
+    for stage, values in timings.items():
+        times = [v[0] for v in values]
+        records.append({"stage": stage, "point_no": point_no, "law": law, "noise": noise,
+                        "E": E, "failure_drop": failure_drop, "repeat": repeat, "time_min": min(times),
+                        "time_median": float(np.median(times)),
+                        "peak_memory": max(v[1] for v in values)})
+        if stage in sensitivities:
+            records[-1]["sensitivity"] = sensitivities[stage]
+
+    return records
+
+
+def main() -> None:
+    """
+    Run the benchmark suite from the command line.
+    """
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", type=float, default=[1e3, 1e4, 1e5],
+                        help="number of data points of the synthetic curves (1e3 - 1e7)")
+    parser.add_argument("--law", choices=["swift", "voce"], default="swift",
+                        help="hardening law of the synthetic curves")
+    parser.add_argument("--noise", type=float, default=0.001,
+                        help="relative noise of the synthetic curves")
+    parser.add_argument("--modulus", type=float, default=210000,
+                        help="youngs modulus of the synthetic curves [MPa]")
+    parser.add_argument("--failure-drop", type=float, default=0.2,
+                        help="relative drop of the engineering stress between Rm and fracture")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="number of repetitions of every stage")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, default=None,
+                        help="path of the JSON result file (default: stdout)")
+    args = parser.parse_args()
+
+    tracemalloc.start()
+
+    records = []
+    with TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            records.extend(bench_size(int(size), Path(tmp), args.repeat, args.law,
+                                      args.noise, args.seed, args.modulus, args.failure_drop))
+
+    result = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "scipy": scipy.__version__,
+        "results": records,
+    }
+
+    if args.out is None:
+        json.dump(result, sys.stdout, indent=2)
+        print()
+    else:
+        args.out.write_text(json.dumps(result, indent=2))
+        for record in records:
+            print(f"{record['point_no']:>10} {record['stage']:<44} "
+                  f"{record['time_min']*1000:>10.2f} ms {record['peak_memory']/2**20:>10.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
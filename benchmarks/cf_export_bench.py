@@ -0,0 +1,185 @@
+"""
+Export benchmark of the *MAT_24 CurveFitter.
+
+Generates a library of fitted yield curves (Swift law with random
+parameters) and compares the per-point formatting of the fields used
+before (str(round(value, 3)).rjust(20)) with the adaptive
+formatter cf_writers.fixed_width. Reported are the formatting time of all
+cards, the largest relative error of the written values and the time of a
+bulk export of every card into its own keyword file with
+cf_model.export_data.
+
+Example:
+    python cf_export_bench.py --cards 100 1000 --out export_results.json
+"""
+import sys
+import json
+import platform
+import argparse
+from time import perf_counter
+from pathlib import Path
+from datetime import datetime
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent/"CurveFitter"))
+
+import cf_model  # noqa: E402
+from cf_writers import fixed_width  # noqa: E402
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def synthetic_cards(card_no: int, seed: int = 0) -> list[tuple[np.ndarray, np.ndarray]]:
+    """
+    Generate extrapolated Swift yield curves as returned by
+    cf_model.extrapolate (101 points between 0 and 100 % plastic strain).
+    The plastic strain starts at 1e-5 instead of 0, like curves starting
+    at a small offset strain.
+    ...
+
+    Parameter
+    ---------
+    card_no: int
+        number of curves
+    seed: int, default = 0
+        seed of the random number generator
+
+    Returns
+    -------
+    _: list[tuple[ndarray, ndarray]]
+        plastic strain and yield stress per curve
+    """
+    rng = np.random.default_rng(seed)
+    strain = np.linspace(0, 1, 101)
+    strain[0] = 1e-5
+
+    cards = []
+    for c, phi, n in zip(rng.uniform(600, 1600, card_no), rng.uniform(0.001, 0.05, card_no),
+                         rng.uniform(0.05, 0.3, card_no)):
+        cards.append((strain, c*(phi + strain)**n))
+
+    return cards
+
+
+def legacy_fields(values: np.ndarray) -> list[str]:
+    """
+    Fields as formatted by export_data before the adaptive formatter.
+    """
+    return [str(round(value, 3)).rjust(20) for value in values]
+
+
+def _relative_error(fields, values: np.ndarray) -> float:
+    """
+    Largest relative error of the written values.
+    """
+    written = np.array([float(field) for field in fields])
+
+    return float(np.max(np.abs(written - values)/np.abs(values)))
+
+
+def bench_cards(card_no: int, work_dir: Path, repeat: int, seed: int) -> list[dict]:
+    """
+    Benchmark formatting and exporting the given number of cards.
+    ...
+
+    Parameter
+    ---------
+    card_no: int
+        number of cards
+    work_dir: Path
+        directory for the exported keyword files
+    repeat: int
+        number of repetitions of the formatting
+    seed: int
+        seed of the random number generator
+
+    Returns
+    -------
+    _: list[dict]
+        one record per formatter and one of the bulk export
+    """
+    cards = synthetic_cards(card_no, seed)
+    formatters = {"legacy": legacy_fields, "fixed_width": fixed_width}
+
+    records = []
+    for name, formatter in formatters.items():
+        times = []
+        for _ in range(repeat):
+            t_0 = perf_counter()
+            for strain, stress in cards:
+                formatter(strain)
+                formatter(stress)
+            times.append(perf_counter() - t_0)
+
+        strain, stress = cards[0]
+        records.append({"stage": f"format[{name}]", "card_no": card_no, "repeat": repeat,
+                        "time_min": min(times), "time_median": float(np.median(times)),
+                        "strain_error": _relative_error(formatter(strain), strain),
+                        "stress_error": _relative_error(formatter(stress), stress)})
+
+    template_path_str = str(ROOT/"data"/"Mat_24_template.k")
+    paths = [work_dir/f"card_{card_no}_{mid}.k" for mid in range(1, card_no + 1)]
+    for path in paths:
+        path.write_text("")
+
+    t_0 = perf_counter()
+    for mid, ((strain, stress), path) in enumerate(zip(cards, paths), 1):
+        user_input = [f"Card {mid}", str(mid), "7.85e-9", "0.3", "0.5", "100", str(path),
+                      "equi"]
+        cf_model.export_data(user_input, [pd.Series(strain), pd.Series(stress)], 210000.0,
+                             str(path), template_path_str, incremental=False)
+    export_time = perf_counter() - t_0
+
+    records.append({"stage": "export_data", "card_no": card_no, "repeat": 1,
+                    "time_min": export_time, "time_median": export_time,
+                    "time_per_card": export_time/card_no})
+
+    return records
+
+
+def main() -> None:
+    """
+    Run the export benchmark from the command line.
+    """
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", nargs="+", type=int, default=[100, 1000],
+                        help="number of exported cards")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="number of repetitions of the formatting")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, default=None,
+                        help="path of the JSON result file (default: stdout)")
+    args = parser.parse_args()
+
+    records = []
+    with TemporaryDirectory() as tmp:
+        for card_no in args.cards:
+            records.extend(bench_cards(card_no, Path(tmp), args.repeat, args.seed))
+
+    result = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "results": records,
+    }
+
+    if args.out is None:
+        json.dump(result, sys.stdout, indent=2)
+        print()
+    else:
+        args.out.write_text(json.dumps(result, indent=2))
+        for record in records:
+            print(f"{record['card_no']:>8} {record['stage']:<22} "
+                  f"{record['time_min']*1000:>10.2f} ms "
+                  f"{record.get('strain_error', float('nan')):>10.2e} "
+                  f"{record.get('stress_error', float('nan')):>10.2e}")
+
+
+if __name__ == "__main__":
+    main()
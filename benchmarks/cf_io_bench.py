@@ -0,0 +1,185 @@
+"""
+I/O benchmark of the input formats of the *MAT_24 CurveFitter.
+
+Writes synthetic tensile curves as plain, gzip and zstd compressed .csv,
+Parquet and Arrow IPC files and times the import of every format with
+cf_model.get_data_from_file. Formats whose optional package (pyarrow,
+zstandard) is missing are skipped.
+
+Example:
+    python cf_io_bench.py --sizes 1e4 1e5 1e6 --out io_results.json
+"""
+import io
+import sys
+import gzip
+import json
+import platform
+import tracemalloc
+import argparse
+from time import perf_counter
+from pathlib import Path
+from datetime import datetime
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent/"CurveFitter"))
+
+import cf_model  # noqa: E402
+import cf_formats  # noqa: E402
+from cf_bench import synthetic_curve, _measure  # noqa: E402
+
+
+# name: (file suffix, compression codec of the columnar formats)
+FORMATS = {
+    "csv": (".csv", None),
+    "csv.gz": (".csv.gz", None),
+    "csv.zst": (".csv.zst", None),
+    "parquet[snappy]": (".parquet", "snappy"),
+    "parquet[zstd]": (".parquet", "zstd"),
+    "arrow": (".arrow", None),
+    "arrow[lz4]": (".arrow", "lz4"),
+}
+
+
+def _available(name: str) -> bool:
+    """
+    Whether the optional package needed for the format is installed.
+    """
+    if name == "csv.zst":
+        return cf_formats.zstandard is not None
+    if name.startswith(("parquet", "arrow")):
+        return cf_formats.pa is not None
+
+    return True
+
+
+def write_format(df: pd.DataFrame, name: str, path: Path) -> None:
+    """
+    Write a curve in the given format.
+    ...
+
+    Parameter
+    ---------
+    df: DataFrame
+        the curve
+    name: str
+        name of the format (see FORMATS)
+    path: Path
+        path of the file
+
+    Returns
+    -------
+    None
+    """
+    suffix, compression = FORMATS[name]
+
+    if name == "csv":
+        df.to_csv(path, sep=";", index=False)
+    elif name == "csv.gz":
+        with gzip.open(path, "wt") as f:
+            df.to_csv(f, sep=";", index=False)
+    elif name == "csv.zst":
+        text = io.StringIO()
+        df.to_csv(text, sep=";", index=False)
+        path.write_bytes(cf_formats.zstandard.ZstdCompressor().compress(
+            text.getvalue().encode()))
+    else:
+        cf_formats.write_columnar(df, path, compression)
+
+
+def bench_size(point_no: int, work_dir: Path, repeat: int, seed: int) -> list[dict]:
+    """
+    Benchmark writing and importing a synthetic curve of the given size in
+    all available formats.
+    ...
+
+    Parameter
+    ---------
+    point_no: int
+        number of data points of the synthetic curve
+    work_dir: Path
+        directory for the generated files
+    repeat: int
+        number of repetitions of every import
+    seed: int
+        seed of the random number generator
+
+    Returns
+    -------
+    _: list[dict]
+        one record per format
+    """
+    df = synthetic_curve(point_no, noise=0.001, seed=seed)
+
+    records = []
+    for name, (suffix, _) in FORMATS.items():
+        if not _available(name):
+            continue
+
+        path = work_dir/f"synthetic_{point_no}_{name.replace('[', '_').rstrip(']')}{suffix}"
+
+        t_0 = perf_counter()
+        write_format(df, name, path)
+        write_time = perf_counter() - t_0
+
+        times, peaks = [], []
+        for _ in range(repeat):
+            _, t, peak = _measure(cf_model.get_data_from_file, path)
+            times.append(t)
+            peaks.append(peak)
+
+        records.append({"format": name, "point_no": point_no, "repeat": repeat,
+                        "file_size": path.stat().st_size, "write_time": write_time,
+                        "time_min": min(times), "time_median": float(np.median(times)),
+                        "peak_memory": max(peaks)})
+
+    return records
+
+
+def main() -> None:
+    """
+    Run the I/O benchmark from the command line.
+    """
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", type=float, default=[1e4, 1e5, 1e6],
+                        help="number of data points of the synthetic curves")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="number of repetitions of every import")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, default=None,
+                        help="path of the JSON result file (default: stdout)")
+    args = parser.parse_args()
+
+    tracemalloc.start()
+
+    records = []
+    with TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            records.extend(bench_size(int(size), Path(tmp), args.repeat, args.seed))
+
+    result = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "pyarrow": cf_formats.pa.__version__ if cf_formats.pa is not None else None,
+        "results": records,
+    }
+
+    if args.out is None:
+        json.dump(result, sys.stdout, indent=2)
+        print()
+    else:
+        args.out.write_text(json.dumps(result, indent=2))
+        for record in records:
+            print(f"{record['point_no']:>10} {record['format']:<16} "
+                  f"{record['file_size']/2**20:>8.2f} MiB {record['time_min']*1000:>10.2f} ms "
+                  f"{record['peak_memory']/2**20:>10.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Warm start benchmark of the *MAT_24 CurveFitter.
+
+Generates a series of similar synthetic tensile curves (hardening law
+parameters scattered around a typical steel) and fits every curve twice:
+cold with the default initial guess and seeded with the parameters of the
+nearest previous fit found by cf_seeds.SeedStore. The fits are stored in a
+temporary database, so the seed index grows like in an interactive
+session. Reported are the function evaluations and wall time of both fits
+and the relative reduction of the evaluations.
+
+Example:
+    python cf_seed_bench.py --curves 50 --spread 0.05 --out seed_results.json
+"""
+import sys
+import json
+import platform
+import argparse
+from time import perf_counter
+from pathlib import Path
+from datetime import datetime
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import pandas as pd
+import scipy
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent/"CurveFitter"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import cf_model  # noqa: E402
+from cf_seeds import SeedStore  # noqa: E402
+from cf_database import CfDatabase  # noqa: E402
+from cf_bench import synthetic_curve, EXTRAP_TYPES  # noqa: E402
+
+
+BASE_PARAMETER = {"swift": (1000, 0.01, 0.2), "voce": (300, 250, 15)}
+
+LAWS = {name: law for law, name in EXTRAP_TYPES.items()}
+
+
+def prepare_curve(csv_path: Path, point_no: int) -> tuple[pd.DataFrame, list]:
+    """
+    Import a synthetic curve and compute the material characteristics and
+    the true stress - strain curve as the application does before a fit.
+    """
+    df = cf_model.screen_data(cf_model.get_data_from_file(csv_path))
+    mat_char = cf_model.comp_material_data(df, 0, max(point_no//20, 5))
+    df = cf_model.comp_true_stress_strain(df, mat_char[3], mat_char[4])
+
+    return df, mat_char
+
+
+def bench_seeds(curve_no: int, work_dir: Path, point_no: int, law: str, fit_law: str,
+                spread: float, noise: float, max_distance: float, seed: int) -> list[dict]:
+    """
+    Fit a series of similar curves cold and with warm start.
+    ...
+
+    Parameter
+    ---------
+    curve_no: int
+        number of synthetic curves
+    work_dir: Path
+        directory for the generated input files and the database
+    point_no: int
+        number of data points of every curve
+    law: str
+        hardening law of the synthetic curves
+    fit_law: str
+        fitted extrapolation law ("swift", "voce" or "swift_voce")
+    spread: float
+        relative standard deviation of the hardening law parameters
+    noise: float
+        relative noise of the synthetic curves
+    max_distance: float
+        maximum distance of a seed in the index
+    seed: int
+        seed of the random number generator
+
+    Returns
+    -------
+    _: list[dict]
+        one record per curve
+    """
+    rng = np.random.default_rng(seed)
+    extrap_type = LAWS[fit_law]
+
+    records = []
+    with CfDatabase(work_dir/"seed_bench.db") as db:
+        store = SeedStore(db, max_distance)
+
+        for i in range(curve_no):
+            parameter = np.array(BASE_PARAMETER[law])*(1 + spread*rng.standard_normal(3))
+            csv_path = work_dir/f"synthetic_{i}.csv"
+            synthetic_curve(point_no, law=law, law_parameter=tuple(parameter), noise=noise,
+                            seed=seed+i).to_csv(csv_path, sep=";", index=False)
+
+            df, mat_char = prepare_curve(csv_path, point_no)
+            data = [df, mat_char[3], mat_char[4], mat_char[5], mat_char[2]]
+
+            t_0 = perf_counter()
+            cold = cf_model.extrapolate(data, extrap_type)
+            t_cold = perf_counter() - t_0
+
+            found = store.nearest(mat_char, extrap_type)
+            t_0 = perf_counter()
+            seeded = cf_model.extrapolate(
+                data, extrap_type, initial_guess=found[1] if found is not None else None)
+            t_seeded = perf_counter() - t_0
+
+            fit_id = db.store_fit(f"hash_{seed}_{i}", f"Synthetic {i}", "", str(csv_path),
+                                  point_no, 0, max(point_no//20, 5), mat_char, extrap_type,
+                                  seeded[2], seeded[3]["nfev"],
+                                  found[0] if found is not None else None)
+            store.add(fit_id, mat_char, extrap_type, seeded[2])
+
+            records.append({"curve": i, "law": law, "fit_law": fit_law,
+                            "seeded": found is not None,
+                            "seed_distance": found[2] if found is not None else None,
+                            "nfev_cold": cold[3]["nfev"], "nfev_seeded": seeded[3]["nfev"],
+                            "time_cold": t_cold, "time_seeded": t_seeded,
+                            "method_seeded": seeded[3]["method"]})
+
+    return records
+
+
+def summarize(records: list[dict]) -> dict:
+    """
+    Mean function evaluations of the curves which found a seed and their
+    relative reduction against the cold fits.
+    """
+    seeded = [r for r in records if r["seeded"]]
+    if not seeded:
+        return {"seeded_no": 0}
+
+    nfev_cold = float(np.mean([r["nfev_cold"] for r in seeded]))
+    nfev_seeded = float(np.mean([r["nfev_seeded"] for r in seeded]))
+
+    return {"seeded_no": len(seeded), "nfev_cold": nfev_cold, "nfev_seeded": nfev_seeded,
+            "nfev_reduction": 1 - nfev_seeded/nfev_cold if nfev_cold else float("nan"),
+            "time_cold": float(np.mean([r["time_cold"] for r in seeded])),
+            "time_seeded": float(np.mean([r["time_seeded"] for r in seeded]))}
+
+
+def main() -> None:
+    """
+    Run the warm start benchmark from the command line.
+    """
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--curves", type=int, default=50,
+                        help="number of synthetic curves")
+    parser.add_argument("--points", type=int, default=2000,
+                        help="number of data points of every curve")
+    parser.add_argument("--law", choices=["swift", "voce"], default="swift",
+                        help="hardening law of the synthetic curves")
+    parser.add_argument("--fit-law", choices=list(LAWS), default="swift",
+                        help="fitted extrapolation law")
+    parser.add_argument("--spread", type=float, default=0.05,
+                        help="relative standard deviation of the hardening law parameters")
+    parser.add_argument("--noise", type=float, default=0.001,
+                        help="relative noise of the synthetic curves")
+    parser.add_argument("--max-distance", type=float, default=0.1,
+                        help="maximum distance of a seed in the index")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, default=None,
+                        help="path of the JSON result file (default: stdout)")
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp:
+        records = bench_seeds(args.curves, Path(tmp), args.points, args.law, args.fit_law,
+                              args.spread, args.noise, args.max_distance, args.seed)
+
+    summary = summarize(records)
+    result = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "arguments": {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()},
+        "summary": summary,
+        "results": records,
+    }
+
+    if args.out is None:
+        json.dump(result, sys.stdout, indent=2)
+        print()
+    else:
+        args.out.write_text(json.dumps(result, indent=2))
+        print(f"seeded fits: {summary['seeded_no']} of {len(records)}")
+        if summary["seeded_no"]:
+            print(f"mean nfev cold {summary['nfev_cold']:.1f}, seeded "
+                  f"{summary['nfev_seeded']:.1f}, reduction {summary['nfev_reduction']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
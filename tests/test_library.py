@@ -0,0 +1,98 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent/"CurveFitter"))
+
+from cf_library import TABLE_CURVE_START, read_deck, split_blocks, update_library  # noqa: E402
+from cf_ratefit import export_rate_table  # noqa: E402
+from cf_errors import DuplicateIdError  # noqa: E402
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+RESULT = {"law": 0, "rate_law": 0, "parameter": [1000.0, 0.01, 0.2],
+          "rate_parameter": [40.0, 5.0], "reference_rate": 0.001,
+          "rates": [0.001, 1.0, 100.0]}
+
+
+def single_card(mid: int, scale: float = 1.0) -> str:
+    """
+    *MAT_24 card with its yield curve, the curve id is the material id.
+    """
+    return ("*KEYWORD\n"
+            "*MAT_PIECEWISE_LINEAR_PLASTICITY_TITLE\n"
+            f"Material {mid}\n"
+            f"{mid:>10}   7.85e-9    210000       0.3         0         0         0\n"
+            f"         0         0{mid:>10}\n"
+            "\n\n"
+            "*DEFINE_CURVE\n"
+            f"{mid:>10}         0       1.0       1.0       0.0       0.0\n"
+            f"{0.0:>20}{300.0*scale:>20}\n"
+            f"{1.0:>20}{900.0*scale:>20}\n"
+            "*END\n")
+
+
+def export_table(path: Path, result: dict) -> None:
+    export_rate_table(["Rate", "1", "7.85e-9", "0.3", "0", "10", str(path), "equi"], result,
+                      210000, str(path), str(ROOT/"data"/"Mat_24_table_template.k"))
+
+
+def table_curves(path: Path) -> tuple[int, ...]:
+    """
+    Ids of the curves merged together with the table of material 1.
+    """
+    curves, = [curves for key, _, _, curves in split_blocks(path.read_bytes())
+               if key == ("LCID", 1)]
+
+    return curves
+
+
+def test_rate_table_keeps_curves_of_other_materials(tmp_path):
+    path = tmp_path/"library.k"
+    path.touch()
+    update_library(path, [single_card(mid) for mid in (1, 101, 102)])
+    before = read_deck(path)["curves"]
+
+    export_table(path, RESULT)
+    deck = read_deck(path)
+
+    for mid in (101, 102):
+        np.testing.assert_array_equal(deck["curves"][mid], before[mid])
+        assert deck["materials"].loc[mid, "title"] == f"Material {mid}"
+
+    assert table_curves(path) == tuple(range(TABLE_CURVE_START, TABLE_CURVE_START + 3))
+
+    # the curves follow their table directly
+    text = path.read_text()
+    table = text.index("*DEFINE_TABLE")
+    assert text.index("*DEFINE_CURVE", table) == text.index("\n*", table) + 1
+
+
+def test_rate_table_reexport_replaces_its_curves(tmp_path):
+    path = tmp_path/"library.k"
+    path.touch()
+    update_library(path, [single_card(mid) for mid in (1, 101)])
+    export_table(path, RESULT)
+
+    export_table(path, dict(RESULT, parameter=[1100.0, 0.01, 0.2]))
+
+    assert table_curves(path) == tuple(range(TABLE_CURVE_START, TABLE_CURVE_START + 3))
+    # the table replaces the single curve of material 1
+    assert path.read_text().count("*DEFINE_CURVE") == 1 + 3
+    assert read_deck(path)["curves"][TABLE_CURVE_START][-1, 1] > 1000
+
+
+def test_duplicate_curve_id_is_refused(tmp_path):
+    path = tmp_path/"library.k"
+    path.touch()
+    update_library(path, [single_card(101)])
+    export_table(path, RESULT)
+    text = path.read_text()
+
+    with pytest.raises(DuplicateIdError):
+        update_library(path, [single_card(TABLE_CURVE_START + 1)])
+
+    assert path.read_text() == text
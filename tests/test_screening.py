@@ -0,0 +1,31 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent/"CurveFitter"))
+
+import cf_model  # noqa: E402
+
+
+def curve(strain: list[float]) -> pd.DataFrame:
+    strain = np.asarray(strain, dtype=np.float64)
+    return pd.DataFrame({"eng_strain": strain, "eng_stress": 1000*np.sqrt(strain)})
+
+
+def test_decreasing_run_is_flagged_completely():
+    df = cf_model.screen_data(curve([0, 0.001, 0.002, 0.003, 0.0025, 0.0026, 0.0027, 0.004,
+                                     0.005]))
+
+    assert df.attrs["screening"]["non_monotonic"] == [4, 5, 6]
+
+
+def test_fixed_strain_is_monotonic():
+    rng = np.random.default_rng(0)
+    strain = np.linspace(0, 0.2, 2000) + rng.normal(0, 2e-4, 2000)
+
+    df = cf_model.screen_data(curve(np.abs(strain)), fix=True)
+
+    assert df.attrs["screening"]["fixed"]
+    assert np.all(np.diff(df["eng_strain"].to_numpy()) >= 0)